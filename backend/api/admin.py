@@ -17,7 +17,8 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ('id','name','owner','created_at')
+    list_display = ('id','name','owner','issue_count','open_issues','created_at')
+    readonly_fields = ('issue_count','open_issues','in_progress_issues','closed_issues')
     list_filter = ('created_at',)
     search_fields = ('name', 'description', 'owner__username')
 
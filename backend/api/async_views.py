@@ -0,0 +1,176 @@
+"""
+Async views for the ASGI deployment (backend/asgi.py).
+
+- health_check: answered on the event loop, no thread.
+- async_read(): fronts a DRF list endpoint. 304s and response cache hits
+  are answered on the event loop with the async ORM, once the bearer token
+  (if any) checks out against the cached user; everything else (misses,
+  writes, other formats, tokens whose user is not cached) runs the regular
+  DRF view in a thread, reusing the markers and cache key already read.
+- project_events: a Server-Sent Events stream of a project's changes
+  (see api/events.py). Idle streams cost a coroutine, not a worker.
+
+Under WSGI the first two still work (Django runs them in an event loop
+per request); the event stream needs ASGI and answers 501 there.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from . import events
+from .authentication import CachedJWTAuthentication
+from .cache import response_cache
+from .models import Project, ChangeLog, CacheVersion
+from .views import (
+    CachedResponseMixin, ConditionalGetMixin, conditional_validators, response_cache_key,
+    set_conditional_headers,
+)
+
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_RETRY_MS = 3000
+
+
+async def health_check(request):
+    """Simple health check endpoint"""
+    return JsonResponse({"status": "Backend is live", "message": "Bug Reporting System API is running!"})
+
+
+def wants_json(request):
+    """Whether DRF's content negotiation would pick the JSON renderer."""
+    requested = request.GET.get('format')
+    if requested:
+        return requested == 'json'
+    accept = request.headers.get('Accept', '')
+    return 'text/html' not in accept and (not accept or 'application/json' in accept or '*/*' in accept)
+
+
+def authenticated_from_cache(view, request):
+    """
+    Whether the request passes the view's authentication without a query.
+    False for an invalid or expired token, or one whose user is not cached:
+    the DRF view then authenticates as usual and answers 401 where due.
+    Reads are public, so no permission check is needed past this.
+    """
+    for authenticator in view.get_authenticators():
+        if not isinstance(authenticator, CachedJWTAuthentication):
+            return False
+        try:
+            if authenticator.authenticate_from_cache(request) is not None:
+                return True
+        except (APIException, LookupError):
+            return False
+    return True
+
+
+async def read_from_cache(viewset_class, action, request, kwargs):
+    """A 304 or a cached response for a read, or None to run the DRF view."""
+    view = viewset_class()
+    view.action = action
+    view.args = ()
+    view.kwargs = kwargs
+    view.format_kwarg = None
+    if not authenticated_from_cache(view, request):
+        return None
+    view.request = Request(request)
+
+    markers = None
+    if isinstance(view, ConditionalGetMixin):
+        query = view.get_modification_markers_query()
+        if query is not None:
+            markers = view.clean_markers(await query.afirst())
+            request.modification_markers = markers
+    if markers:
+        etag, last_modified = conditional_validators(request, 'json', markers)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            set_conditional_headers(response, etag, last_modified)
+            return response
+
+    if not isinstance(view, CachedResponseMixin) or not response_cache.enabled:
+        return None
+    scopes = view.get_cache_scopes()
+    versions = await CacheVersion.acurrent(scopes)
+    key = response_cache_key(request, [versions[scope] for scope in scopes])
+    entry = response_cache.get(key)
+    if entry is None:
+        request.response_cache_key = key
+        return None
+    content, content_type = entry
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Cache'] = 'HIT'
+    if markers:
+        set_conditional_headers(response, etag, last_modified)
+    return response
+
+
+def async_read(viewset_class, actions):
+    """An async view for a viewset route; GETs try read_from_cache() first."""
+    sync_view = viewset_class.as_view(actions)
+
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET' and wants_json(request):
+            response = await read_from_cache(viewset_class, actions['get'], request, kwargs)
+            if response is not None:
+                return response
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    view.__name__ = f'{viewset_class.__name__}_{actions["get"]}'
+    return view
+
+
+def sse_message(event, data, event_id=None):
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def project_events(request, pk):
+    """
+    GET /projects/<id>/events/ - Server-Sent Events for the project:
+
+    - `ready` with the current change-feed cursor when the stream opens
+    - `change` with {cursor, model, ids, deleted} after every committed write
+    - `resync` when messages were dropped for a slow client
+
+    Events carry no object data: fetch /changes/?since=<last cursor> to
+    apply them, and again after a reconnect or a resync.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Event streams are only served by the ASGI application.'}, status=501)
+    if not str(pk).isdigit() or not await Project.objects.live().filter(pk=pk).aexists():
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+
+    # Subscribe before reading the cursor so no change falls in between
+    subscription = await events.subscribe(pk)
+    cursor = await ChangeLog.alatest(pk)
+
+    async def stream():
+        try:
+            yield f'retry: {EVENTS_RETRY_MS}\n\n'
+            yield sse_message('ready', {'cursor': cursor}, cursor)
+            while True:
+                message = await subscription.get(timeout=EVENTS_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ': keepalive\n\n'
+                    continue
+                change = json.loads(message)
+                if change.get('resync'):
+                    yield sse_message('resync', change)
+                else:
+                    yield sse_message('change', change, change['cursor'])
+        finally:
+            await subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Tell Nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,109 @@
+from .models import Project, UserProfile
+
+PROFILE_FLAGS = ('can_create_projects', 'can_delete_issues', 'can_assign_issues')
+
+
+class AuthContext:
+    """
+    What the permission classes need to know about the requesting user,
+    built once per request: user id, role and permission flags.
+
+    The role and flags are read with a single query the first time one of
+    them is needed. Ownership checks compare ids (`project.owner_id`,
+    `issue.reporter_id`) so no User rows are loaded; project owner ids
+    looked up for issues are cached for the rest of the request.
+    """
+
+    def __init__(self, user=None):
+        self.user = user
+        self.user_id = user.pk if user is not None and user.is_authenticated else None
+        self._profile = None
+        self._owner_ids = {}
+
+    @property
+    def profile(self):
+        """Role and permission flags as a dict (empty when the user has no profile)."""
+        if self._profile is None:
+            self._profile = {}
+            if self.user_id is not None:
+                # Reuse a profile that was loaded with the user (select_related, cache)
+                fields_cache = self.user._state.fields_cache
+                if 'profile' in fields_cache:
+                    profile = fields_cache['profile']
+                    if profile is not None:
+                        self._profile = {'role': profile.role, **{f: getattr(profile, f) for f in PROFILE_FLAGS}}
+                else:
+                    self._profile = UserProfile.objects.filter(user_id=self.user_id).values(
+                        'role', *PROFILE_FLAGS
+                    ).first() or {}
+        return self._profile
+
+    @property
+    def is_authenticated(self):
+        return self.user_id is not None
+
+    @property
+    def has_profile(self):
+        return bool(self.profile)
+
+    @property
+    def role(self):
+        return self.profile.get('role')
+
+    @property
+    def can_create_projects(self):
+        return self.profile.get('can_create_projects', False)
+
+    @property
+    def can_delete_issues(self):
+        return self.profile.get('can_delete_issues', False)
+
+    @property
+    def can_assign_issues(self):
+        return self.profile.get('can_assign_issues', False)
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
+    @property
+    def can_manage_all_projects(self):
+        return self.role in ('admin', 'project_manager')
+
+    def project_owner_id(self, project_id):
+        if project_id not in self._owner_ids:
+            self._owner_ids[project_id] = (
+                Project.objects.filter(pk=project_id).values_list('owner_id', flat=True).first()
+            )
+        return self._owner_ids[project_id]
+
+    def owns_project(self, project):
+        return self.is_authenticated and project.owner_id == self.user_id
+
+    def owns_issue_project(self, issue):
+        """
+        Whether the user owns the issue's project. Uses, in order: a
+        `project_owner_id` annotation, an already loaded project, or one
+        cached lookup per project.
+        """
+        if not self.is_authenticated:
+            return False
+        if hasattr(issue, 'project_owner_id'):
+            self._owner_ids[issue.project_id] = issue.project_owner_id
+        else:
+            project = issue._state.fields_cache.get('project')
+            if project is not None:
+                self._owner_ids[project.pk] = project.owner_id
+        return self.project_owner_id(issue.project_id) == self.user_id
+
+    def reported(self, issue):
+        return self.is_authenticated and issue.reporter_id == self.user_id
+
+
+def get_auth_context(request):
+    """The request's AuthContext, built on first use."""
+    context = getattr(request, '_auth_context', None)
+    if context is None:
+        context = AuthContext(request.user)
+        request._auth_context = context
+    return context
@@ -0,0 +1,153 @@
+"""
+Cache helpers shared by authentication, the views and the model signal
+receivers.
+
+Authenticated users are cached, with their UserProfile, under
+``auth:user:<id>`` for AUTH_USER_CACHE_TTL seconds in the cache named by
+AUTH_USER_CACHE_ALIAS. Only CACHED_USER_FIELDS and the profile row are
+stored, never the password hash. Any save or delete of a User or UserProfile drops the
+entry; writes that bypass signals (bulk_create, update()) must call
+``invalidate_cached_users`` themselves. With the default per-process
+local-memory cache other processes may serve a stale entry until the TTL
+expires; point the alias at a shared cache to avoid that.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router, transaction
+
+# What authentication, permissions and UserSerializer read from request.user.
+# The rest of a cached user is deferred and loads on first access, like .only()
+CACHED_USER_FIELDS = ('id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser')
+
+
+def user_cache():
+    return caches[getattr(settings, 'AUTH_USER_CACHE_ALIAS', 'default')]
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def get_cached_user(user_id):
+    """The cached user, rebuilt with its profile, or None."""
+    entry = user_cache().get(user_cache_key(user_id))
+    if not isinstance(entry, dict):
+        return None
+    user_model = get_user_model()
+    user = from_fields(user_model, entry['user'])
+    if 'profile' in entry:
+        profile_field = user_model._meta.get_field('profile')
+        profile = None
+        if entry['profile'] is not None:
+            profile = from_fields(profile_field.related_model, entry['profile'])
+            profile_field.field.set_cached_value(profile, user)
+        profile_field.set_cached_value(user, profile)
+    return user
+
+
+def cache_user(user):
+    """Cache a user loaded with select_related('profile')."""
+    ttl = getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+    if not ttl:
+        return
+    entry = {'user': {name: getattr(user, name) for name in CACHED_USER_FIELDS}}
+    if 'profile' in user._state.fields_cache:
+        profile = user._state.fields_cache['profile']
+        entry['profile'] = None if profile is None else {
+            field.attname: getattr(profile, field.attname) for field in profile._meta.concrete_fields
+        }
+    user_cache().set(user_cache_key(user.pk), entry, ttl)
+
+
+def from_fields(model, values):
+    """An instance of `model` as loaded from the database with only `values` ({attname: value})."""
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db(router.db_for_read(model), names, [values[name] for name in names])
+
+
+def invalidate_cached_users(user_ids):
+    keys = [user_cache_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    user_cache().delete_many(keys)
+    # Again after commit, in case a concurrent request re-cached the old row
+    transaction.on_commit(lambda: user_cache().delete_many(keys))
+
+
+def invalidate_cached_user(user_id):
+    invalidate_cached_users([user_id])
+
+
+class ResponseCache:
+    """
+    In-process LRU of rendered API responses, bounded by entry count and
+    total body size. Keys embed CacheVersion values, so entries are never
+    invalidated explicitly: superseded ones age out of the LRU.
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, content, content_type):
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            self._entries[key] = (content, content_type)
+            self.size += len(content)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the metrics."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=getattr(settings, 'RESPONSE_CACHE_MAX_ENTRIES', 1000),
+    max_bytes=getattr(settings, 'RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+)
@@ -0,0 +1,196 @@
+"""
+Deferred, chunked deletion of projects and issues.
+
+Deleting a project through the ORM makes Django's Collector load every
+issue and comment below it, fire their signals and delete them in one long
+transaction. Instead the API only schedules the deletion:
+
+- schedule_project_deletion() / schedule_issue_deletion() set deleted_at,
+  which hides the object and everything below it from every read (see
+  IssueQuerySet.live and CommentQuerySet.live), keep counters, cache
+  versions and the change feed in step, and create a DeletionJob.
+- run_job(), driven by `manage.py process_deletions`, then deletes the
+  rows with plain DELETE ... WHERE id IN (...) statements, each batch in
+  its own short transaction: comments first (replies before their
+  parents), then issues, then the project.
+
+Every step is idempotent, so a job that was interrupted is simply run again.
+
+The worker also keeps the change feed bounded: prune_change_log() removes
+ChangeLog rows past the retention window in the same kind of batches.
+"""
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import (
+    Project, Issue, Comment, ChangeLog, CacheVersion, DeletionJob, IssueStatusTransition, DailyIssueStats,
+)
+
+DEFAULT_BATCH_SIZE = 1000
+# Issues whose comments are deleted per pass; their rows go in one statement after
+ISSUE_BATCH_SIZE = 200
+
+
+def schedule_project_deletion(project, requested_by=None):
+    """Hide the project and its issues now; return the DeletionJob that removes them."""
+    now = timezone.now()
+    with transaction.atomic():
+        # Everyone with an issue in it loses those issues from their summary
+        user_ids = set()
+        for reporter_id, assignee_id in (
+            Issue.objects.filter(project_id=project.pk, deleted_at__isnull=True)
+            .values_list('reporter_id', 'assignee_id').distinct()
+        ):
+            user_ids.update((reporter_id, assignee_id))
+        # update() skips the pre_save receiver; cache versions go first, as in Issue.save
+        CacheVersion.bump_projects(project.pk, user_ids=user_ids)
+        Project.objects.filter(pk=project.pk).update(deleted_at=now, updated_at=now)
+        job = DeletionJob.objects.create(
+            model=DeletionJob.PROJECT, object_id=project.pk, project_id=project.pk,
+            issues_total=project.issue_count, requested_by=requested_by,
+        )
+    return job
+
+
+def schedule_issue_deletion(issue, requested_by=None):
+    """Hide the issue now; return its DeletionJob, or None if it was already scheduled."""
+    with transaction.atomic():
+        marked = Issue.objects.filter(pk=issue.pk, deleted_at__isnull=True).update(deleted_at=timezone.now())
+        if not marked:
+            return None
+        # What the post_delete receivers would have done, now that it is gone from the API
+        # (cache versions before the project row, the lock order of Issue.save)
+        CacheVersion.bump_projects(issue.project_id, user_ids=(issue.reporter_id, issue.assignee_id))
+        Project.adjust_issue_counters(issue.project_id, {issue.status: -1})
+        ChangeLog.record(issue.project_id, ChangeLog.ISSUE, [issue.pk], deleted=True)
+        IssueStatusTransition.record([(issue.project_id, issue.pk, issue.status, None)])
+        return DeletionJob.objects.create(
+            model=DeletionJob.ISSUE, object_id=issue.pk, project_id=issue.project_id,
+            issues_total=1, requested_by=requested_by,
+        )
+
+
+def raw_delete(model, ids):
+    """DELETE rows by primary key without the Collector: no cascades, no signals."""
+    if not ids:
+        return 0
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} IN ({placeholders})',
+            list(ids),
+        )
+        return cursor.rowcount
+
+
+def record_progress(job, **counts):
+    DeletionJob.objects.filter(pk=job.pk).update(**{
+        field: F(field) + value for field, value in counts.items()
+    })
+    for field, value in counts.items():
+        setattr(job, field, getattr(job, field) + value)
+
+
+def delete_comments(job, issue_ids, batch_size):
+    """Delete every comment of `issue_ids`, `batch_size` rows per transaction."""
+    comments = Comment.objects.filter(issue_id__in=issue_ids)
+    while True:
+        with transaction.atomic():
+            # Descending path puts every reply before its ancestors, so each
+            # batch is closed under replies and no committed row points at a
+            # deleted parent
+            ids = list(comments.order_by('issue_id', '-path').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return
+            record_progress(job, comments_deleted=raw_delete(Comment, ids))
+
+
+def delete_issues(job, issues, batch_size):
+    """Delete the issues of `issues` (a queryset) and their comments, a batch at a time."""
+    while True:
+        issue_ids = list(issues.order_by('id').values_list('id', flat=True)[:ISSUE_BATCH_SIZE])
+        if not issue_ids:
+            return
+        delete_comments(job, issue_ids, batch_size)
+        with transaction.atomic():
+            # Catches comments written while the batch was being emptied
+            leftover = list(Comment.objects.filter(issue_id__in=issue_ids).values_list('id', flat=True))
+            record_progress(
+                job,
+                comments_deleted=raw_delete(Comment, leftover),
+                issues_deleted=raw_delete(Issue, issue_ids),
+            )
+
+
+def delete_project_changes(project_id, batch_size):
+    """The project's change feed, status transitions and daily rollups."""
+    for model in (ChangeLog, IssueStatusTransition, DailyIssueStats):
+        rows = model.objects.filter(project_id=project_id)
+        while True:
+            ids = list(rows.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            # No signals or dependents: a single DELETE per batch
+            model.objects.filter(id__in=ids).delete()
+
+
+def prune_change_log(older_than, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Delete the change-feed rows written before `older_than`, oldest first,
+    and move each project's changes_pruned_through up to the last one
+    deleted. Returns the number of rows deleted.
+    """
+    # Rows are appended in id order, so everything to prune sits below the
+    # first recent id; the scan for it only passes over the rows to delete
+    recent = ChangeLog.objects.filter(created_at__gte=older_than).order_by('id').values_list('id', flat=True).first()
+    if recent is None:
+        recent = (ChangeLog.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+    rows = ChangeLog.objects.filter(id__lt=recent).order_by('id')
+    pruned = 0
+    while True:
+        with transaction.atomic():
+            batch = list(rows.values_list('id', 'project_id')[:batch_size])
+            if not batch:
+                return pruned
+            horizons = {}
+            for change_id, project_id in batch:
+                horizons[project_id] = change_id
+            # The project row is what ChangeLog.record() locks, so appends to
+            # the feed wait for the horizon and the delete to commit together
+            for project_id in sorted(horizons):
+                Project.objects.filter(
+                    pk=project_id, changes_pruned_through__lt=horizons[project_id],
+                ).update(changes_pruned_through=horizons[project_id])
+            ChangeLog.objects.filter(id__in=[change_id for change_id, _ in batch]).delete()
+        pruned += len(batch)
+
+
+def run_job(job, batch_size=DEFAULT_BATCH_SIZE):
+    """Carry out a DeletionJob; failures are recorded on the job and re-raised."""
+    DeletionJob.objects.filter(pk=job.pk).update(
+        status=DeletionJob.RUNNING, started_at=job.started_at or timezone.now(), error='',
+    )
+    try:
+        if job.model == DeletionJob.PROJECT:
+            delete_issues(job, Issue.objects.filter(project_id=job.object_id), batch_size)
+            delete_project_changes(job.object_id, batch_size)
+            # Nothing is left to cascade to, so the regular delete is one statement
+            # (plus its signals: cache versions)
+            Project.objects.filter(pk=job.object_id).delete()
+        else:
+            delete_issues(job, Issue.objects.filter(pk=job.object_id), batch_size)
+    except Exception as exc:
+        DeletionJob.objects.filter(pk=job.pk).update(status=DeletionJob.FAILED, error=str(exc))
+        raise
+    DeletionJob.objects.filter(pk=job.pk).update(status=DeletionJob.DONE, finished_at=timezone.now())
+    job.refresh_from_db()
+    return job
+
+
+def pending_jobs(include_failed=False):
+    statuses = [DeletionJob.PENDING, DeletionJob.RUNNING]
+    if include_failed:
+        statuses.append(DeletionJob.FAILED)
+    return DeletionJob.objects.filter(status__in=statuses).order_by('id')
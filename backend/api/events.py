@@ -0,0 +1,166 @@
+"""
+Server-pushed change notifications for /api/projects/<id>/events/.
+
+ChangeLog.record() publishes {"cursor", "model", "ids", "deleted"} on the
+project's channel once the write commits; the events view streams them
+to subscribers as Server-Sent Events. Notifications are hints: the change
+feed (/changes/?since=) stays the source of truth, so a subscriber that
+misses messages (slow client, reconnect, overflow) catches up from the
+last cursor it saw.
+
+The transport is pluggable through settings.EVENTS_BACKEND:
+
+- LocalBackend (default): in-process fan-out. Only reaches subscribers
+  connected to the process that made the write, so it suits a single
+  ASGI worker.
+- RedisBackend: Redis pub/sub, for several workers or hosts. Needs the
+  `redis` package (already required for the Redis cache).
+
+A backend implements publish(channel, message) (sync, called from
+on_commit hooks) and async subscribe(channel), returning an object with
+async get(timeout) -> message or None, and async close().
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Sent instead of the messages a subscriber had to drop
+RESYNC = json.dumps({'resync': True})
+
+
+def project_channel(project_id):
+    return f'project:{project_id}'
+
+
+class LocalSubscription:
+    def __init__(self, backend, channel, maxsize):
+        self.backend = backend
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, message):
+        # publish() runs in whichever thread committed the write
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            self.overflowed = True
+            return
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        if self.overflowed and self.queue.empty():
+            self.overflowed = False
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.backend.unsubscribe(self)
+
+
+class LocalBackend:
+    """In-process fan-out to subscribers of this process."""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    async def subscribe(self, channel):
+        subscription = LocalSubscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+class RedisSubscription:
+    def __init__(self, client, pubsub):
+        self.client = client
+        self.pubsub = pubsub
+
+    async def get(self, timeout=None):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        data = message['data']
+        return data.decode() if isinstance(data, bytes) else data
+
+    async def close(self):
+        await self.pubsub.unsubscribe()
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class RedisBackend:
+    """Redis pub/sub: every worker subscribed to a channel receives its messages."""
+
+    def __init__(self, url):
+        import redis
+        self.url = url
+        self._publisher = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._publisher.publish(channel, message)
+
+    async def subscribe(self, channel):
+        import redis.asyncio
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+        return RedisSubscription(client, pubsub)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_class = import_string(getattr(settings, 'EVENTS_BACKEND', 'api.events.LocalBackend'))
+                _backend = backend_class(**getattr(settings, 'EVENTS_BACKEND_OPTIONS', {}))
+    return _backend
+
+
+def publish_change(project_id, change):
+    """Notify the project's subscribers of a committed change."""
+    try:
+        get_backend().publish(project_channel(project_id), json.dumps(change))
+    except Exception:
+        # Subscribers catch up from the change feed; never fail the write
+        logger.exception('Could not publish change event for project %s', project_id)
+
+
+async def subscribe(project_id):
+    return await get_backend().subscribe(project_channel(project_id))
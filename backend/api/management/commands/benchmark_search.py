@@ -0,0 +1,109 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from api.models import Project, Issue, CacheVersion
+from api.search import search_issues, is_available
+
+BENCHMARK_PROJECT = 'search-benchmark'
+WORDS = (
+    'login logout session token timeout crash freeze slow render page button form '
+    'upload download export import report chart dashboard filter search sort column '
+    'database query index cache memory leak network request response header cookie '
+    'mobile desktop browser firefox chrome safari android ios layout modal tooltip '
+    'email notification webhook schedule cron retry queue worker deploy rollback '
+    'permission role admin guest password reset invite profile avatar settings'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Compare full-text issue search against the old icontains scan on a large synthetic dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--issues', type=int, default=1_000_000,
+                            help='Number of synthetic issues to generate (default: 1,000,000)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query (default: 5)')
+        parser.add_argument('--query', action='append', dest='queries',
+                            help='Search string to time (repeatable)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true',
+                            help=f'Keep the "{BENCHMARK_PROJECT}" project for later runs')
+
+    def handle(self, *args, **options):
+        if not is_available(connection):
+            self.stdout.write(self.style.WARNING(
+                f'No full-text index on the {connection.vendor} backend; both columns will use icontains'
+            ))
+
+        project = self.seed(options)
+        queries = options['queries'] or ['login', 'database timeout', 'memory leak chrome', 'exp']
+        base = Issue.objects.filter(project=project)
+
+        self.stdout.write(f'{"query":<24}{"icontains ms":>14}{"full-text ms":>14}{"matches":>10}')
+        for query in queries:
+            old = base.filter(Q(title__icontains=query) | Q(description__icontains=query)).order_by('-created_at')
+            new = search_issues(base, query)
+            old_ms = self.time_page(old, options['repeat'])
+            new_ms = self.time_page(new, options['repeat'])
+            self.stdout.write(f'{query:<24}{old_ms:>14.1f}{new_ms:>14.1f}{new.count():>10}')
+
+        if not options['keep']:
+            self.cleanup(project)
+
+    def time_page(self, queryset, repeat):
+        """Median time for what one API page costs: COUNT(*) plus the first 10 rows."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            queryset.count()
+            list(queryset[:10])
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)[len(timings) // 2]
+
+    def seed(self, options):
+        project = Project.objects.filter(name=BENCHMARK_PROJECT).first()
+        if project and project.issue_count >= options['issues']:
+            self.stdout.write(f'Reusing {project.issue_count} issues in "{BENCHMARK_PROJECT}"')
+            return project
+
+        reporter, _ = User.objects.get_or_create(username='search-benchmark')
+        project = project or Project.objects.create(name=BENCHMARK_PROJECT, owner=reporter)
+        rng = random.Random(options['seed'])
+        missing = options['issues'] - project.issue_count
+        self.stdout.write(f'Generating {missing} issues...')
+        start = time.perf_counter()
+        created = 0
+        while created < missing:
+            size = min(options['batch_size'], missing - created)
+            batch = [
+                Issue(
+                    title=' '.join(rng.choices(WORDS, k=rng.randint(3, 7))),
+                    description=' '.join(rng.choices(WORDS, k=rng.randint(10, 40))),
+                    status='open', project=project, reporter=reporter,
+                )
+                for _ in range(size)
+            ]
+            with transaction.atomic():
+                Issue.objects.bulk_create(batch)
+                CacheVersion.bump_projects(project.id, user_ids=(reporter.id,))
+                Project.adjust_issue_counters(project.id, {'open': size})
+            created += size
+            self.stdout.write(f'  {created}/{missing}', ending='\r')
+        self.stdout.write(f'\nGenerated in {time.perf_counter() - start:.1f}s')
+        project.refresh_from_db()
+        return project
+
+    def cleanup(self, project):
+        # Raw DELETE: the ORM collector would load every row into memory
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('DELETE FROM api_issue WHERE project_id = %s', [project.id])
+            cursor.execute('DELETE FROM api_project WHERE id = %s', [project.id])
+            cursor.execute('DELETE FROM api_changelog WHERE project_id = %s', [project.id])
+            cursor.execute('DELETE FROM api_issuestatustransition WHERE project_id = %s', [project.id])
+            cursor.execute('DELETE FROM api_dailyissuestats WHERE project_id = %s', [project.id])
+            CacheVersion.bump_projects(project.id, user_ids=(project.owner_id,))
+        self.stdout.write(f'Removed the "{BENCHMARK_PROJECT}" project')
@@ -1,29 +1,38 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from api.models import UserProfile
+from django.db import transaction
+from api.models import UserProfile, CacheVersion
+from api.cache import invalidate_cached_users
 
 class Command(BaseCommand):
     help = 'Ensure all users have UserProfile objects with correct permissions'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Profiles per INSERT (default: 1000)')
+
     def handle(self, *args, **options):
-        users_without_profiles = User.objects.filter(profile__isnull=True)
-        
-        if not users_without_profiles.exists():
+        users_without_profiles = list(
+            User.objects.filter(profile__isnull=True).order_by('id').values_list('id', 'username')
+        )
+
+        if not users_without_profiles:
             self.stdout.write(self.style.SUCCESS('All users already have profiles'))
             return
-        
-        created_count = 0
-        for user in users_without_profiles:
-            UserProfile.objects.create(
-                user=user,
-                role='developer',
-                can_create_projects=True,
-                can_delete_issues=False,
-                can_assign_issues=False
-            )
-            created_count += 1
-            self.stdout.write(f'Created profile for user: {user.username}')
-        
+
+        profiles = []
+        for user_id, username in users_without_profiles:
+            profile = UserProfile(user_id=user_id)
+            profile.apply_role('developer')
+            profiles.append(profile)
+            self.stdout.write(f'Created profile for user: {username}')
+
+        with transaction.atomic():
+            # One INSERT per batch; bulk_create skips the per-profile signal
+            UserProfile.objects.bulk_create(profiles, batch_size=options['batch_size'], ignore_conflicts=True)
+            CacheVersion.bump(CacheVersion.USERS)
+            # Cached users were stored without a profile
+            invalidate_cached_users([user_id for user_id, _ in users_without_profiles])
         self.stdout.write(
-            self.style.SUCCESS(f'Successfully created {created_count} user profiles')
-        )
\ No newline at end of file
+            self.style.SUCCESS(f'Successfully created {len(profiles)} user profiles')
+        )
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+from api.models import Project, Issue, Comment
+from api.views import IssueViewSet, CommentViewSet
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the querysets built by IssueViewSet and CommentViewSet and check they use the expected indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--show-plans', action='store_true', help='Print every query plan')
+
+    def build_view(self, viewset_class, kwargs=None, query=None, action='list'):
+        view = viewset_class()
+        view.action_map = {'get': action}
+        view.args = ()
+        view.kwargs = kwargs or {}
+        view.format_kwarg = None
+        view.request = view.initialize_request(APIRequestFactory().get('/', query or {}))
+        return view
+
+    def cases(self):
+        project_id = Project.objects.values_list('id', flat=True).first() or 1
+        issue_id = Issue.objects.values_list('id', flat=True).first() or 1
+
+        def issues(query=None, project=True):
+            kwargs = {'project_pk': str(project_id)} if project else {}
+            return self.build_view(IssueViewSet, kwargs, query).get_queryset()
+
+        def comments():
+            return self.build_view(CommentViewSet).get_queryset()
+
+        # The nested list (CommentViewSet.list_threads) loads an issue's
+        # comments as (issue, path) ranges
+        def thread():
+            return self.build_view(CommentViewSet).get_thread_queryset(issue_id).order_by('path')
+
+        def subtree():
+            root = Comment.objects.filter(issue_id=issue_id, depth=0).values_list('path', flat=True).first()
+            return thread().filter(Comment.subtree_filter(root or Comment.path_segment(1)))
+
+        return [
+            ('GET /issues/', lambda: issues(project=False), 'api_issue_created_id_idx'),
+            ('GET /issues/?status=', lambda: issues({'status': 'open'}, project=False),
+             'api_issue_status_created_idx'),
+            ('GET /projects/<id>/issues/', lambda: issues(), 'api_issue_proj_created_idx'),
+            ('GET /projects/<id>/issues/?status=', lambda: issues({'status': 'open'}),
+             'api_issue_proj_status_idx'),
+            ('GET /projects/<id>/issues/?priority=', lambda: issues({'priority': 'high'}),
+             'api_issue_proj_prio_idx'),
+            ('GET /comments/', comments, 'api_comment_roots_idx'),
+            ('GET /issues/<id>/comments/', thread, 'api_comment_issue_path_idx'),
+            ('GET /issues/<id>/comments/?root=', subtree, 'api_comment_issue_path_idx'),
+            ('GET /issues/<id>/comments/?max_depth=', lambda: thread().filter(depth__lte=1),
+             'api_comment_issue_path_idx'),
+        ]
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # On small development databases a sequential scan is always
+                # cheapest; we want to know whether the index is usable.
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for label, build, index in self.cases():
+                plan = build().explain()
+                used = index in plan
+                status = self.style.SUCCESS('ok') if used else self.style.ERROR('MISSING')
+                self.stdout.write(f'{label:<40} {index:<30} {status}')
+                if options['show_plans'] or not used:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+                if not used:
+                    failures.append(label)
+
+        if failures:
+            raise CommandError(f'{len(failures)} queries do not use their index: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All list queries use their indexes'))
@@ -0,0 +1,73 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.models import Project, Issue, Comment
+from api.renderers import ExportEncoder
+
+FORMAT = 'tracker-ndjson'
+FORMAT_VERSION = 1
+
+USER_FIELDS = (
+    'id', 'username', 'email', 'password', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser', 'date_joined', 'last_login',
+)
+PROFILE_FIELDS = ('role', 'can_create_projects', 'can_delete_issues', 'can_assign_issues')
+PROJECT_FIELDS = ('id', 'name', 'description', 'created_at', 'updated_at', 'owner_id')
+ISSUE_FIELDS = (
+    'id', 'title', 'description', 'status', 'priority', 'created_at', 'updated_at',
+    'comments_updated_at', 'project_id', 'reporter_id', 'assignee_id',
+)
+COMMENT_FIELDS = ('id', 'content', 'created_at', 'updated_at', 'issue_id', 'author_id', 'parent_comment_id', 'depth')
+
+
+class Command(BaseCommand):
+    help = 'Stream users, projects, issues and comments to NDJSON (restore with import_tracker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-', help='Output file (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched per round trip (default: 2000)')
+        parser.add_argument('--no-users', action='store_true',
+                            help='Skip user accounts; import_tracker then maps authors by username only')
+
+    def handle(self, *args, **options):
+        out = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8')
+        self.chunk_size = options['chunk_size']
+        self.encoder = ExportEncoder(ensure_ascii=False, separators=(',', ':'))
+        try:
+            self.write(out, {'type': 'meta', 'format': FORMAT, 'version': FORMAT_VERSION,
+                             'exported_at': timezone.now()})
+            # Dependency order: every row's foreign keys point at rows already written.
+            # Comments by (depth, id) so each parent precedes its replies.
+            # Rows scheduled for deletion are left out.
+            if not options['no_users']:
+                self.export(out, 'user', User.objects.order_by('id').values(
+                    *USER_FIELDS, *(f'profile__{f}' for f in PROFILE_FIELDS)))
+            else:
+                self.export(out, 'user', User.objects.order_by('id').values('id', 'username'))
+            self.export(out, 'project', Project.objects.live().order_by('id').values(*PROJECT_FIELDS))
+            self.export(out, 'issue', Issue.objects.live().order_by('id').values(*ISSUE_FIELDS))
+            self.export(out, 'comment', Comment.objects.live().order_by('depth', 'id').values(*COMMENT_FIELDS))
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+    def write(self, out, record):
+        out.write(self.encoder.encode(record))
+        out.write('\n')
+
+    def export(self, out, kind, rows):
+        # values() + iterator(): plain dicts from a server-side cursor, so
+        # memory stays flat however many rows there are
+        count = 0
+        for row in rows.iterator(chunk_size=self.chunk_size):
+            profile = {f: row.pop(f'profile__{f}') for f in PROFILE_FIELDS if f'profile__{f}' in row}
+            if profile and profile['role'] is not None:
+                row['profile'] = profile
+            self.write(out, {'type': kind, **row})
+            count += 1
+            if count % (self.chunk_size * 10) == 0:
+                self.stderr.write(f'  {kind}s: {count}')
+        self.stderr.write(f'Exported {count} {kind}s')
@@ -0,0 +1,259 @@
+import json
+import sys
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from api.cache import invalidate_cached_users
+from api.deletion import schedule_project_deletion
+from api.models import Project, Issue, Comment, UserProfile, CacheVersion
+from api.stats import backfill_transitions, rebuild_project_stats
+from .export_tracker import FORMAT, FORMAT_VERSION, PROFILE_FIELDS
+
+KIND_ORDER = ('user', 'project', 'issue', 'comment')
+DATETIME_FIELDS = {
+    'user': ('date_joined', 'last_login'),
+    'project': ('created_at', 'updated_at'),
+    'issue': ('created_at', 'updated_at', 'comments_updated_at'),
+    'comment': ('created_at', 'updated_at'),
+}
+
+
+@contextmanager
+def preserve_timestamps(*models):
+    """
+    Let bulk_create keep the exported created_at/updated_at values:
+    auto_now and auto_now_add would overwrite them in pre_save.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    """
+    Every batch is committed on its own, so a large import never holds one
+    long write transaction (on SQLite, a lock on the whole database).
+    Imported projects stay hidden, like a pending deletion, until the last
+    batch is in; then they appear at once. If the import fails, the
+    projects imported so far are handed to the deletion worker, and users
+    already created are matched by username when the import is run again.
+    """
+    help = 'Import an export_tracker NDJSON file with batched bulk inserts and remapped ids'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', nargs='?', default='-', help='Input file (default: stdin)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows per bulk_create (default: 1000)')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        # old id -> new id; users that already exist (same username) are reused
+        self.ids = {kind: {} for kind in KIND_ORDER}
+        self.counts = dict.fromkeys(KIND_ORDER, 0)
+        self.reused_users = 0
+        self.hidden_at = timezone.now()
+
+        source = sys.stdin if options['input'] == '-' else open(options['input'], encoding='utf-8')
+        try:
+            with preserve_timestamps(Project, Issue, Comment):
+                self.load(source)
+            # The export has no status history: approximate it (see backfill_transitions)
+            project_ids = list(self.ids['project'].values())
+            for start in range(0, len(project_ids), self.batch_size):
+                chunk = project_ids[start:start + self.batch_size]
+                backfill_transitions(Issue.objects.filter(project_id__in=chunk), self.batch_size)
+            for project_id in project_ids:
+                rebuild_project_stats(project_id, self.batch_size)
+            self.reveal(project_ids)
+        except BaseException:
+            self.abandon(list(self.ids['project'].values()))
+            raise
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        summary = ', '.join(f'{self.counts[kind]} {kind}s' for kind in KIND_ORDER)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {summary} ({self.reused_users} users matched existing accounts by username)'
+        ))
+
+    def load(self, source):
+        first = source.readline()
+        meta = json.loads(first) if first.strip() else {}
+        if meta.get('type') != 'meta' or meta.get('format') != FORMAT:
+            raise CommandError('Not an export_tracker file')
+        if meta.get('version') != FORMAT_VERSION:
+            raise CommandError(f'Unsupported export version {meta.get("version")}')
+
+        kind, batch, seen = None, [], set()
+        for number, line in enumerate(source, start=2):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_kind = record.pop('type', None)
+            if record_kind not in KIND_ORDER:
+                raise CommandError(f'Line {number}: unknown record type {record_kind!r}')
+            if record_kind != kind or len(batch) >= self.batch_size or self.needs_flush(record_kind, record, batch):
+                self.flush(kind, batch)
+                batch = []
+                if record_kind != kind:
+                    if record_kind in seen:
+                        raise CommandError(f'Line {number}: {record_kind} records must be contiguous')
+                    seen.add(record_kind)
+                    kind = record_kind
+            for field in DATETIME_FIELDS[record_kind]:
+                if record.get(field):
+                    record[field] = parse_datetime(record[field])
+            batch.append(record)
+        self.flush(kind, batch)
+
+    def needs_flush(self, kind, record, batch):
+        # A reply whose parent is still buffered needs the parent's new id first
+        if kind != 'comment' or not batch or record.get('parent_comment_id') is None:
+            return False
+        return record['parent_comment_id'] not in self.ids['comment']
+
+    def flush(self, kind, batch):
+        if not batch:
+            return
+        with transaction.atomic():
+            getattr(self, f'import_{kind}s')(batch)
+        self.counts[kind] += len(batch)
+        self.stdout.write(f'  {kind}s: {self.counts[kind]}')
+
+    def reveal(self, project_ids):
+        """Show the imported projects, all in one short transaction."""
+        with transaction.atomic():
+            # bulk_create skips the receivers; cache versions are locked
+            # before project rows, as in Issue.save. Reused users may have
+            # gained issues.
+            CacheVersion.bump(CacheVersion.GLOBAL, CacheVersion.PROJECTS, CacheVersion.USERS)
+            CacheVersion.bump_projects(*project_ids, user_ids=self.ids['user'].values())
+            for start in range(0, len(project_ids), self.batch_size):
+                Project.objects.filter(id__in=project_ids[start:start + self.batch_size]).update(deleted_at=None)
+
+    def abandon(self, project_ids):
+        """Hand the projects of a failed import to the deletion worker."""
+        projects = Project.objects.only('id', 'issue_count')
+        for start in range(0, len(project_ids), self.batch_size):
+            for project in projects.filter(id__in=project_ids[start:start + self.batch_size]):
+                schedule_project_deletion(project)
+        if project_ids:
+            self.stderr.write(
+                f'Import failed: {len(project_ids)} partly imported projects were scheduled for deletion '
+                f'(see process_deletions). Users already created are kept and reused by the next run.'
+            )
+
+    def remap(self, kind, old_id):
+        if old_id is None:
+            return None
+        try:
+            return self.ids[kind][old_id]
+        except KeyError:
+            raise CommandError(f'Reference to unknown {kind} {old_id}')
+
+    def import_users(self, batch):
+        existing = dict(
+            User.objects.filter(username__in=[r['username'] for r in batch]).values_list('username', 'id')
+        )
+        new_users, profiles = [], []
+        for record in batch:
+            if record['username'] in existing:
+                self.ids['user'][record['id']] = existing[record['username']]
+                self.reused_users += 1
+                continue
+            profile = record.pop('profile', None)
+            old_id = record.pop('id')
+            user = User(**record)
+            if not record.get('password'):
+                user.set_unusable_password()
+            new_users.append((old_id, user, profile))
+
+        # bulk_create sends no post_save, so profiles are created here too
+        User.objects.bulk_create([user for _, user, _ in new_users])
+        for old_id, user, profile in new_users:
+            self.ids['user'][old_id] = user.id
+            profiles.append(UserProfile(user_id=user.id, **{
+                f: profile[f] for f in PROFILE_FIELDS if profile and profile.get(f) is not None
+            }))
+        UserProfile.objects.bulk_create(profiles)
+        invalidate_cached_users([user.id for _, user, _ in new_users])
+
+    def import_projects(self, batch):
+        projects = []
+        for record in batch:
+            projects.append(Project(
+                name=record['name'], description=record['description'],
+                created_at=record['created_at'], updated_at=record['updated_at'],
+                owner_id=self.remap('user', record['owner_id']),
+                # Hidden from the API until the import completes (see reveal)
+                deleted_at=self.hidden_at,
+            ))
+        Project.objects.bulk_create(projects)
+        for record, project in zip(batch, projects):
+            self.ids['project'][record['id']] = project.id
+
+    def import_issues(self, batch):
+        issues, counters = [], {}
+        for record in batch:
+            project_id = self.remap('project', record['project_id'])
+            deltas = counters.setdefault(project_id, {})
+            deltas[record['status']] = deltas.get(record['status'], 0) + 1
+            issues.append(Issue(
+                title=record['title'], description=record['description'],
+                status=record['status'], priority=record['priority'],
+                created_at=record['created_at'], updated_at=record['updated_at'],
+                comments_updated_at=record['comments_updated_at'],
+                project_id=project_id,
+                reporter_id=self.remap('user', record['reporter_id']),
+                assignee_id=self.remap('user', record['assignee_id']),
+            ))
+        Issue.objects.bulk_create(issues)
+        for record, issue in zip(batch, issues):
+            self.ids['issue'][record['id']] = issue.id
+        # Counters are not maintained by bulk_create; kept in step with each committed batch
+        for project_id, deltas in counters.items():
+            Project.adjust_issue_counters(project_id, deltas)
+
+    def import_comments(self, batch):
+        comments = []
+        for record in batch:
+            comments.append(Comment(
+                content=record['content'],
+                created_at=record['created_at'], updated_at=record['updated_at'],
+                issue_id=self.remap('issue', record['issue_id']),
+                author_id=self.remap('user', record['author_id']),
+                parent_comment_id=self.remap('comment', record['parent_comment_id']),
+            ))
+        Comment.objects.bulk_create(comments)
+        for record, comment in zip(batch, comments):
+            self.ids['comment'][record['id']] = comment.id
+
+        # Materialized paths end with the new ids, so they are written after the
+        # insert; parents were imported in an earlier batch
+        parent_ids = {c.parent_comment_id for c in comments if c.parent_comment_id}
+        parents = dict(
+            (pk, (path, depth)) for pk, path, depth in
+            Comment.objects.filter(id__in=parent_ids).values_list('id', 'path', 'depth')
+        ) if parent_ids else {}
+        for comment in comments:
+            if comment.parent_comment_id:
+                path, depth = parents[comment.parent_comment_id]
+                comment.path = path + Comment.path_segment(comment.id)
+                comment.depth = depth + 1
+            else:
+                comment.path = Comment.path_segment(comment.id)
+                comment.depth = 0
+        Comment.objects.bulk_update(comments, ['path', 'depth'])
@@ -0,0 +1,57 @@
+import datetime
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.deletion import DEFAULT_BATCH_SIZE, pending_jobs, prune_change_log, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run scheduled project and issue deletions in bounded batches (see api/deletion.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Run the jobs that are waiting now, then exit')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Rows deleted per transaction (default: {DEFAULT_BATCH_SIZE})')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds between polls for new jobs (default: 5)')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Also run jobs that failed before')
+        parser.add_argument('--keep-changes-days', type=int,
+                            default=getattr(settings, 'CHANGE_LOG_RETENTION_DAYS', 30),
+                            help='Prune change-feed rows older than this (default: CHANGE_LOG_RETENTION_DAYS; '
+                                 '0 keeps them all)')
+
+    def handle(self, *args, **options):
+        while True:
+            # Only ids: another worker may finish a job before we reach it
+            job_ids = list(pending_jobs(options['retry_failed']).values_list('id', flat=True))
+            for job_id in job_ids:
+                job = pending_jobs(options['retry_failed']).filter(pk=job_id).first()
+                if job is None:
+                    continue
+                self.run(job, options['batch_size'])
+            if options['keep_changes_days'] > 0:
+                self.prune(options['keep_changes_days'], options['batch_size'])
+            if options['once']:
+                return
+            time.sleep(options['interval'])
+
+    def run(self, job, batch_size):
+        start = time.perf_counter()
+        try:
+            job = run_job(job, batch_size)
+        except Exception as exc:
+            self.stderr.write(self.style.ERROR(f'Job {job.id} ({job.model} {job.object_id}) failed: {exc}'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Job {job.id}: deleted {job.model} {job.object_id} with {job.issues_deleted} issues '
+            f'and {job.comments_deleted} comments in {time.perf_counter() - start:.1f}s'
+        ))
+
+    def prune(self, days, batch_size):
+        pruned = prune_change_log(timezone.now() - datetime.timedelta(days=days), batch_size)
+        if pruned:
+            self.stdout.write(self.style.SUCCESS(f'Pruned {pruned} change-feed rows older than {days} days'))
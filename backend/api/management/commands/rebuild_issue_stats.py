@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from api.models import Project, Issue, IssueStatusTransition, DailyIssueStats
+from api.stats import backfill_transitions, rebuild_project_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily issue-flow rollups (DailyIssueStats) from the recorded status transitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='projects',
+            help='Only this project (repeatable; default: every project)',
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='First record transitions for issues that have none (written before they were captured)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk_create (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        project_ids = options['projects']
+        if project_ids:
+            missing = set(project_ids) - set(Project.objects.filter(pk__in=project_ids).values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f'No such project: {", ".join(map(str, sorted(missing)))}')
+
+        if options['backfill']:
+            issues = Issue.objects.live()
+            if project_ids:
+                issues = issues.filter(project_id__in=project_ids)
+            backfilled = backfill_transitions(issues, options['batch_size'])
+            self.stdout.write(f'Backfilled transitions for {backfilled} issues')
+
+        if not project_ids:
+            # Projects with transitions, and stale rollups of any without
+            project_ids = sorted(
+                set(IssueStatusTransition.objects.values_list('project_id', flat=True).distinct())
+                | set(DailyIssueStats.objects.values_list('project_id', flat=True).distinct())
+            )
+
+        rows = 0
+        for project_id in project_ids:
+            # One short transaction per project
+            rows += rebuild_project_stats(project_id, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows} daily rows for {len(project_ids)} projects in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from api.models import Project, Issue, CacheVersion
+
+COUNTER_FIELDS = ('issue_count', 'open_issues', 'in_progress_issues', 'closed_issues')
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized per-project issue counters and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report projects whose counters have drifted',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of projects written per bulk_update (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Lock the project rows first: concurrent Issue writes queue up on
+            # their counter UPDATE and apply on top of the corrected values.
+            projects = list(Project.objects.select_for_update().only('id', 'name', *COUNTER_FIELDS))
+
+            # One grouped scan over Issue instead of four aggregates per project;
+            # issues scheduled for deletion are no longer counted
+            actual = {}
+            rows = Issue.objects.filter(deleted_at__isnull=True).values('project_id', 'status').annotate(n=Count('id')).order_by()
+            for row in rows:
+                counts = actual.setdefault(row['project_id'], dict.fromkeys(COUNTER_FIELDS, 0))
+                counts['issue_count'] += row['n']
+                field = Project.STATUS_COUNTER_FIELDS.get(row['status'])
+                if field:
+                    counts[field] += row['n']
+
+            drifted = []
+            for project in projects:
+                expected = actual.get(project.id, dict.fromkeys(COUNTER_FIELDS, 0))
+                stored = {field: getattr(project, field) for field in COUNTER_FIELDS}
+                if stored == expected:
+                    continue
+                self.stdout.write(f'Project {project.id} ({project.name}): {stored} -> {expected}')
+                for field, value in expected.items():
+                    setattr(project, field, value)
+                drifted.append(project)
+
+            if drifted and not options['dry_run']:
+                Project.objects.bulk_update(drifted, COUNTER_FIELDS, batch_size=options['batch_size'])
+                # bulk_update sends no signals; cached responses show the counters
+                CacheVersion.bump_projects(*(project.id for project in drifted))
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All project counters are accurate'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} projects have drifted counters (dry run)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired counters on {len(drifted)} projects'))
@@ -0,0 +1,374 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from api.cache import invalidate_cached_users
+from api.search import deferred_indexing
+from api.models import Project, Issue, Comment, UserProfile, IssueStatusTransition, DailyIssueStats, CacheVersion
+from .import_tracker import preserve_timestamps
+
+ROLE_WEIGHTS = {'admin': 1, 'project_manager': 9, 'developer': 55, 'tester': 20, 'guest': 15}
+PRIORITY_WEIGHTS = {'low': 30, 'medium': 45, 'high': 18, 'critical': 7}
+FIRST_NAMES = ('Ada', 'Alan', 'Barbara', 'Dennis', 'Edsger', 'Frances', 'Grace', 'Guido', 'Ken',
+               'Linus', 'Margaret', 'Radia', 'Sophie', 'Tim', 'Yukihiro')
+LAST_NAMES = ('Allen', 'Hopper', 'Kernighan', 'Knuth', 'Lamport', 'Liskov', 'Perlman', 'Ritchie',
+              'Thompson', 'Torvalds', 'Wilson', 'Wirth')
+PROJECT_WORDS = ('Atlas', 'Beacon', 'Comet', 'Delta', 'Ember', 'Falcon', 'Granite', 'Harbor',
+                 'Orbit', 'Quartz', 'Summit', 'Vertex')
+VERBS = ('Fix', 'Add', 'Remove', 'Refactor', 'Speed up', 'Document', 'Test', 'Handle', 'Log', 'Validate')
+NOUNS = ('login', 'search', 'export', 'pagination', 'cache', 'upload', 'dashboard', 'comments',
+         'notifications', 'permissions', 'settings page', 'import', 'billing', 'API tokens')
+DETAILS = ('on mobile', 'for large projects', 'after timeout', 'with unicode input', 'under load',
+           'in Safari', 'for guests', 'when offline', 'on first run', 'in dark mode')
+SENTENCES = (
+    'Steps to reproduce are in the description.',
+    'I can reproduce this on the latest build.',
+    'Could this be related to the last release?',
+    'Attached the logs from the failing run.',
+    'This blocks the next milestone.',
+    'Works for me, can you share your settings?',
+    'The fix looks good, merging after review.',
+    'We should add a regression test for this.',
+    'Moving this to the next sprint.',
+    'Same problem here since the upgrade.',
+)
+
+
+# Columns written by Command.insert_rows, in tuple order
+ISSUE_FIELDS = ('id', 'project', 'reporter', 'assignee', 'title', 'description', 'status', 'priority',
+                'created_at', 'updated_at', 'comments_updated_at')
+COMMENT_FIELDS = ('id', 'issue', 'author', 'parent_comment', 'path', 'depth', 'content', 'created_at', 'updated_at')
+TRANSITION_FIELDS = ('project_id', 'issue_id', 'from_status', 'to_status', 'created_at')
+STATS_FIELDS = ('project_id', 'date', 'status', 'entered', 'exited')
+
+
+def cumulative(weights):
+    total, cum = 0, []
+    for weight in weights:
+        total += weight
+        cum.append(total)
+    return cum
+
+
+def next_id(model):
+    return (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = ('Generate a deterministic, production-sized dataset (users with profiles, projects, '
+            'issues, comment threads) with batched bulk inserts, for benchmarks and load tests')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Users to create (default: 100)')
+        parser.add_argument('--projects', type=int, default=10, help='Projects to create (default: 10)')
+        parser.add_argument('--issues', type=int, default=10000,
+                            help='Issues in total, skewed across the projects (default: 10000)')
+        parser.add_argument('--comments', type=int, default=30000,
+                            help='Comments in total, skewed across the issues (default: 30000)')
+        parser.add_argument('--max-depth', type=int, default=20,
+                            help=f'Deepest reply level (default: 20, at most {Comment.MAX_DEPTH})')
+        parser.add_argument('--days', type=int, default=365,
+                            help='Days of history the issues are spread over (default: 365)')
+        parser.add_argument('--end', type=datetime.date.fromisoformat,
+                            help='Last day of the history, YYYY-MM-DD (default: today); '
+                                 'fix it for byte-identical timestamps across runs')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument('--username-prefix', default='user',
+                            help='Usernames are <prefix><n>, n = 1..--users (default: user)')
+        parser.add_argument('--password', default='password',
+                            help='Password of every generated user, hashed once (default: password)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows per bulk_create (default: 5000)')
+
+    def handle(self, *args, **options):
+        for name in ('users', 'projects', 'issues', 'comments', 'days'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} cannot be negative')
+        if options['projects'] and not options['users']:
+            raise CommandError('Projects need at least one user')
+        if options['issues'] and not options['projects']:
+            raise CommandError('Issues need at least one project')
+        if options['comments'] and not options['issues']:
+            raise CommandError('Comments need at least one issue')
+        if not 0 <= options['max_depth'] <= Comment.MAX_DEPTH:
+            raise CommandError(f'--max-depth must be between 0 and {Comment.MAX_DEPTH}')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.max_depth = options['max_depth']
+        end = options['end'] or timezone.localdate()
+        self.end = timezone.make_aware(datetime.datetime.combine(end, datetime.time(23, 59, 59)))
+        self.start = self.end - datetime.timedelta(days=max(options['days'], 1))
+        self.span = (self.end - self.start).total_seconds()
+        # Looked up once: these run for every row
+        self.adapt = connection.ops.adapt_datetimefield_value
+        self.tz = timezone.get_current_timezone()
+        self.rows = {}
+
+        usernames = [f'{options["username_prefix"]}{n}' for n in range(1, options['users'] + 1)]
+        for offset in range(0, len(usernames), 500):
+            taken = User.objects.filter(username__in=usernames[offset:offset + 500]).values_list('username', flat=True).first()
+            if taken:
+                raise CommandError(f'User "{taken}" already exists; pick another --username-prefix')
+
+        began = time.perf_counter()
+        # Ids are assigned here rather than by the database, so every foreign
+        # key and comment path is known before its row is written. Run against
+        # an idle database: a concurrent INSERT could take one of these ids.
+        if connection.vendor == 'sqlite':
+            # A 256 MB page cache keeps the growing indexes in memory
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA cache_size = -262144')
+        with transaction.atomic(), preserve_timestamps(Project, UserProfile), deferred_indexing(connection):
+            self.ids = {model: next_id(model) for model in (User, Project, Issue, Comment)}
+            self.seed_users(usernames, options['password'])
+            self.seed_projects(options['projects'])
+            self.seed_issues(options['issues'], options['comments'])
+            self.reset_sequences()
+            self.invalidate(options['users'], options['projects'])
+        elapsed = time.perf_counter() - began
+
+        total = sum(self.rows.values())
+        summary = ', '.join(f'{count} {name}' for name, count in self.rows.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {summary} in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)'
+        ))
+
+    # -- helpers -------------------------------------------------------------
+
+    def insert(self, model, objs, label=None):
+        if not objs:
+            return
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+        label = label or model._meta.verbose_name_plural
+        self.rows[label] = self.rows.get(label, 0) + len(objs)
+
+    def insert_rows(self, model, fields, rows, label=None):
+        """One executemany of `rows`, tuples of database values for `fields`."""
+        if not rows:
+            return
+        meta, quote = model._meta, connection.ops.quote_name
+        columns = ', '.join(quote(meta.get_field(name).column) for name in fields)
+        placeholders = ', '.join(['%s'] * len(fields))
+        with connection.cursor() as cursor:
+            cursor.executemany(f'INSERT INTO {quote(meta.db_table)} ({columns}) VALUES ({placeholders})', rows)
+        label = label or meta.verbose_name_plural
+        self.rows[label] = self.rows.get(label, 0) + len(rows)
+
+    def moment(self, fraction):
+        """The point `fraction` (0..1) of the way through the history."""
+        return self.start + (self.end - self.start) * min(max(fraction, 0.0), 1.0)
+
+    def later(self, seconds, mean_hours):
+        """A random time after `seconds` into the history, before its end."""
+        return min(seconds + self.rng.expovariate(1 / mean_hours) * 3600, self.span)
+
+    def timestamp(self, seconds):
+        """`seconds` into the history, as the database stores it."""
+        return self.adapt(self.start + datetime.timedelta(seconds=seconds))
+
+    def day(self, seconds):
+        """The local date `seconds` into the history, as TruncDate sees it."""
+        return (self.start + datetime.timedelta(seconds=seconds)).astimezone(self.tz).date()
+
+    # -- users ---------------------------------------------------------------
+
+    def seed_users(self, usernames, password):
+        # One hash for everyone: PBKDF2 per row would dominate the run
+        password = make_password(password)
+        roles, role_cum = list(ROLE_WEIGHTS), cumulative(ROLE_WEIGHTS.values())
+        first_id = self.ids[User]
+        self.user_ids = range(first_id, first_id + len(usernames))
+        self.owner_ids = []
+        for offset in range(0, len(usernames), self.batch_size):
+            users, profiles = [], []
+            for index, username in enumerate(usernames[offset:offset + self.batch_size], start=offset):
+                user_id = first_id + index
+                # The first user administers the dataset
+                role = 'admin' if index == 0 else self.rng.choices(roles, cum_weights=role_cum)[0]
+                joined = self.moment(self.rng.random() * 0.2) - datetime.timedelta(days=30)
+                users.append(User(
+                    id=user_id, username=username, email=f'{username}@example.com', password=password,
+                    first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES),
+                    is_staff=role == 'admin', date_joined=joined,
+                ))
+                profile = UserProfile(user_id=user_id, created_at=joined)
+                profile.apply_role(role)
+                profiles.append(profile)
+                if profile.can_create_projects:
+                    self.owner_ids.append(user_id)
+            self.insert(User, users)
+            self.insert(UserProfile, profiles)
+        if not self.owner_ids:
+            self.owner_ids = list(self.user_ids)
+
+    # -- projects ------------------------------------------------------------
+
+    def seed_projects(self, count):
+        first_id = self.ids[Project]
+        self.projects = []
+        self.teams = []
+        for index in range(count):
+            owner_id = self.rng.choice(self.owner_ids)
+            created = self.start - datetime.timedelta(hours=self.rng.uniform(1, 24 * 30))
+            self.projects.append(Project(
+                id=first_id + index, owner_id=owner_id, created_at=created, updated_at=created,
+                name=f'{self.rng.choice(PROJECT_WORDS)} {first_id + index}',
+                description=f'Seeded project {index + 1} of {count}.',
+            ))
+            # A small team does most of a project's work; the owner is in it
+            size = min(len(self.user_ids), self.rng.randint(3, 15))
+            team = [owner_id] + [uid for uid in self.rng.sample(self.user_ids, size) if uid != owner_id]
+            self.teams.append((team, cumulative(1 / (rank + 1) for rank in range(len(team)))))
+        self.insert(Project, self.projects)
+
+    # -- issues, comments, transitions ---------------------------------------
+
+    def seed_issues(self, count, comment_count):
+        """
+        The bulk of the rows. They skip model instances and bulk_create, whose
+        per-value field preparation costs several times the INSERT itself:
+        each batch is one executemany of plain tuples (see insert_rows).
+        """
+        # A few projects hold most of the issues, a few issues most of the comments
+        project_cum = cumulative(1 / (rank + 1) ** 0.8 for rank in range(len(self.projects)))
+        project_indexes = range(len(self.projects))
+        per_issue = self.spread(comment_count, count)
+        priorities, priority_cum = list(PRIORITY_WEIGHTS), cumulative(PRIORITY_WEIGHTS.values())
+        counters = [dict.fromkeys(['issue_count', *Project.STATUS_COUNTER_FIELDS.values()], 0) for _ in self.projects]
+        last_update = [0.0] * len(self.projects)
+        rollups = {}
+        span = self.span
+        first_id = self.ids[Issue]
+        self.comment_id = self.ids[Comment]
+        rng = self.rng
+
+        for offset in range(0, count, self.batch_size):
+            issues, comments, transitions = [], [], []
+            batch = range(offset, min(offset + self.batch_size, count))
+            chosen = rng.choices(project_indexes, cum_weights=project_cum, k=len(batch))
+            for index, project_index in zip(batch, chosen):
+                project_id = self.projects[project_index].id
+                team, team_cum = self.teams[project_index]
+                issue_id = first_id + index
+                # Seconds into the history; ids follow creation time, as in production
+                created = span * (index + rng.random()) / count
+                roll = rng.random()
+                # Older issues are more likely to be done
+                age = 1 - created / span
+                status = 'closed' if roll < 0.1 + 0.8 * age else 'in_progress' if roll < 0.25 + 0.8 * age else 'open'
+                updated = created if status == 'open' else self.later(created, 24 * 7)
+                assignee_id = None
+                if status != 'open' or rng.random() < 0.6:
+                    assignee_id = rng.choices(team, cum_weights=team_cum)[0]
+                commented = self.add_comments(issue_id, created, per_issue[index], team, comments)
+                created_at, updated_at = self.timestamp(created), self.timestamp(updated)
+                issues.append((
+                    issue_id, project_id, rng.choices(team, cum_weights=team_cum)[0], assignee_id,
+                    f'{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(DETAILS)}',
+                    ' '.join(rng.sample(SENTENCES, 2)), status,
+                    rng.choices(priorities, cum_weights=priority_cum)[0],
+                    created_at, updated_at, self.timestamp(commented) if commented != created else created_at,
+                ))
+
+                project_counters = counters[project_index]
+                project_counters['issue_count'] += 1
+                project_counters[Project.STATUS_COUNTER_FIELDS[status]] += 1
+                last_update[project_index] = max(last_update[project_index], updated)
+                # The same history backfill_transitions would infer
+                transitions.append((project_id, issue_id, '', 'open', created_at))
+                rollups.setdefault((project_id, self.day(created), 'open'), [0, 0])[0] += 1
+                if status != 'open':
+                    transitions.append((project_id, issue_id, 'open', status, updated_at))
+                    day = self.day(updated)
+                    rollups.setdefault((project_id, day, status), [0, 0])[0] += 1
+                    rollups.setdefault((project_id, day, 'open'), [0, 0])[1] += 1
+            self.insert_rows(Issue, ISSUE_FIELDS, issues)
+            self.insert_rows(Comment, COMMENT_FIELDS, comments)
+            self.insert_rows(IssueStatusTransition, TRANSITION_FIELDS, transitions, 'status transitions')
+
+        for project, project_counters, updated in zip(self.projects, counters, last_update):
+            for field, value in project_counters.items():
+                setattr(project, field, value)
+            if project_counters['issue_count']:
+                project.updated_at = self.start + datetime.timedelta(seconds=updated)
+        if self.projects:
+            Project.objects.bulk_update(self.projects, [*counters[0], 'updated_at'], batch_size=self.batch_size)
+        adapt_date = connection.ops.adapt_datefield_value
+        self.insert_rows(DailyIssueStats, STATS_FIELDS, [
+            (project_id, adapt_date(day), status, entered, exited)
+            for (project_id, day, status), (entered, exited) in sorted(rollups.items())
+        ], 'daily stats')
+
+    def spread(self, total, buckets):
+        """Split `total` into `buckets` heavy-tailed counts that sum to it."""
+        if not buckets:
+            return []
+        weights = [self.rng.paretovariate(1.2) for _ in range(buckets)]
+        scale = total / sum(weights)
+        counts = [int(weight * scale) for weight in weights]
+        for index in self.rng.sample(range(buckets), max(total - sum(counts), 0)):
+            counts[index] += 1
+        return counts
+
+    def add_comments(self, issue_id, created, count, team, comments):
+        """
+        Append a thread of `count` comment rows: new top-level comments,
+        replies to the latest one (long back-and-forth chains) and replies to
+        older ones. Returns the time of the last comment.
+        """
+        rng = self.rng
+        thread = []  # (id, path, depth, parent position) per comment
+        when = created
+        for _ in range(count):
+            roll = rng.random()
+            parent = None
+            if thread and roll >= 0.25:
+                parent = len(thread) - 1 if roll < 0.75 else rng.randrange(len(thread))
+                while parent is not None and thread[parent][2] >= self.max_depth:
+                    parent = thread[parent][3]
+            comment_id = self.comment_id
+            self.comment_id += 1
+            segment = Comment.path_segment(comment_id)
+            if parent is None:
+                path, depth, parent_id = segment, 0, None
+            else:
+                path, depth, parent_id = thread[parent][1] + segment, thread[parent][2] + 1, thread[parent][0]
+            thread.append((comment_id, path, depth, parent))
+            when = self.later(when, 12)
+            stamp = self.timestamp(when)
+            comments.append((comment_id, issue_id, rng.choice(team), parent_id, path, depth,
+                             rng.choice(SENTENCES), stamp, stamp))
+        return when
+
+    # -- bookkeeping ---------------------------------------------------------
+
+    def reset_sequences(self):
+        """Explicit ids leave PostgreSQL sequences behind; a no-op on SQLite."""
+        statements = connection.ops.sequence_reset_sql(no_style(), [User, Project, Issue, Comment])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def invalidate(self, user_count, project_count):
+        """
+        bulk_create skips the receivers. The new ids may have been used by
+        deleted rows, so drop anything cached under them too.
+        """
+        project_ids = range(self.ids[Project], self.ids[Project] + project_count)
+        user_ids = range(self.ids[User], self.ids[User] + user_count)
+        stale = [CacheVersion.project_scope(pid) for pid in project_ids] + [CacheVersion.user_scope(uid) for uid in user_ids]
+        existing = set(CacheVersion.objects.filter(scope__startswith='project:').values_list('scope', flat=True))
+        existing.update(CacheVersion.objects.filter(scope__startswith='user:').values_list('scope', flat=True))
+        CacheVersion.bump(CacheVersion.GLOBAL, CacheVersion.PROJECTS, CacheVersion.USERS,
+                          *(scope for scope in stale if scope in existing))
+        invalidate_cached_users(user_ids)
@@ -0,0 +1,108 @@
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+# Totals of the request being handled; context-local, so queries the async
+# ORM runs in worker threads are counted for the request that made them
+_request_stats = ContextVar('request_query_stats', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats['count'] += 1
+        stats['time'] += time.perf_counter() - start
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+class QueryCountMiddleware:
+    """
+    Count and time every SQL query executed while handling a request and
+    report the totals as X-DB-Queries and X-DB-Time-ms response headers.
+
+    Works in both sync (WSGI) and async (ASGI) mode, so it does not force
+    async views back onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        return self.finish(response, stats)
+
+    async def __acall__(self, request):
+        stats, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        return self.finish(response, stats)
+
+    def start(self):
+        # Connections opened before this module was imported have no recorder yet
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        stats = {'count': 0, 'time': 0.0}
+        return stats, _request_stats.set(stats)
+
+    def finish(self, response, stats):
+        response['X-DB-Queries'] = str(stats['count'])
+        response['X-DB-Time-ms'] = f"{stats['time'] * 1000:.2f}"
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that also runs in async mode. WhiteNoise itself is
+    sync-only, which makes Django put every ASGI request, API calls
+    included, through a thread on the way in and out. Here only static
+    files are served from a thread; other requests pass straight through.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:27
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_issue_counters(apps, schema_editor):
+    Project = apps.get_model('api', 'Project')
+    Issue = apps.get_model('api', 'Issue')
+    fields = {'open': 'open_issues', 'in_progress': 'in_progress_issues', 'closed': 'closed_issues'}
+
+    counters = {}
+    rows = Issue.objects.values('project_id', 'status').annotate(n=Count('id')).order_by()
+    for row in rows:
+        counts = counters.setdefault(row['project_id'], {'issue_count': 0})
+        counts['issue_count'] += row['n']
+        if row['status'] in fields:
+            counts[fields[row['status']]] = row['n']
+
+    for project_id, counts in counters.items():
+        Project.objects.filter(pk=project_id).update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_userprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='closed_issues',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_issues',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='issue_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_issues',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_issue_counters, migrations.RunPython.noop),
+    ]
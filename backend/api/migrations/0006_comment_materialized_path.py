@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+PATH_SEGMENT_WIDTH = 10
+BATCH_SIZE = 1000
+
+
+def backfill_comment_paths(apps, schema_editor):
+    """Walk the threads level by level so every parent path exists before its replies."""
+    Comment = apps.get_model('api', 'Comment')
+    parents = {None: ''}  # id -> path, for the previous level
+    depth = 0
+    while parents:
+        current = {}
+        parent_ids = list(parents)
+        for i in range(0, len(parent_ids), BATCH_SIZE):
+            chunk = parent_ids[i:i + BATCH_SIZE]
+            if chunk == [None]:
+                level = Comment.objects.filter(parent_comment__isnull=True)
+            else:
+                level = Comment.objects.filter(parent_comment_id__in=chunk)
+            batch = []
+            for comment in level.only('id', 'parent_comment_id').order_by('id').iterator(chunk_size=BATCH_SIZE):
+                comment.path = parents[comment.parent_comment_id] + str(comment.id).zfill(PATH_SEGMENT_WIDTH)
+                comment.depth = depth
+                current[comment.id] = comment.path
+                batch.append(comment)
+            Comment.objects.bulk_update(batch, ['path', 'depth'], batch_size=BATCH_SIZE)
+        parents = current
+        depth += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_project_issue_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=1000),
+        ),
+        migrations.RunPython(backfill_comment_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['issue', 'path'], name='api_comment_issue_path_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+from django.db import migrations, OperationalError
+
+# The SQL is copied here, not imported from api.search, so later changes to
+# the runtime module do not change what this migration does.
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE api_issue ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS api_issue_search_vector_gin ON api_issue USING GIN (search_vector)',
+]
+POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS api_issue_search_vector_gin',
+    'ALTER TABLE api_issue DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS api_issue_fts USING fts5("
+    "title, description, content='api_issue', content_rowid='id', tokenize='porter unicode61')"
+)
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS api_issue_fts_ai AFTER INSERT ON api_issue BEGIN
+        INSERT INTO api_issue_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_issue_fts_ad AFTER DELETE ON api_issue BEGIN
+        INSERT INTO api_issue_fts(api_issue_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_issue_fts_au AFTER UPDATE OF title, description ON api_issue BEGIN
+        INSERT INTO api_issue_fts(api_issue_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO api_issue_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS api_issue_fts_ai',
+    'DROP TRIGGER IF EXISTS api_issue_fts_ad',
+    'DROP TRIGGER IF EXISTS api_issue_fts_au',
+    'DROP TABLE IF EXISTS api_issue_fts',
+]
+
+
+def install_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+        elif vendor == 'sqlite':
+            try:
+                cursor.execute(SQLITE_TABLE)
+            except OperationalError:
+                # SQLite compiled without FTS5: search falls back to icontains
+                return
+            for sql in SQLITE_TRIGGERS:
+                cursor.execute(sql)
+            # Index the issues that already exist
+            cursor.execute("INSERT INTO api_issue_fts(api_issue_fts) VALUES ('rebuild')")
+
+
+def uninstall_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_UNINSTALL, 'sqlite': SQLITE_UNINSTALL}.get(vendor, [])
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text index for issue search: a generated tsvector column with a GIN
+    index on PostgreSQL, an FTS5 table maintained by triggers on SQLite.
+    """
+
+    dependencies = [
+        ('api', '0006_comment_materialized_path'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
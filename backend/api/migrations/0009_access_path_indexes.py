@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_issue_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('parent_comment__isnull', True)), fields=['issue', 'created_at', 'id'], name='api_comment_issue_roots_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['parent_comment', 'created_at', 'id'], name='api_comment_roots_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'status', '-created_at', '-id'], name='api_issue_proj_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'priority', '-created_at', '-id'], name='api_issue_proj_prio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='api_issue_status_created_idx'),
+        ),
+    ]
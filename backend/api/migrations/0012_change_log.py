@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_modification_markers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('project_id', models.IntegerField()),
+                ('model', models.CharField(choices=[('issue', 'Issue'), ('comment', 'Comment')], max_length=10)),
+                ('object_id', models.IntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project_id', 'id'], name='api_changelog_proj_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_deferred_deletion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyIssueStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.IntegerField()),
+                ('date', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('entered', models.PositiveIntegerField(default=0)),
+                ('exited', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project_id', 'date', 'status'), name='api_dailyissuestats_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='IssueStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('project_id', models.IntegerField()),
+                ('issue_id', models.IntegerField()),
+                ('from_status', models.CharField(blank=True, max_length=20)),
+                ('to_status', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project_id', 'created_at'], name='api_transition_proj_idx'), models.Index(fields=['issue_id'], name='api_transition_issue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_issue_status_transitions'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='api_comment_issue_roots_idx',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_drop_comment_issue_roots_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='changes_pruned_through',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -1,7 +1,15 @@
-from django.db import models
+import time
+from functools import partial
+
+from django.db import connection, models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from . import events
+from .cache import invalidate_cached_user
 
 User = get_user_model()
 
@@ -14,6 +22,15 @@ class UserProfile(models.Model):
         ('guest', 'Guest'),
     ]
     
+    # Permission flags each role starts with; admins can override them per user
+    ROLE_PERMISSIONS = {
+        'admin': {'can_create_projects': True, 'can_delete_issues': True, 'can_assign_issues': True},
+        'project_manager': {'can_create_projects': True, 'can_delete_issues': True, 'can_assign_issues': True},
+        'developer': {'can_create_projects': True, 'can_delete_issues': False, 'can_assign_issues': False},
+        'tester': {'can_create_projects': False, 'can_delete_issues': False, 'can_assign_issues': False},
+        'guest': {'can_create_projects': False, 'can_delete_issues': False, 'can_assign_issues': False},
+    }
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='developer')
     can_create_projects = models.BooleanField(default=True)
@@ -24,6 +41,12 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.get_role_display()}"
     
+    def apply_role(self, role):
+        """Set the role and the permission flags it implies (not saved)."""
+        self.role = role
+        for field, value in self.ROLE_PERMISSIONS[role].items():
+            setattr(self, field, value)
+    
     @property
     def is_admin(self):
         return self.role == 'admin'
@@ -41,15 +64,94 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, update_fields=None, **kwargs):
+    invalidate_cached_user(instance.pk)
+    # Logins only touch last_login, which no cached response renders
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        CacheVersion.bump(CacheVersion.USERS)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+    CacheVersion.bump(CacheVersion.USERS)
+
+class ProjectQuerySet(models.QuerySet):
+    def live(self):
+        """Projects not scheduled for deletion."""
+        return self.filter(deleted_at__isnull=True)
+
 class Project(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_projects', null=True, blank=True)
+    # Touched by project edits and by every write to one of its issues
+    # (see adjust_issue_counters); drives ETag/Last-Modified on project reads
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Denormalized issue counters, maintained by Issue.save() and the
+    # post_delete receiver below. Repair drift with `manage.py recount_project_issues`.
+    issue_count = models.PositiveIntegerField(default=0)
+    open_issues = models.PositiveIntegerField(default=0)
+    in_progress_issues = models.PositiveIntegerField(default=0)
+    closed_issues = models.PositiveIntegerField(default=0)
+    # Set when a deletion is scheduled (see api/deletion.py); the project and
+    # everything in it disappear from the API at once, the rows follow in batches
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    # Highest ChangeLog id of the project removed by prune_change_log(); a
+    # /changes/?since= cursor below it has missed changes and must resync
+    changes_pruned_through = models.BigIntegerField(default=0)
+
+    objects = ProjectQuerySet.as_manager()
+
+    STATUS_COUNTER_FIELDS = {
+        'open': 'open_issues',
+        'in_progress': 'in_progress_issues',
+        'closed': 'closed_issues',
+    }
+
+    class Meta:
+        indexes = [
+            # Read by every issue and comment list (IssueQuerySet.live); usually empty
+            models.Index(
+                fields=['deleted_at'], name='api_project_deleted_idx',
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def adjust_issue_counters(cls, project_id, deltas):
+        """
+        Apply {status: delta} changes to a project's counters in one UPDATE.
+        issue_count moves by the sum of the deltas. The same UPDATE marks the
+        project modified, so call it (with no deltas) for any issue write.
+        """
+        updates = {'updated_at': timezone.now()}
+        total = 0
+        for issue_status, delta in deltas.items():
+            if not delta:
+                continue
+            field = cls.STATUS_COUNTER_FIELDS.get(issue_status)
+            if field:
+                updates[field] = F(field) + delta
+            total += delta
+        if total:
+            updates['issue_count'] = F('issue_count') + total
+        cls.objects.filter(pk=project_id).update(**updates)
+
+class IssueQuerySet(models.QuerySet):
+    def live(self):
+        """Issues neither scheduled for deletion nor in a project that is."""
+        return self.filter(deleted_at__isnull=True).exclude(
+            project_id__in=Project.objects.filter(deleted_at__isnull=False).values('id')
+        )
+
 class Issue(models.Model):
     STATUS_CHOICES = [
         ('open', 'Open'),
@@ -73,16 +175,131 @@ class Issue(models.Model):
     project = models.ForeignKey('api.Project', on_delete=models.CASCADE, related_name='issues')
     reporter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reported_issues')
     assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_issues')
+    # Last comment created, edited or deleted on this issue
+    comments_updated_at = models.DateTimeField(default=timezone.now)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = IssueQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination on (created_at, id), globally and per project
+            models.Index(fields=['-created_at', '-id'], name='api_issue_created_id_idx'),
+            models.Index(fields=['project', '-created_at', '-id'], name='api_issue_proj_created_idx'),
+            # Filtered lists: project + status/priority (or status alone), newest first
+            models.Index(fields=['project', 'status', '-created_at', '-id'], name='api_issue_proj_status_idx'),
+            models.Index(fields=['project', 'priority', '-created_at', '-id'], name='api_issue_proj_prio_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='api_issue_status_created_idx'),
+            # The few issues waiting for the deletion worker
+            models.Index(
+                fields=['deleted_at'], name='api_issue_deleted_idx',
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.project.name})"
 
+    def save(self, *args, **kwargs):
+        # Keep the project's issue counters in step with this row
+        with transaction.atomic(using=kwargs.get('using')):
+            previous = None
+            if not self._state.adding and self.pk is not None:
+                previous = (
+                    Issue.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list('project_id', 'status', 'reporter_id', 'assignee_id')
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            # Old and new reporter/assignee: the issue may have left their summaries
+            user_ids = {self.reporter_id, self.assignee_id, *(previous[2:] if previous else ())}
+            CacheVersion.bump_projects(
+                self.project_id, previous[0] if previous else None, user_ids=user_ids,
+                counters=previous is None or previous[:2] != (self.project_id, self.status),
+            )
+            if previous is None:
+                Project.adjust_issue_counters(self.project_id, {self.status: 1})
+                IssueStatusTransition.record([(self.project_id, self.pk, None, self.status)])
+            elif previous[:2] == (self.project_id, self.status):
+                Project.adjust_issue_counters(self.project_id, {})
+            else:
+                old_project_id, old_status = previous[:2]
+                if old_project_id == self.project_id:
+                    Project.adjust_issue_counters(self.project_id, {old_status: -1, self.status: 1})
+                    IssueStatusTransition.record([(self.project_id, self.pk, old_status, self.status)])
+                else:
+                    Project.adjust_issue_counters(old_project_id, {old_status: -1})
+                    Project.adjust_issue_counters(self.project_id, {self.status: 1})
+                    IssueStatusTransition.record([
+                        (old_project_id, self.pk, old_status, None),
+                        (self.project_id, self.pk, None, self.status),
+                    ])
+                    # Gone from the old project's change feed
+                    ChangeLog.record(old_project_id, ChangeLog.ISSUE, [self.pk], deleted=True)
+            ChangeLog.record(self.project_id, ChangeLog.ISSUE, [self.pk])
+
+# Receivers run in the order they are connected: the cache versions are
+# locked before the project row, as in Issue.save, so concurrent writers
+# cannot deadlock on the two
+@receiver(post_delete, sender=Issue)
+def bump_deleted_issue_cache_version(sender, instance, **kwargs):
+    CacheVersion.bump_projects(instance.project_id, user_ids=(instance.reporter_id, instance.assignee_id))
+
+# An issue scheduled for deletion already left the counters, the flow
+# stats and the change feed (schedule_issue_deletion); a later cascade
+# (its reporter deleted, the admin) must not count it out again
+
+@receiver(post_delete, sender=Issue)
+def decrement_project_issue_counters(sender, instance, **kwargs):
+    # Runs inside the deletion transaction, including cascades from User deletes
+    if instance.deleted_at is None:
+        Project.adjust_issue_counters(instance.project_id, {instance.status: -1})
+
+@receiver(post_delete, sender=Issue)
+def record_deleted_issue_transition(sender, instance, **kwargs):
+    if instance.deleted_at is None:
+        IssueStatusTransition.record([(instance.project_id, instance.pk, instance.status, None)])
+
+class CommentQuerySet(models.QuerySet):
+    def live(self):
+        """Comments whose issue is not scheduled for deletion (see IssueQuerySet.live)."""
+        # Two NOT IN lists over the (small) set of pending deletions rather
+        # than a join, so list queries keep driving from their own indexes
+        return self.exclude(
+            issue_id__in=Issue.objects.filter(deleted_at__isnull=False).values('id')
+        ).exclude(
+            issue_id__in=Issue.objects.filter(
+                project_id__in=Project.objects.filter(deleted_at__isnull=False).values('id')
+            ).values('id')
+        )
+
 class Comment(models.Model):
+    # Materialized path: one fixed-width, zero-padded segment per ancestor,
+    # ending with the comment's own id, e.g. "00000000120000000034". Sorting
+    # by path yields depth-first thread order and a subtree is a single range
+    # on (issue, path). Digits only, so the order holds under any collation.
+    PATH_SEGMENT_WIDTH = 10
+    MAX_DEPTH = 99
+
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
     parent_comment = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    path = models.CharField(max_length=PATH_SEGMENT_WIDTH * (MAX_DEPTH + 1), blank=True, editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['issue', 'path'], name='api_comment_issue_path_idx'),
+            # Global top-level list: parent_comment IS NULL is an equality on this
+            # index's first column, which keeps the planner off the bare FK index
+            models.Index(fields=['parent_comment', 'created_at', 'id'], name='api_comment_roots_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.issue}"
@@ -90,3 +307,420 @@ class Comment(models.Model):
     @property
     def is_reply(self):
         return self.parent_comment is not None
+
+    @classmethod
+    def path_segment(cls, pk):
+        return str(pk).zfill(cls.PATH_SEGMENT_WIDTH)
+
+    @classmethod
+    def subtree_filter(cls, path):
+        """
+        Q matching the comment with `path` and all of its descendants.
+
+        Expressed as a range (not startswith/LIKE) so it is an index range
+        scan on every backend: the upper bound is the path of the next sibling.
+        """
+        width = cls.PATH_SEGMENT_WIDTH
+        next_sibling = path[:-width] + cls.path_segment(int(path[-width:]) + 1)
+        return models.Q(path__gte=path, path__lt=next_sibling)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding or self.path:
+            return super().save(*args, **kwargs)
+
+        # The path ends with our own id, so it can only be written after the INSERT
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if self.parent_comment_id:
+                parent = self.parent_comment
+                self.path = parent.path + self.path_segment(self.pk)
+                self.depth = parent.depth + 1
+            else:
+                self.path = self.path_segment(self.pk)
+                self.depth = 0
+            Comment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+
+class ChangeLog(models.Model):
+    """
+    Append-only change feed: one row per issue or comment written or
+    deleted, read by GET /api/projects/<id>/changes/?since=<id>.
+
+    The id is the feed cursor. Writers lock the project row before
+    appending (Issue.save already holds it for the counters), so within a
+    project ids are handed out in commit order and a reader that has seen
+    id N can never later find a committed change below N. project_id is a
+    plain column rather than a foreign key: tombstones are written while a
+    project's issues are being cascade-deleted, and the project's rows are
+    removed with it (see delete_project_changes). Rows older than
+    CHANGE_LOG_RETENTION_DAYS are pruned by the deletion worker (see
+    prune_change_log), which records the pruned cursor on the project.
+    """
+    ISSUE = 'issue'
+    COMMENT = 'comment'
+    MODEL_CHOICES = [
+        (ISSUE, 'Issue'),
+        (COMMENT, 'Comment'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    project_id = models.IntegerField()
+    model = models.CharField(max_length=10, choices=MODEL_CHOICES)
+    object_id = models.IntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # The feed query: WHERE project_id = %s AND id > %s ORDER BY id
+            models.Index(fields=['project_id', 'id'], name='api_changelog_proj_id_idx'),
+        ]
+
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return f"#{self.id} {self.model} {self.object_id} {action}"
+
+    @classmethod
+    def record(cls, project_id, model, object_ids, deleted=False):
+        """
+        Append a change for each of `object_ids`. Writes that bypass model
+        signals (bulk_create, update(), raw SQL) must call this themselves.
+        """
+        if project_id is None or not object_ids:
+            return
+        with transaction.atomic(savepoint=False):
+            if connection.features.has_select_for_update:
+                # Serializes appends per project until commit (SQLite
+                # serializes all writers anyway)
+                list(Project.objects.select_for_update().filter(pk=project_id).values_list('pk'))
+            changes = cls.objects.bulk_create([
+                cls(project_id=project_id, model=model, object_id=pk, deleted=deleted)
+                for pk in object_ids
+            ])
+            # Push to /events/ subscribers once the change is visible to them
+            transaction.on_commit(partial(events.publish_change, project_id, {
+                'cursor': max(change.id or 0 for change in changes),
+                'model': model,
+                'ids': list(object_ids),
+                'deleted': deleted,
+            }))
+
+    @classmethod
+    def latest(cls, project_id, pruned_through=None):
+        """
+        The newest cursor of a project's feed (0 when it is empty), never
+        below its pruned rows. Pass the project's changes_pruned_through
+        when it is already loaded.
+        """
+        latest = cls.objects.filter(project_id=project_id).order_by('-id').values_list('id', flat=True).first()
+        if pruned_through is None:
+            pruned_through = Project.objects.filter(pk=project_id).values_list('changes_pruned_through', flat=True).first()
+        return max(latest or 0, pruned_through or 0)
+
+    @classmethod
+    async def alatest(cls, project_id):
+        query = cls.objects.filter(project_id=project_id).order_by('-id').values_list('id', flat=True)
+        pruned = Project.objects.filter(pk=project_id).values_list('changes_pruned_through', flat=True)
+        return max(await query.afirst() or 0, await pruned.afirst() or 0)
+
+class DeletionJob(models.Model):
+    """
+    A project or issue deletion handed to the worker (`manage.py
+    process_deletions`, see api/deletion.py). The API marks the object
+    deleted and answers 202 with this job; the worker removes comments,
+    issues and finally the object itself in bounded batches, recording its
+    progress here for GET /api/deletions/<id>/. object_id and project_id are
+    plain columns: the job outlives the rows it deletes.
+    """
+    PROJECT = 'project'
+    ISSUE = 'issue'
+    MODEL_CHOICES = [
+        (PROJECT, 'Project'),
+        (ISSUE, 'Issue'),
+    ]
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    model = models.CharField(max_length=10, choices=MODEL_CHOICES)
+    object_id = models.IntegerField()
+    project_id = models.IntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    issues_total = models.PositiveIntegerField(default=0)
+    issues_deleted = models.PositiveIntegerField(default=0)
+    comments_deleted = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker's queue: oldest unfinished job first
+            models.Index(fields=['status', 'id'], name='api_deletionjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Delete {self.model} {self.object_id} ({self.status})"
+
+class IssueStatusTransition(models.Model):
+    """
+    One status change of an issue, recorded by every issue write that
+    changes it (Issue.save, the bulk endpoints, deletions). from_status is
+    empty when the issue entered the project (created or moved in) and
+    to_status when it left it (deleted or moved out). The source of the
+    DailyIssueStats rollups (see api/stats.py). issue_id and project_id are
+    plain columns, like ChangeLog's: transitions are written while issues
+    are being cascade-deleted.
+    """
+    id = models.BigAutoField(primary_key=True)
+    project_id = models.IntegerField()
+    issue_id = models.IntegerField()
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Rebuilding a project's rollups
+            models.Index(fields=['project_id', 'created_at'], name='api_transition_proj_idx'),
+            # Finding issues without transitions (rebuild_issue_stats --backfill)
+            models.Index(fields=['issue_id'], name='api_transition_issue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Issue {self.issue_id}: {self.from_status or '-'} -> {self.to_status or '-'}"
+
+    @classmethod
+    def record(cls, transitions, at=None):
+        """
+        Append (project_id, issue_id, from_status, to_status) transitions,
+        None for a missing side, and add them to today's rollups. Writes that
+        bypass Issue.save (bulk_create, update(), raw SQL) must call this.
+        """
+        transitions = [t for t in transitions if t[0] is not None and t[2] != t[3]]
+        if not transitions:
+            return
+        at = at or timezone.now()
+        with transaction.atomic(savepoint=False):
+            cls.objects.bulk_create([
+                cls(project_id=project_id, issue_id=issue_id, from_status=from_status or '',
+                    to_status=to_status or '', created_at=at)
+                for project_id, issue_id, from_status, to_status in transitions
+            ])
+            DailyIssueStats.add(timezone.localdate(at), transitions)
+
+class DailyIssueStats(models.Model):
+    """
+    Issues that entered and left each status of a project per day, kept
+    in step with IssueStatusTransition. The number of issues in a status on
+    a day is the sum of entered - exited up to that day.
+    """
+    project_id = models.IntegerField()
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    entered = models.PositiveIntegerField(default=0)
+    exited = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index of the stats endpoint's date-range reads
+            models.UniqueConstraint(fields=['project_id', 'date', 'status'], name='api_dailyissuestats_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Project {self.project_id} {self.date} {self.status}: +{self.entered} -{self.exited}"
+
+    @classmethod
+    def add(cls, date, transitions):
+        """Count (project_id, issue_id, from_status, to_status) transitions into the day's rows."""
+        deltas = {}
+        for project_id, _, from_status, to_status in transitions:
+            if from_status:
+                deltas.setdefault(project_id, {}).setdefault(from_status, [0, 0])[1] += 1
+            if to_status:
+                deltas.setdefault(project_id, {}).setdefault(to_status, [0, 0])[0] += 1
+        if connection.vendor in ('postgresql', 'sqlite'):
+            # One upsert adding to the existing rows
+            table = connection.ops.quote_name(cls._meta.db_table)
+            rows = [
+                (project_id, connection.ops.adapt_datefield_value(date), status, entered, exited)
+                for project_id, statuses in deltas.items() for status, (entered, exited) in statuses.items()
+            ]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {table} (project_id, date, status, entered, exited) '
+                    f'VALUES {", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))} '
+                    f'ON CONFLICT (project_id, date, status) DO UPDATE SET '
+                    f'entered = {table}.entered + excluded.entered, exited = {table}.exited + excluded.exited',
+                    [value for row in rows for value in row],
+                )
+            return
+        # Elsewhere rows are created at zero and then incremented in place,
+        # so concurrent writers never overwrite each other's counts
+        cls.objects.bulk_create([
+            cls(project_id=project_id, date=date, status=status)
+            for project_id, statuses in deltas.items() for status in statuses
+        ], ignore_conflicts=True)
+        for project_id, statuses in deltas.items():
+            cls.objects.filter(project_id=project_id, date=date, status__in=statuses).update(
+                entered=F('entered') + Case(
+                    *(When(status=status, then=Value(entered)) for status, (entered, _) in statuses.items()),
+                    default=Value(0),
+                ),
+                exited=F('exited') + Case(
+                    *(When(status=status, then=Value(exited)) for status, (_, exited) in statuses.items()),
+                    default=Value(0),
+                ),
+            )
+
+class CacheVersion(models.Model):
+    """
+    Version markers for the response cache (see CachedResponseMixin).
+
+    Writes bump the scopes they affect; cached responses are keyed by the
+    versions current when they were built, so a stale entry is never served
+    and never has to be deleted. Versions are microsecond timestamps (or the
+    previous version + 1, if larger) rather than plain counters, so they
+    keep moving forward after the table is emptied or a transaction rolls
+    back.
+
+    Scopes: `project:<id>` and `user:<id>` for one project's or user's
+    reads; `global` for cross-project issue reads (/api/issues/ and issue
+    detail); `projects` for the project list (project fields and issue
+    counters); `users` for anything rendering users.
+    """
+    GLOBAL = 'global'
+    PROJECTS = 'projects'
+    USERS = 'users'
+
+    scope = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.scope} @ {self.version}"
+
+    @staticmethod
+    def project_scope(project_id):
+        return f'project:{project_id}'
+
+    @staticmethod
+    def user_scope(user_id):
+        """Responses built for one user: their issues as reporter or assignee."""
+        return f'user:{user_id}'
+
+    # Scopes per UPDATE ... WHERE scope IN (...), well under SQLite's bound-variable limit
+    BUMP_BATCH_SIZE = 500
+
+    @classmethod
+    def bump(cls, *scopes):
+        """Move every scope to a new version; one UPDATE (per 500 scopes) once the rows exist."""
+        scopes = list(dict.fromkeys(scopes))
+        now = int(time.time() * 1_000_000)
+        new_version = Greatest(F('version') + 1, Value(now))
+        for start in range(0, len(scopes), cls.BUMP_BATCH_SIZE):
+            batch = scopes[start:start + cls.BUMP_BATCH_SIZE]
+            updated = cls.objects.filter(scope__in=batch).update(version=new_version)
+            if updated < len(batch):
+                # The rows that exist were just updated and are skipped as conflicts
+                cls.objects.bulk_create([cls(scope=scope, version=now) for scope in batch], ignore_conflicts=True)
+
+    @classmethod
+    def bump_all(cls):
+        """Move every scope that exists, and the shared ones, to a new version in one UPDATE."""
+        now = int(time.time() * 1_000_000)
+        cls.objects.update(version=Greatest(F('version') + 1, Value(now)))
+        cls.objects.bulk_create(
+            [cls(scope=scope, version=now) for scope in (cls.GLOBAL, cls.PROJECTS, cls.USERS)],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def bump_projects(cls, *project_ids, user_ids=(), counters=True):
+        """
+        For a write to issues or projects: bump the scopes of the given
+        projects and users (the reporters and assignees it touched) in the
+        writer's transaction, and the shared `global` scope, plus `projects`
+        when issue counters or projects changed, once it commits. Every write
+        in the system updates the shared rows, so they are kept out of the
+        writer's transaction and row locks.
+        """
+        scopes = [
+            *(cls.project_scope(pid) for pid in project_ids if pid is not None),
+            *(cls.user_scope(uid) for uid in user_ids if uid is not None),
+        ]
+        if scopes:
+            cls.bump(*scopes)
+        shared = [cls.GLOBAL, cls.PROJECTS] if counters else [cls.GLOBAL]
+        transaction.on_commit(lambda: cls.bump(*shared))
+
+    @classmethod
+    def current(cls, scopes):
+        """{scope: version} in one query; scopes never bumped are at 0."""
+        versions = dict.fromkeys(scopes, 0)
+        versions.update(cls.objects.filter(scope__in=scopes).values_list('scope', 'version'))
+        return versions
+
+    @classmethod
+    async def acurrent(cls, scopes):
+        versions = dict.fromkeys(scopes, 0)
+        async for scope, version in cls.objects.filter(scope__in=scopes).values_list('scope', 'version'):
+            versions[scope] = version
+        return versions
+
+# Before the row is written: cache versions are locked ahead of the project
+# row, as in Issue.save. A new project has no scope of its own yet, so only
+# the shared scopes move (on commit).
+@receiver(pre_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def bump_project_cache_version(sender, instance, **kwargs):
+    CacheVersion.bump_projects(instance.pk)
+
+@receiver(post_delete, sender=Issue)
+def log_deleted_issue(sender, instance, **kwargs):
+    if instance.deleted_at is None:
+        ChangeLog.record(instance.project_id, ChangeLog.ISSUE, [instance.pk], deleted=True)
+
+@receiver(post_delete, sender=Project)
+def delete_project_changes(sender, instance, **kwargs):
+    # Runs after the cascade, so the tombstones and transitions of its issues go too
+    ChangeLog.objects.filter(project_id=instance.pk).delete()
+    IssueStatusTransition.objects.filter(project_id=instance.pk).delete()
+    DailyIssueStats.objects.filter(project_id=instance.pk).delete()
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_issue_comments(sender, instance, **kwargs):
+    Issue.objects.filter(pk=instance.issue_id).update(comments_updated_at=timezone.now())
+
+def comment_project_id(comment):
+    """The comment's project id, from a loaded issue or one lookup remembered on the instance."""
+    issue = comment._state.fields_cache.get('issue')
+    if issue is not None:
+        return issue.project_id
+    if '_project_id' not in comment.__dict__:
+        comment._project_id = (
+            Issue.objects.filter(pk=comment.issue_id).values_list('project_id', flat=True).first()
+        )
+    return comment._project_id
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_cache_version(sender, instance, **kwargs):
+    # No project or issue response renders comments: only the project's own scope
+    project_id = comment_project_id(instance)
+    if project_id is not None:
+        CacheVersion.bump(CacheVersion.project_scope(project_id))
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def log_comment_change(sender, instance, **kwargs):
+    deleted = kwargs['signal'] is post_delete
+    ChangeLog.record(comment_project_id(instance), ChangeLog.COMMENT, [instance.pk], deleted=deleted)
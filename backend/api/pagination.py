@@ -0,0 +1,162 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorOrPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Clients enable cursor mode with ?pagination=cursor and then follow the
+    `next`/`previous` links, which carry an opaque ?cursor= value. Pages are
+    selected with a WHERE on the view's `cursor_ordering` columns, e.g.
+    (created_at, id) < (last_created_at, last_id), so there is no OFFSET and
+    no COUNT(*): the cost of a page does not grow with its position. The
+    response has no `count` field.
+
+    Cursor mode always orders by `cursor_ordering`, overriding any other
+    ordering (such as search relevance). Without the opt-in, responses are
+    unchanged page-number pages.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        ordering = tuple(getattr(view, 'cursor_ordering', ('-created_at', '-id')))
+        position, reverse = self.decode_cursor(request)
+        if position is not None and len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        if reverse:
+            ordering = tuple(f[1:] if f.startswith('-') else f'-{f}' for f in ordering)
+        try:
+            if isinstance(queryset, QuerySet):
+                rows = self.paginate_sql(queryset, ordering, position)
+            else:
+                rows = self.paginate_list(queryset, ordering, position)
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, position is not None
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+
+        self.fields = [f.lstrip('-') for f in ordering]
+        self.first_position = self.position_of(rows[0]) if rows else None
+        self.last_position = self.position_of(rows[-1]) if rows else None
+        return rows
+
+    def paginate_sql(self, queryset, ordering, position):
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            model = queryset.model
+            values = [
+                model._meta.get_field(f.lstrip('-')).to_python(value)
+                for f, value in zip(ordering, position)
+            ]
+            queryset = queryset.filter(self.keyset_filter(ordering, values))
+        return list(queryset[:self.page_size + 1])
+
+    def paginate_list(self, rows, ordering, position):
+        # Already-loaded rows (e.g. comment threads assembled in memory);
+        # assumes every ordering field runs in the same direction.
+        fields = [f.lstrip('-') for f in ordering]
+        descending = ordering[0].startswith('-')
+
+        def key(row):
+            return tuple(getattr(row, f) for f in fields)
+
+        rows = sorted(rows, key=key, reverse=descending)
+        if position is not None and rows:
+            meta = type(rows[0])._meta
+            start = tuple(meta.get_field(f).to_python(v) for f, v in zip(fields, position))
+            rows = [row for row in rows if (key(row) < start if descending else key(row) > start)]
+        return rows[:self.page_size + 1]
+
+    @staticmethod
+    def keyset_filter(ordering, values):
+        """(f1, f2, ...) strictly after `values` in `ordering`, as an OR of prefix matches."""
+        q = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{name}__{lookup}': values[i]})
+            for prev_field, prev_value in zip(ordering[:i], values[:i]):
+                term &= Q(**{prev_field.lstrip('-'): prev_value})
+            q |= term
+        return q
+
+    def position_of(self, row):
+        return [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in (getattr(row, f) for f in self.fields)
+        ]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            return list(data['p']), bool(data.get('r', False))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        data = json.dumps({'p': position, 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, True)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response['properties']['count']['description'] = 'Omitted in cursor mode (?pagination=cursor)'
+        return response
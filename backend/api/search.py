@@ -0,0 +1,187 @@
+"""
+Full-text search over issue titles and descriptions.
+
+- PostgreSQL: a generated ``tsvector`` column (``api_issue.search_vector``,
+  title weighted above description) with a GIN index.
+- SQLite: an external-content FTS5 table (``api_issue_fts``) kept in sync
+  with ``api_issue`` by triggers, so bulk_create/update() are indexed too.
+- Anything else (or SQLite built without FTS5) falls back to icontains.
+
+The index structures are created by migration 0007 and re-checked after
+every ``migrate`` (SQLite drops triggers when a migration rebuilds a table).
+"""
+import re
+from contextlib import contextmanager
+
+from django.db import connections, OperationalError
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'api_issue_fts'
+SEARCH_CONFIG = 'english'
+
+POSTGRES_INSTALL = [
+    f"""
+    ALTER TABLE api_issue ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS api_issue_search_vector_gin ON api_issue USING GIN (search_vector)',
+]
+POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS api_issue_search_vector_gin',
+    'ALTER TABLE api_issue DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, content='api_issue', content_rowid='id', tokenize='porter unicode61')"
+)
+SQLITE_TRIGGERS = {
+    'api_issue_fts_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS api_issue_fts_ai AFTER INSERT ON api_issue BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+    'api_issue_fts_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS api_issue_fts_ad AFTER DELETE ON api_issue BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    'api_issue_fts_au': f"""
+        CREATE TRIGGER IF NOT EXISTS api_issue_fts_au AFTER UPDATE OF title, description ON api_issue BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+
+# alias -> whether the index exists, checked once per process
+_available = {}
+
+
+def install(connection):
+    """Create the search index for this connection's backend if it is missing."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == 'sqlite':
+            try:
+                cursor.execute(SQLITE_TABLE)
+            except OperationalError:
+                # SQLite compiled without FTS5: keep using icontains
+                _available[connection.alias] = False
+                return False
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'api_issue'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(SQLITE_TRIGGERS[name])
+            if missing:
+                # Writes made while the triggers were absent are not indexed yet
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        else:
+            _available[connection.alias] = False
+            return False
+    _available[connection.alias] = True
+    return True
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for sql in POSTGRES_UNINSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == 'sqlite':
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    _available[connection.alias] = False
+
+
+@contextmanager
+def deferred_indexing(connection):
+    """
+    For large batched inserts into api_issue, inside transaction.atomic():
+    on SQLite the per-row insert trigger is dropped and the index rebuilt
+    once at the end, several times cheaper than maintaining it row by row.
+    If the block raises, the rollback restores the trigger.
+    """
+    if connection.vendor != 'sqlite' or not is_available(connection):
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('DROP TRIGGER IF EXISTS api_issue_fts_ai')
+    yield
+    install(connection)
+
+
+def _index_exists(connection):
+    if connection.vendor == 'sqlite':
+        return FTS_TABLE in connection.introspection.table_names()
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'api_issue' AND column_name = 'search_vector'"
+            )
+            return cursor.fetchone() is not None
+    return False
+
+
+def ensure_search_index(sender, using='default', **kwargs):
+    """post_migrate receiver: restore triggers lost when SQLite rebuilt api_issue."""
+    connection = connections[using]
+    # Skip databases that are not migrated as far as 0007 (or were migrated back)
+    if _index_exists(connection):
+        install(connection)
+
+
+def is_available(connection):
+    if connection.alias not in _available:
+        _available[connection.alias] = _index_exists(connection)
+    return _available[connection.alias]
+
+
+def search_issues(queryset, query):
+    """
+    Filter an Issue queryset to rows matching `query`, annotated with
+    `search_rank` (higher is better) and ordered by relevance, then recency.
+    Every word must match, either as a whole word or as a prefix.
+    """
+    words = re.findall(r'\w+', query)
+    connection = connections[queryset.db]
+    if not words or not is_available(connection):
+        return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{word}:*' for word in words)
+        queryset = queryset.filter(
+            RawSQL(f"api_issue.search_vector @@ to_tsquery('{SEARCH_CONFIG}', %s)", (tsquery,),
+                   output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f"ts_rank(api_issue.search_vector, to_tsquery('{SEARCH_CONFIG}', %s))",
+                               (tsquery,), output_field=FloatField())
+        )
+    else:
+        # Quote every word so FTS5 operators in user input are taken literally
+        match = ' '.join(f'"{word}"*' for word in words)
+        # Join the FTS table once so MATCH and bm25() run a single full-text
+        # query; FTS_TABLE is not a model, hence extra(). The unary + stops
+        # SQLite from driving the join from another index (e.g. project_id)
+        # and re-running MATCH for every candidate row. bm25() is
+        # lower-is-better; title hits weigh 10x description hits.
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'+{FTS_TABLE}.rowid = api_issue.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'-bm25({FTS_TABLE}, 10.0, 1.0)'},
+        )
+    return queryset.order_by('-search_rank', '-created_at')
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Project, Issue, Comment, UserProfile
+from .models import Project, Issue, Comment, UserProfile, DeletionJob
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -20,29 +20,76 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id','username','email','profile','role','can_create_projects','can_delete_issues','can_assign_issues')
 
-class ProjectSerializer(serializers.ModelSerializer):
-    owner = UserSerializer(read_only=True)
-    issue_count = serializers.IntegerField(read_only=True)
-    open_issues = serializers.IntegerField(read_only=True)
-    in_progress_issues = serializers.IntegerField(read_only=True)
-    closed_issues = serializers.IntegerField(read_only=True)
+def parse_expand(value):
+    """
+    Turn an ?expand= value into a nested dict:
+    'project.owner,reporter' -> {'project': {'owner': {}}, 'reporter': {}}
+    """
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        value = value.split(',')
+    tree = {}
+    for name in value or ():
+        node = tree
+        for part in name.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class ExpandableFieldsMixin:
+    """
+    Sparse fieldsets for model serializers.
+
+    Related objects are rendered as ids unless they are named in `expand`
+    (dotted names expand nested relations, e.g. ``project.owner``); the
+    serializers used for expansion are listed in Meta.expandable_fields.
+    `fields` limits the output to the given top-level fields. Both accept
+    a comma-separated string, as passed in ?fields= and ?expand=.
+    Unknown names are ignored.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.expand = parse_expand(expand)
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name, children in self.expand.items():
+            if name in expandable and name in self.fields:
+                serializer_class = expandable[name]
+                if issubclass(serializer_class, ExpandableFieldsMixin):
+                    self.fields[name] = serializer_class(read_only=True, expand=children)
+                else:
+                    self.fields[name] = serializer_class(read_only=True)
+
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        if fields:
+            allowed = {name.strip() for name in fields}
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
+
+
+class ProjectSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ('id','name','description','created_at','owner','issue_count','open_issues','in_progress_issues','closed_issues')
+        # Counters are maintained by Issue writes, never by clients
+        read_only_fields = ('owner','issue_count','open_issues','in_progress_issues','closed_issues')
+        expandable_fields = {'owner': UserSerializer}
 
-class IssueSerializer(serializers.ModelSerializer):
-    reporter = UserSerializer(read_only=True)
-    assignee = UserSerializer(read_only=True)
+class IssueSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     assignee_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
-    # When creating issues via the nested project route (POST /projects/<id>/issues/)
-    # the view will inject the project on save. Mark project as read-only so
-    # serializer validation does not require the project field in the incoming payload.
-    project = ProjectSerializer(read_only=True)
 
     class Meta:
         model = Issue
         fields = ('id','title','description','status','priority','created_at','updated_at','project','reporter','assignee','assignee_id')
-        read_only_fields = ('reporter','created_at','updated_at','project')
+        # When creating issues via the nested project route (POST /projects/<id>/issues/)
+        # the view will inject the project on save, so project is read-only and
+        # validation does not require it in the incoming payload. Assignees are
+        # written through assignee_id.
+        read_only_fields = ('reporter','created_at','updated_at','project','assignee')
+        expandable_fields = {'project': ProjectSerializer, 'reporter': UserSerializer, 'assignee': UserSerializer}
 
     def update(self, instance, validated_data):
         # Handle assignee_id separately
@@ -65,8 +112,7 @@ class IssueSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-class CommentSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
+class CommentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     replies = serializers.SerializerMethodField()
     reply_count = serializers.SerializerMethodField()
 
@@ -74,14 +120,47 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ('id','content','created_at','issue','author','parent_comment','replies','reply_count')
         read_only_fields = ('author','created_at','issue')
-    
+        expandable_fields = {'author': UserSerializer}
+
+    def _reply_list(self, obj):
+        # Views assemble the whole thread up front (see attach_comment_threads);
+        # fall back to one query per node for comments serialized elsewhere.
+        replies = getattr(obj, 'thread_replies', None)
+        if replies is None:
+            replies = obj.replies.order_by('created_at', 'id')
+            if 'author' in self.expand:
+                replies = replies.select_related('author__profile')
+            replies = list(replies)
+            obj.thread_replies = replies
+        return replies
+
     def get_replies(self, obj):
-        if obj.replies.exists():
-            return CommentSerializer(obj.replies.all(), many=True).data
-        return []
+        # Replies are rendered with the same ?fields= and ?expand= as their parent
+        return CommentSerializer(
+            self._reply_list(obj), many=True, context=self.context,
+            fields=list(self.fields), expand=self.expand,
+        ).data
     
     def get_reply_count(self, obj):
-        return obj.replies.count()
+        # Nodes cut off by ?max_depth= carry their real count
+        reply_total = getattr(obj, 'reply_total', None)
+        if reply_total is not None:
+            return reply_total
+        return len(self._reply_list(obj))
+
+    def validate_parent_comment(self, value):
+        # Paths are written once on insert; moving a reply would orphan its subtree
+        if self.instance is not None and getattr(value, 'pk', None) != self.instance.parent_comment_id:
+            raise serializers.ValidationError('Comments cannot be moved to another thread.')
+        return value
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DeletionJob
+        fields = ('id','model','object_id','project_id','status','issues_total','issues_deleted','comments_deleted',
+                  'error','created_at','started_at','finished_at')
+        read_only_fields = fields
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -0,0 +1,125 @@
+"""
+Daily issue-flow rollups per project and status, for trend charts.
+
+Every issue write that changes a status appends an IssueStatusTransition
+and, in the same transaction, adds it to DailyIssueStats: one row per
+(project, day, status) with the issues that entered and left the status
+that day (see IssueStatusTransition.record). The number of open, in
+progress and closed issues on any day is the running sum of entered -
+exited up to it, so issue_flow() reads rollup rows only: one aggregate
+for the days before the range and the rows inside it, both on the
+(project_id, date, status) unique index.
+
+The transitions are the source of truth. `manage.py rebuild_issue_stats`
+recomputes the rollups from them and, with --backfill, first records
+transitions for issues written before they were captured.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Project, Issue, IssueStatusTransition, DailyIssueStats
+
+MAX_FLOW_DAYS = 366
+DEFAULT_FLOW_DAYS = 30
+
+
+def statuses():
+    return [value for value, _ in Issue.STATUS_CHOICES]
+
+
+def issue_flow(project_id, start, end):
+    """
+    {'start', 'end', 'days'}: for every day of [start, end] the issues in
+    each status at the end of the day ('counts') and those that entered and
+    left each status during it.
+    """
+    rows = DailyIssueStats.objects.filter(project_id=project_id)
+    counts = dict.fromkeys(statuses(), 0)
+    before = (
+        rows.filter(date__lt=start).order_by().values('status')
+        .annotate(entered=Sum('entered'), exited=Sum('exited'))
+    )
+    for row in before:
+        counts[row['status']] = counts.get(row['status'], 0) + row['entered'] - row['exited']
+
+    by_day = {}
+    for date, status, entered, exited in (
+        rows.filter(date__gte=start, date__lte=end).values_list('date', 'status', 'entered', 'exited')
+    ):
+        by_day.setdefault(date, []).append((status, entered, exited))
+
+    days = []
+    for offset in range((end - start).days + 1):
+        date = start + datetime.timedelta(days=offset)
+        entered, exited = dict.fromkeys(counts, 0), dict.fromkeys(counts, 0)
+        for status, day_entered, day_exited in by_day.get(date, ()):
+            entered[status] = day_entered
+            exited[status] = day_exited
+            counts[status] = counts.get(status, 0) + day_entered - day_exited
+        days.append({'date': date, 'counts': dict(counts), 'entered': entered, 'exited': exited})
+    return {'start': start, 'end': end, 'days': days}
+
+
+def backfill_transitions(issues, batch_size=1000):
+    """
+    Record transitions for the `issues` that have none, written before they
+    were captured: the issue entered 'open' when it was created and, unless
+    it is still open, its current status when it was last updated. The
+    exact history is lost; this reproduces today's counts and approximates
+    the flow. Returns the number of issues backfilled.
+    """
+    missing = (
+        issues.exclude(id__in=IssueStatusTransition.objects.values('issue_id'))
+        .order_by('id')
+        .values_list('id', 'project_id', 'status', 'created_at', 'updated_at')
+    )
+    backfilled, last_id = 0, 0
+    while True:
+        batch = list(missing.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return backfilled
+        transitions = []
+        for issue_id, project_id, status, created_at, updated_at in batch:
+            transitions.append(IssueStatusTransition(
+                project_id=project_id, issue_id=issue_id, to_status='open', created_at=created_at,
+            ))
+            if status != 'open':
+                transitions.append(IssueStatusTransition(
+                    project_id=project_id, issue_id=issue_id, from_status='open', to_status=status,
+                    created_at=max(updated_at, created_at),
+                ))
+        IssueStatusTransition.objects.bulk_create(transitions)
+        backfilled += len(batch)
+        last_id = batch[-1][0]
+
+
+def rebuild_project_stats(project_id, batch_size=1000):
+    """
+    Replace a project's rollups with a recount of its transitions. The
+    project row is locked first, as issue writes lock it before recording
+    transitions, so none is counted twice or missed. Returns the row count.
+    """
+    transitions = IssueStatusTransition.objects.filter(project_id=project_id).annotate(
+        date=TruncDate('created_at')
+    ).order_by()
+    deltas = {}
+    with transaction.atomic():
+        list(Project.objects.select_for_update().filter(pk=project_id).values_list('pk'))
+        for side, index in (('to_status', 0), ('from_status', 1)):
+            for row in transitions.exclude(**{side: ''}).values('date', side).annotate(n=Count('id')):
+                deltas.setdefault((row['date'], row[side]), [0, 0])[index] += row['n']
+        DailyIssueStats.objects.filter(project_id=project_id).delete()
+        DailyIssueStats.objects.bulk_create([
+            DailyIssueStats(project_id=project_id, date=date, status=status, entered=entered, exited=exited)
+            for (date, status), (entered, exited) in sorted(deltas.items())
+        ], batch_size=batch_size)
+    return len(deltas)
+
+
+def default_flow_range():
+    end = timezone.localdate()
+    return end - datetime.timedelta(days=DEFAULT_FLOW_DAYS - 1), end
@@ -0,0 +1,84 @@
+"""
+"My work": a user's issues across all projects, grouped by status and priority.
+
+Two queries, whatever the number of issues:
+
+- the counts, one GROUP BY (status, priority) over the issues the user
+  reported or is assigned to; the OR is answered from the reporter_id and
+  assignee_id indexes (a BitmapOr on PostgreSQL);
+- the newest issues of every bucket, numbered with ROW_NUMBER() OVER
+  (PARTITION BY status, priority ORDER BY created_at DESC, id DESC) and
+  cut at `per_bucket`, so no bucket is paged through.
+
+Issue writes bump the `user:<id>` cache scope of the reporters and
+assignees they touch (see CacheVersion.bump_projects), which keys the
+cached response of /api/me/summary/.
+"""
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import Issue
+
+DEFAULT_PER_BUCKET = 5
+MAX_PER_BUCKET = 20
+
+
+def user_issues(user_id):
+    """Live issues the user reported or is assigned to."""
+    return Issue.objects.live().filter(Q(reporter_id=user_id) | Q(assignee_id=user_id))
+
+
+def issue_summary(user_id, per_bucket=DEFAULT_PER_BUCKET):
+    """
+    {'total', 'assigned', 'reported', 'by_status', 'by_priority', 'buckets'};
+    every bucket is {'status', 'priority', 'count', 'assigned', 'reported',
+    'issues'}, in choice order, with its newest `per_bucket` Issue objects.
+    """
+    issues = user_issues(user_id)
+    counts = (
+        issues.order_by()
+        .values('status', 'priority')
+        .annotate(
+            count=Count('id'),
+            assigned=Count('id', filter=Q(assignee_id=user_id)),
+            reported=Count('id', filter=Q(reporter_id=user_id)),
+        )
+    )
+    buckets = {
+        (row['status'], row['priority']): {**row, 'issues': []}
+        for row in counts
+    }
+
+    if buckets and per_bucket > 0:
+        newest = (
+            issues.only('id', 'title', 'status', 'priority', 'project_id', 'created_at', 'updated_at')
+            .annotate(bucket_rank=Window(
+                RowNumber(),
+                partition_by=[F('status'), F('priority')],
+                order_by=[F('created_at').desc(), F('id').desc()],
+            ))
+            .filter(bucket_rank__lte=per_bucket)
+            .order_by('status', 'priority', 'bucket_rank')
+        )
+        for issue in newest:
+            buckets[(issue.status, issue.priority)]['issues'].append(issue)
+
+    statuses = [value for value, _ in Issue.STATUS_CHOICES]
+    priorities = [value for value, _ in Issue.PRIORITY_CHOICES]
+    by_status = dict.fromkeys(statuses, 0)
+    by_priority = dict.fromkeys(priorities, 0)
+    for (issue_status, priority), bucket in buckets.items():
+        by_status[issue_status] = by_status.get(issue_status, 0) + bucket['count']
+        by_priority[priority] = by_priority.get(priority, 0) + bucket['count']
+
+    order = {key: index for index, key in enumerate((s, p) for s in statuses for p in priorities)}
+    return {
+        'total': sum(bucket['count'] for bucket in buckets.values()),
+        'assigned': sum(bucket['assigned'] for bucket in buckets.values()),
+        'reported': sum(bucket['reported'] for bucket in buckets.values()),
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'buckets': sorted(buckets.values(), key=lambda bucket: order.get(
+            (bucket['status'], bucket['priority']), len(order)
+        )),
+    }
@@ -0,0 +1,146 @@
+import asyncio
+import datetime
+import json
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import events
+from api.cache import response_cache, invalidate_cached_user
+from api.models import Project, Issue
+from api.views import ProjectViewSet, IssueViewSet
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class AsyncReadTests(QueryBudgetTestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        Issue.objects.create(title='Bug', project=self.project, reporter=self.owner)
+
+    def tearDown(self):
+        response_cache.clear()
+
+    def test_health_check(self):
+        resp = self.client.get('/api/health/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['status'], 'Backend is live')
+
+    def test_cache_hit_skips_the_drf_view(self):
+        first = self.client.get('/api/projects/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(response_cache.stats()['misses'], 1)
+        with mock.patch.object(ProjectViewSet, 'list', side_effect=AssertionError('DRF view ran')):
+            # Only the cache versions are read
+            resp = self.assertQueryBudget('/api/projects/', 1)
+        self.assertEqual(resp['X-Cache'], 'HIT')
+        self.assertEqual(resp.content, first.content)
+        stats = response_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_not_modified_skips_the_drf_view(self):
+        url = f'/api/projects/{self.project.id}/issues/'
+        etag = self.client.get(url)['ETag']
+        with mock.patch.object(IssueViewSet, 'list', side_effect=AssertionError('DRF view ran')):
+            resp = self.assertQueryBudget(url, 1, expected_status=304, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp['ETag'], etag)
+        self.assertEqual(resp.content, b'')
+
+        Issue.objects.create(title='Another', project=self.project, reporter=self.owner)
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['count'], 2)
+
+    def test_tokens_are_checked_before_cached_answers(self):
+        url = f'/api/projects/{self.project.id}/issues/'
+        etag = self.client.get(url)['ETag']
+        expired = AccessToken.for_user(self.owner)
+        expired.set_exp(lifetime=-datetime.timedelta(seconds=1))
+        for token in ('not-a-token', str(expired)):
+            auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+            self.assertEqual(self.client.get('/api/projects/', **auth).status_code, 401)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth).status_code, 401)
+
+        # A valid token whose user is cached is answered without the DRF view
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.owner)}'}
+        self.assertEqual(self.client.get('/api/projects/', **auth)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/projects/', **auth)['X-Cache'], 'HIT')
+        with mock.patch.object(IssueViewSet, 'list', side_effect=AssertionError('DRF view ran')):
+            self.assertQueryBudget(url, 1, expected_status=304, HTTP_IF_NONE_MATCH=etag, **auth)
+
+        # An uncached or inactive user goes through the DRF view
+        invalidate_cached_user(self.owner.id)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth).status_code, 304)
+        User.objects.filter(pk=self.owner.pk).update(is_active=False)
+        invalidate_cached_user(self.owner.id)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth).status_code, 401)
+
+    def test_middleware_stack_stays_async(self):
+        # A sync-only middleware would put the whole chain below it on a thread
+        layer, seen = ASGIHandler()._middleware_chain, 0
+        while hasattr(getattr(layer, '__wrapped__', None), 'get_response'):
+            self.assertTrue(iscoroutinefunction(layer), layer.__wrapped__)
+            layer, seen = layer.__wrapped__.get_response, seen + 1
+        self.assertEqual(seen, len(settings.MIDDLEWARE))
+
+    def test_writes_and_other_formats_use_the_drf_view(self):
+        self.client.force_authenticate(self.owner)
+        resp = self.client.post(f'/api/projects/{self.project.id}/issues/', {'title': 'New'}, format='json')
+        self.assertEqual(resp.status_code, 201)
+        resp = self.client.get('/api/projects/', HTTP_ACCEPT='text/html')
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn('X-Cache', resp)
+
+
+class ProjectEventsTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        self.url = f'/api/projects/{self.project.id}/events/'
+
+    def test_needs_asgi(self):
+        self.assertEqual(self.client.get(self.url).status_code, 501)
+
+    async def test_stream_pushes_committed_changes(self):
+        client = AsyncClient()
+        self.assertEqual((await client.get('/api/projects/999999/events/')).status_code, 404)
+
+        resp = await client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'text/event-stream')
+        stream = resp.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        ready = (await anext(stream)).decode()
+        self.assertIn('event: ready', ready)
+
+        backend = events.get_backend()
+        channel = events.project_channel(self.project.id)
+        self.assertEqual(backend.subscriber_count(channel), 1)
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Issue.objects.create(title='Pushed', project=self.project, reporter=self.owner)
+
+        issue = await sync_to_async(write)()
+        change = (await anext(stream)).decode()
+        self.assertIn('event: change', change)
+        data = json.loads(change.split('data: ', 1)[1])
+        self.assertEqual((data['model'], data['ids'], data['deleted']), ('issue', [issue.id], False))
+        self.assertIn(f'id: {data["cursor"]}', change)
+
+        # A client disconnect cancels the response while it waits for the next event
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(backend.subscriber_count(channel), 0)
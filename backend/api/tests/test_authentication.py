@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from io import StringIO
+
+from api.cache import get_cached_user, user_cache_key
+from api.models import UserProfile
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(QueryBudgetTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='alice', password='pass')
+        self.admin = User.objects.create_user(username='root', password='pass')
+        UserProfile.objects.filter(user=self.admin).update(role='admin')
+        cache.clear()
+
+    def login(self, username):
+        resp = self.client.post('/api/auth/login/', {'username': username, 'password': 'pass'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.data['access']}")
+
+    def test_user_is_cached_after_first_request(self):
+        self.login('alice')
+        # Miss: user and profile in one joined query
+        resp = self.assertQueryBudget('/api/auth/user/', 1)
+        self.assertEqual(resp.data['role'], 'developer')
+        self.assertIsNotNone(get_cached_user(self.user.id))
+        # Hit: no queries at all
+        self.assertQueryBudget('/api/auth/user/', 0)
+
+    def test_cache_holds_no_password_hash(self):
+        self.login('alice')
+        self.client.get('/api/auth/user/')
+        entry = cache.get(user_cache_key(self.user.id))
+        self.assertNotIn('password', entry['user'])
+        self.assertNotIn(self.user.password, repr(entry))
+
+        user = get_cached_user(self.user.id)
+        self.assertEqual((user.username, user.is_active, user.profile.role), ('alice', True, 'developer'))
+        # Fields left out load on access; saving writes only the loaded ones
+        self.assertTrue(user.check_password('pass'))
+        user.email = 'alice@example.com'
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'alice@example.com')
+        self.assertTrue(self.user.check_password('pass'))
+
+    def test_role_update_invalidates_cache(self):
+        self.login('alice')
+        self.client.get('/api/auth/user/')
+        self.login('root')
+        resp = self.client.patch(f'/api/users/{self.user.id}/update_role/', {'role': 'tester'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsNone(get_cached_user(self.user.id))
+
+        self.login('alice')
+        self.assertEqual(self.client.get('/api/auth/user/').data['role'], 'tester')
+
+    def test_deleted_user_is_rejected(self):
+        self.login('alice')
+        self.client.get('/api/auth/user/')
+        self.user.delete()
+        self.assertIsNone(get_cached_user(self.user.id))
+        self.assertEqual(self.client.get('/api/auth/user/').status_code, 401)
+
+    def test_ensure_user_profiles_invalidates_cache(self):
+        UserProfile.objects.filter(user=self.user).delete()
+        self.login('alice')
+        self.assertIsNone(self.client.get('/api/auth/user/').data['role'])
+        # Bypass the signals, as a raw fix-up of the data would
+        UserProfile.objects.bulk_create([UserProfile(user=self.user, role='guest')])
+        self.assertIsNone(self.client.get('/api/auth/user/').data['role'])
+        UserProfile.objects.filter(user=self.user).delete()
+
+        call_command('ensure_user_profiles', stdout=StringIO())
+        self.assertEqual(self.client.get('/api/auth/user/').data['role'], 'developer')
@@ -0,0 +1,132 @@
+from django.contrib.auth import get_user_model
+
+from api.models import Project, Issue
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class BulkIssueTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.dev = User.objects.create_user(username='dev', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        self.issues = [
+            Issue.objects.create(title=f'Issue {i}', project=self.project, reporter=self.dev)
+            for i in range(20)
+        ]
+        self.url = f'/api/projects/{self.project.id}/issues/bulk/'
+        self.owner = User.objects.get(pk=self.owner.pk)
+        self.dev = User.objects.get(pk=self.dev.pk)
+
+    def counters(self):
+        self.project.refresh_from_db()
+        return self.project.issue_count, self.project.open_issues, self.project.closed_issues
+
+    def test_bulk_create(self):
+        self.client.force_authenticate(self.dev)
+        items = [{'title': f'New {i}', 'priority': 'high'} for i in range(30)]
+        items.append({'title': 'Closed', 'status': 'closed', 'assignee_id': self.owner.id})
+        # project + assignee check + savepoint + INSERT + counters + version bump
+        # (+ creating the owner's first user scope) + change feed + status transitions
+        # + daily rollup + release
+        resp = self.assertQueryBudget(self.url, 11, method='post', expected_status=201, data=items)
+        self.assertEqual(len(resp.data['results']), 31)
+        self.assertEqual(resp.data['errors'], [])
+        self.assertEqual(self.counters(), (51, 50, 1))
+        self.assertTrue(Issue.objects.filter(title='New 29', reporter=self.dev, priority='high').exists())
+        self.assertEqual(Issue.objects.get(title='Closed').assignee_id, self.owner.id)
+
+    def test_bulk_create_reports_item_errors(self):
+        self.client.force_authenticate(self.dev)
+        resp = self.client.post(self.url, {'issues': [
+            {'title': 'Fine'},
+            {'description': 'no title'},
+            {'title': 'Bad status', 'status': 'nope'},
+            {'title': 'Ghost assignee', 'assignee_id': 999999},
+        ]}, format='json')
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([e['index'] for e in resp.data['errors']], [1, 2, 3])
+        self.assertIn('title', resp.data['errors'][0]['errors'])
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertEqual(self.counters()[0], 21)
+
+    def test_uniform_update_is_one_statement(self):
+        self.client.force_authenticate(self.owner)
+        ids = [issue.id for issue in self.issues]
+        # project + assignee check + savepoint + locked issues + UPDATE + counters
+        # + version bump + change feed + status transitions + daily rollup + release,
+        # instead of ~10 queries per issue with PATCH /issues/<id>/
+        resp = self.assertQueryBudget(self.url, 11, method='patch', data={
+            'ids': ids, 'status': 'closed', 'assignee_id': self.dev.id,
+        })
+        self.assertEqual(len(resp.data['results']), 20)
+        self.assertEqual(Issue.objects.filter(status='closed', assignee=self.dev).count(), 20)
+        self.assertEqual(self.counters(), (20, 0, 20))
+
+    def test_mixed_update(self):
+        self.client.force_authenticate(self.owner)
+        items = [
+            {'id': self.issues[0].id, 'status': 'in_progress'},
+            {'id': self.issues[1].id, 'priority': 'critical'},
+            {'id': self.issues[2].id, 'assignee_id': self.dev.id},
+            {'id': self.issues[3].id, 'assignee_id': 0},
+            {'id': 999999, 'status': 'closed'},
+            {'id': self.issues[4].id, 'title': 'not allowed'},
+        ]
+        resp = self.client.patch(self.url, items, format='json')
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([e['index'] for e in resp.data['errors']], [4, 5])
+        self.issues[0].refresh_from_db()
+        self.issues[1].refresh_from_db()
+        self.assertEqual(self.issues[0].status, 'in_progress')
+        self.assertEqual(self.issues[1].priority, 'critical')
+        self.assertEqual(Issue.objects.get(pk=self.issues[2].pk).assignee_id, self.dev.id)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.open_issues, self.project.in_progress_issues), (19, 1))
+
+    def test_assignee_ids_as_strings(self):
+        # As on POST/PATCH /issues/<id>/, where assignee_id is an IntegerField
+        self.client.force_authenticate(self.owner)
+        resp = self.client.post(self.url, [{'title': 'a', 'assignee_id': str(self.dev.id)}], format='json')
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(Issue.objects.get(title='a').assignee_id, self.dev.id)
+
+        ids = [issue.id for issue in self.issues[:3]]
+        resp = self.client.patch(self.url, {'ids': ids, 'assignee_id': str(self.owner.id)}, format='json')
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(Issue.objects.filter(id__in=ids, assignee=self.owner).count(), 3)
+
+        resp = self.client.patch(self.url, [
+            {'id': ids[0], 'assignee_id': 'nobody'},
+            {'id': ids[1], 'assignee_id': '999999'},
+            {'id': ids[2], 'assignee_id': ''},
+        ], format='json')
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([e['index'] for e in resp.data['errors']], [0, 1])
+        self.assertEqual(resp.data['errors'][1]['errors']['assignee_id'], ['User with this id does not exist.'])
+        self.assertIsNone(Issue.objects.get(pk=ids[2]).assignee_id)
+
+    def test_permissions_checked_per_project(self):
+        # Reporters may change the priority of their own issues, nothing else
+        self.client.force_authenticate(self.dev)
+        resp = self.client.patch(self.url, [
+            {'id': self.issues[0].id, 'priority': 'low'},
+            {'id': self.issues[1].id, 'status': 'closed'},
+        ], format='json')
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual(resp.data['errors'][0]['index'], 1)
+        self.assertIn('detail', resp.data['errors'][0]['errors'])
+
+        stranger = User.objects.create_user(username='stranger', password='pass')
+        self.client.force_authenticate(stranger)
+        resp = self.client.patch(self.url, {'ids': [self.issues[0].id], 'priority': 'high'}, format='json')
+        self.assertEqual(resp.status_code, 400)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post(self.url, [{'title': 'x'}], format='json').status_code, 401)
+
+    def test_only_nested_route(self):
+        self.client.force_authenticate(self.owner)
+        resp = self.client.post('/api/issues/bulk/', [{'title': 'x'}], format='json')
+        self.assertEqual(resp.status_code, 404)
@@ -0,0 +1,150 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from api.models import Project, Issue, Comment, ChangeLog
+from api.views import ProjectViewSet
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class ChangeFeedTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        self.other = Project.objects.create(name='Other', owner=self.owner)
+        self.issues = [
+            Issue.objects.create(title=f'Issue {i}', project=self.project, reporter=self.owner)
+            for i in range(3)
+        ]
+        self.url = f'/api/projects/{self.project.id}/changes/'
+
+    def start(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['issues'], [])
+        return resp.data['cursor']
+
+    def poll(self, cursor, query=''):
+        resp = self.client.get(f'{self.url}?since={cursor}{query}')
+        self.assertEqual(resp.status_code, 200)
+        return resp.data
+
+    def test_only_changes_after_the_cursor(self):
+        cursor = self.start()
+        self.assertEqual(self.poll(cursor)['issues'], [])
+
+        issue = self.issues[1]
+        issue.status = 'closed'
+        issue.save()
+        issue.title = 'Renamed'
+        issue.save()
+        Issue.objects.create(title='Elsewhere', project=self.other, reporter=self.owner)
+
+        data = self.poll(cursor)
+        # Two writes, one entry with the current state
+        self.assertEqual([(i['id'], i['status'], i['title']) for i in data['issues']],
+                         [(issue.id, 'closed', 'Renamed')])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(self.poll(data['cursor'])['issues'], [])
+
+    def test_comments_and_tombstones(self):
+        cursor = self.start()
+        root = Comment.objects.create(content='Root', issue=self.issues[0], author=self.owner)
+        reply = Comment.objects.create(content='Reply', issue=self.issues[0], author=self.owner,
+                                       parent_comment=root)
+        gone = self.issues[2]
+        gone_id = gone.id
+        gone.delete()
+
+        data = self.poll(cursor, '&expand=author')
+        self.assertEqual([c['id'] for c in data['comments']], [root.id, reply.id])
+        self.assertEqual(data['comments'][1]['parent_comment'], root.id)
+        self.assertEqual(data['comments'][0]['author']['username'], 'owner')
+        self.assertNotIn('replies', data['comments'][0])
+        self.assertEqual(data['deleted'], {'issues': [gone_id], 'comments': []})
+
+        cursor = data['cursor']
+        reply_id = reply.id
+        reply.delete()
+        self.assertEqual(self.poll(cursor)['deleted']['comments'], [reply_id])
+
+    def test_moved_issue_leaves_a_tombstone(self):
+        cursor = self.start()
+        issue = self.issues[0]
+        issue.project = self.other
+        issue.save()
+        data = self.poll(cursor)
+        self.assertEqual(data['issues'], [])
+        self.assertEqual(data['deleted']['issues'], [issue.id])
+
+    def test_bulk_writes_are_in_the_feed(self):
+        cursor = self.start()
+        self.client.force_authenticate(self.owner)
+        resp = self.client.patch(f'/api/projects/{self.project.id}/issues/bulk/', {
+            'ids': [self.issues[0].id, self.issues[2].id], 'priority': 'high',
+        }, format='json')
+        self.assertEqual(resp.status_code, 200)
+        data = self.poll(cursor)
+        self.assertEqual([i['id'] for i in data['issues']], [self.issues[0].id, self.issues[2].id])
+
+    def test_pages_and_query_budget(self):
+        cursor = self.start()
+        for issue in self.issues:
+            issue.priority = 'low'
+            issue.save()
+        Comment.objects.create(content='Hi', issue=self.issues[0], author=self.owner)
+        # project + changes + issues + comments
+        data = self.assertQueryBudget(f'{self.url}?since={cursor}', 4).data
+        self.assertEqual(len(data['issues']), 3)
+        self.assertEqual(len(data['comments']), 1)
+
+        with mock.patch.object(ProjectViewSet, 'CHANGES_PAGE_SIZE', 2):
+            first = self.poll(cursor)
+            self.assertTrue(first['has_more'])
+            second = self.poll(first['cursor'])
+        self.assertFalse(second['has_more'])
+        ids = [i['id'] for i in first['issues'] + second['issues']]
+        self.assertEqual(sorted(ids), [i.id for i in self.issues])
+
+    def test_deleting_a_project_drops_its_feed(self):
+        Comment.objects.create(content='Hi', issue=self.issues[0], author=self.owner)
+        self.project.delete()
+        self.assertFalse(ChangeLog.objects.filter(project_id=self.project.id).exists())
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_pruned_cursor_asks_for_a_resync(self):
+        cursor = self.start()
+        Issue.objects.create(title='Old', project=self.project, reporter=self.owner)
+        Issue.objects.create(title='Elsewhere', project=self.other, reporter=self.owner)
+        ChangeLog.objects.update(created_at=timezone.now() - datetime.timedelta(days=40))
+        recent = Issue.objects.create(title='Recent', project=self.project, reporter=self.owner)
+
+        out = StringIO()
+        call_command('process_deletions', '--once', '--batch-size', '2', stdout=out)
+        self.assertIn('Pruned 5 change-feed rows older than 30 days', out.getvalue())
+        self.assertEqual(list(ChangeLog.objects.values_list('object_id', flat=True)), [recent.id])
+
+        # Changes after the cursor were pruned: start over from the current one
+        data = self.poll(cursor)
+        self.assertTrue(data['resync'])
+        self.assertEqual(data['issues'], [])
+        self.assertEqual(data['cursor'], self.start())
+        data = self.poll(data['cursor'])
+        self.assertFalse(data['resync'])
+        self.assertEqual(data['issues'], [])
+
+        # A project whose whole feed was pruned keeps a cursor past it
+        other = f'/api/projects/{self.other.id}/changes/'
+        cursor = self.client.get(other).data['cursor']
+        self.assertEqual(cursor, Project.objects.get(pk=self.other.pk).changes_pruned_through)
+        self.assertFalse(self.client.get(f'{other}?since={cursor}').data['resync'])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(f'{self.url}?since=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/projects/abc/changes/').status_code, 404)
@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import (
+    Project, Issue, Comment, ChangeLog, DeletionJob, CacheVersion, UserProfile, IssueStatusTransition, DailyIssueStats,
+)
+from api.management.commands.clear_all_data import dependents_first
+
+User = get_user_model()
+
+
+class ClearAllDataFastTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='keeper', password='pass')
+        self.user.profile.role = 'tester'
+        self.user.profile.save()
+        project = Project.objects.create(name='P', owner=self.user)
+        issue = Issue.objects.create(title='I', project=project, reporter=self.user)
+        root = Comment.objects.create(issue=issue, author=self.user, content='root')
+        Comment.objects.create(issue=issue, author=self.user, content='reply', parent_comment=root)
+        DeletionJob.objects.create(model=DeletionJob.ISSUE, object_id=issue.id, project_id=project.id)
+        self.project_id = project.id
+
+    def clear(self, *args):
+        out = StringIO()
+        call_command('clear_all_data', '--confirm', '--fast', '--batch-size', '1', *args, stdout=out)
+        return out.getvalue()
+
+    def test_referencing_tables_come_first(self):
+        order = dependents_first([Project, User])
+        for child, parent in ((Comment, Issue), (Issue, Project), (UserProfile, User), (Project, User)):
+            self.assertLess(order.index(child), order.index(parent))
+
+    def test_keep_users_keeps_accounts_and_profiles(self):
+        version = CacheVersion.current([CacheVersion.project_scope(self.project_id)])
+        out = self.clear('--keep-users')
+        self.assertIn('api_comment: deleted 2 rows', out)
+        self.assertIn('kept 1 users', out)
+        for model in (Project, Issue, Comment, ChangeLog, DeletionJob, IssueStatusTransition, DailyIssueStats):
+            self.assertFalse(model.objects.exists(), model)
+        self.assertEqual(UserProfile.objects.get(user=self.user).role, 'tester')
+        # A new project reusing the id must not meet the old cached responses
+        scope = CacheVersion.project_scope(self.project_id)
+        self.assertGreater(CacheVersion.current([scope])[scope], version[scope])
+
+    def test_every_cache_scope_moves_in_one_statement(self):
+        CacheVersion.bump(*(CacheVersion.user_scope(uid) for uid in range(1, 1201)))
+        before = dict(CacheVersion.objects.values_list('scope', 'version'))
+        self.assertGreater(len(before), 1200)
+        with self.assertNumQueries(2):  # UPDATE + insert the shared scopes if missing
+            CacheVersion.bump_all()
+        after = dict(CacheVersion.objects.values_list('scope', 'version'))
+        self.assertTrue(all(after[scope] > version for scope, version in before.items()))
+        self.assertIn(CacheVersion.USERS, after)
+
+    def test_everything(self):
+        out = self.clear()
+        self.assertIn('auth_user: deleted 1 rows', out)
+        for model in (User, UserProfile, Project, Issue, Comment, ChangeLog):
+            self.assertFalse(model.objects.exists(), model)
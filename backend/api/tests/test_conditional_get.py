@@ -0,0 +1,113 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from api.models import Project, Issue, Comment
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class ConditionalGetTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        self.other = Project.objects.create(name='Other', owner=self.owner)
+        self.issue = Issue.objects.create(title='Bug', project=self.project, reporter=self.owner)
+
+    def revalidate(self, url, response, budget=1):
+        """Repeat a GET with the validators of `response`; a 304 costs only the marker query."""
+        return self.assertQueryBudget(
+            url, budget, expected_status=304, HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+
+    def later(self, seconds=2):
+        """Patch the views' clock `seconds` ahead, past the markers' second."""
+        return mock.patch('api.views.timezone.now',
+                          return_value=timezone.now() + datetime.timedelta(seconds=seconds))
+
+    def test_issue_detail_not_modified(self):
+        url = f'/api/issues/{self.issue.id}/'
+        with self.later():
+            first = self.client.get(url)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+        self.assertIn('no-cache', first['Cache-Control'])
+        self.revalidate(url, first)
+
+        Issue.objects.get(pk=self.issue.pk).save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_if_modified_since(self):
+        url = f'/api/issues/{self.issue.id}/'
+        with self.later():
+            first = self.client.get(url)
+            resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_no_last_modified_within_the_markers_second(self):
+        url = f'/api/issues/{self.issue.id}/'
+        updated = Issue.objects.get(pk=self.issue.pk).updated_at
+        # Read in the same second as the last write: only the ETag is sent
+        with mock.patch('api.views.timezone.now', return_value=updated):
+            first = self.client.get(url)
+        self.assertIn('ETag', first)
+        self.assertNotIn('Last-Modified', first)
+
+        # Another write in that second keeps the whole second but not the ETag
+        Issue.objects.filter(pk=self.issue.pk).update(updated_at=updated + datetime.timedelta(microseconds=1))
+        with mock.patch('api.views.timezone.now', return_value=updated):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(resp.status_code, 200)
+
+        # Once the second is over Last-Modified is sent again
+        with self.later():
+            self.assertIn('Last-Modified', self.client.get(url))
+
+    def test_query_string_is_part_of_the_etag(self):
+        url = f'/api/issues/{self.issue.id}/'
+        first = self.client.get(url)
+        resp = self.client.get(url + '?expand=reporter', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(resp.status_code, 200)
+
+    def test_expanded_project_follows_project_changes(self):
+        url = f'/api/issues/{self.issue.id}/?expand=project'
+        first = self.client.get(url)
+        plain = self.client.get(f'/api/issues/{self.issue.id}/')
+        # A sibling issue changes the project's counters, not this issue
+        Issue.objects.create(title='Sibling', project=self.project, reporter=self.owner)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+        self.revalidate(f'/api/issues/{self.issue.id}/', plain)
+
+    def test_project_issue_list_follows_issue_writes(self):
+        url = f'/api/projects/{self.project.id}/issues/'
+        first = self.client.get(url)
+        self.revalidate(url, first)
+        other = self.client.get(f'/api/projects/{self.other.id}/issues/')
+
+        self.issue.title = 'Renamed'
+        self.issue.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+        self.revalidate(f'/api/projects/{self.other.id}/issues/', other)
+
+    def test_comment_list_follows_comment_writes(self):
+        url = f'/api/issues/{self.issue.id}/comments/'
+        first = self.client.get(url)
+        self.revalidate(url, first)
+
+        comment = Comment.objects.create(issue=self.issue, author=self.owner, content='hi')
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+
+        comment.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=second['ETag']).status_code, 200)
+
+    def test_project_detail_and_user_changes(self):
+        url = f'/api/projects/{self.project.id}/?expand=owner'
+        first = self.client.get(url)
+        self.revalidate(url, first)
+        self.owner.username = 'renamed'
+        self.owner.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
@@ -0,0 +1,130 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Sum
+from rest_framework.test import APITestCase
+
+from api.models import Project, Issue, Comment, ChangeLog, DeletionJob, DailyIssueStats
+
+User = get_user_model()
+
+
+class DeferredDeletionTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.other = User.objects.create_user(username='other', password='pass')
+        self.project = Project.objects.create(name='Doomed', owner=self.owner)
+        self.kept = Project.objects.create(name='Kept', owner=self.owner)
+        self.issues = [
+            Issue.objects.create(title=f'Issue {i}', project=self.project, reporter=self.owner)
+            for i in range(5)
+        ]
+        self.survivor = Issue.objects.create(title='Survivor', project=self.kept, reporter=self.owner)
+        # A reply chain deeper than one deletion batch
+        parent = None
+        for i in range(4):
+            parent = Comment.objects.create(
+                issue=self.issues[0], author=self.owner, content=f'level {i}', parent_comment=parent
+            )
+        Comment.objects.create(issue=self.issues[1], author=self.owner, content='flat')
+        Comment.objects.create(issue=self.survivor, author=self.owner, content='stays')
+
+    def process(self, batch_size=2):
+        out = StringIO()
+        call_command('process_deletions', '--once', '--batch-size', str(batch_size), stdout=out)
+        return out.getvalue()
+
+    def test_project_is_hidden_at_once_and_removed_by_the_worker(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.delete(f'/api/projects/{self.project.id}/').status_code, 403)
+
+        self.client.force_authenticate(self.owner)
+        resp = self.client.delete(f'/api/projects/{self.project.id}/')
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.data['status'], DeletionJob.PENDING)
+        self.assertEqual(resp.data['issues_total'], 5)
+        self.assertTrue(resp['Location'].endswith(f'/api/deletions/{resp.data["id"]}/'))
+
+        # Nothing was deleted yet, but none of it is visible any more
+        self.assertEqual(Comment.objects.count(), 6)
+        self.assertEqual([p['id'] for p in self.client.get('/api/projects/').data], [self.kept.id])
+        for url in (f'/api/projects/{self.project.id}/', f'/api/projects/{self.project.id}/changes/',
+                    f'/api/issues/{self.issues[0].id}/'):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+        self.assertEqual(self.client.get(f'/api/projects/{self.project.id}/issues/').data['count'], 0)
+        self.assertEqual([i['id'] for i in self.client.get('/api/issues/').data['results']], [self.survivor.id])
+        self.assertEqual(len(self.client.get('/api/comments/').data['results']), 1)
+        self.assertEqual(self.client.get(f'/api/issues/{self.issues[1].id}/comments/').data['results'], [])
+        resp = self.client.post(f'/api/issues/{self.issues[1].id}/comments/', {'content': 'late'}, format='json')
+        self.assertEqual(resp.status_code, 404)
+
+        self.assertIn('with 5 issues and 5 comments', self.process())
+        self.assertFalse(Project.objects.filter(pk=self.project.id).exists())
+        self.assertFalse(Issue.objects.filter(project_id=self.project.id).exists())
+        self.assertFalse(ChangeLog.objects.filter(project_id=self.project.id).exists())
+        self.assertEqual(Comment.objects.count(), 1)
+        self.assertTrue(Issue.objects.filter(pk=self.survivor.id).exists())
+
+        resp = self.client.get(f'/api/deletions/{DeletionJob.objects.get().id}/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['status'], DeletionJob.DONE)
+        self.assertEqual((resp.data['issues_deleted'], resp.data['comments_deleted']), (5, 5))
+        self.assertIsNotNone(resp.data['finished_at'])
+
+    def test_issue_deletion_keeps_counters_and_the_change_feed_in_step(self):
+        issue = self.issues[0]
+        cursor = self.client.get(f'/api/projects/{self.project.id}/changes/').data['cursor']
+        self.client.force_authenticate(self.owner)
+        resp = self.client.delete(f'/api/issues/{issue.id}/')
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(self.client.delete(f'/api/issues/{issue.id}/').status_code, 404)
+
+        self.assertEqual(self.client.get(f'/api/issues/{issue.id}/').status_code, 404)
+        project = self.client.get(f'/api/projects/{self.project.id}/').data
+        self.assertEqual((project['issue_count'], project['open_issues']), (4, 4))
+        changes = self.client.get(f'/api/projects/{self.project.id}/changes/?since={cursor}').data
+        self.assertEqual(changes['deleted']['issues'], [issue.id])
+
+        self.process()
+        self.assertFalse(Issue.objects.filter(pk=issue.id).exists())
+        self.assertFalse(Comment.objects.filter(issue_id=issue.id).exists())
+        self.assertEqual(Issue.objects.filter(project=self.project).count(), 4)
+        # The worker's raw deletes skip the receivers, so nothing is counted twice
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.issue_count, 4)
+        job = DeletionJob.objects.get()
+        self.assertEqual((job.status, job.issues_deleted, job.comments_deleted), (DeletionJob.DONE, 1, 4))
+
+    def test_deleting_the_reporter_of_a_pending_deletion(self):
+        shared = Issue.objects.create(title='Shared', project=self.kept, reporter=self.other)
+        lone_project = Project.objects.create(name='Lone', owner=self.owner)
+        lone = Issue.objects.create(title='Lone', project=lone_project, reporter=self.other)
+        self.client.force_authenticate(self.owner)
+        for issue in (shared, lone):
+            self.assertEqual(self.client.delete(f'/api/issues/{issue.id}/').status_code, 202)
+
+        # The cascade must not count the issues out a second time
+        self.other.delete()
+        self.assertFalse(Issue.objects.filter(pk__in=[shared.id, lone.id]).exists())
+        for project, expected in ((self.kept, 1), (lone_project, 0)):
+            project.refresh_from_db()
+            self.assertEqual((project.issue_count, project.open_issues), (expected, expected))
+        exits = DailyIssueStats.objects.filter(project_id=lone_project.id, status='open').aggregate(n=Sum('exited'))
+        self.assertEqual(exits['n'], 1)
+        self.assertEqual(ChangeLog.objects.filter(object_id=lone.id, deleted=True).count(), 1)
+
+    def test_jobs_are_visible_to_their_requester_and_admins(self):
+        self.client.force_authenticate(self.owner)
+        job_id = self.client.delete(f'/api/issues/{self.issues[2].id}/').data['id']
+        self.assertEqual(self.client.get(f'/api/deletions/{job_id}/').data['status'], DeletionJob.PENDING)
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(f'/api/deletions/{job_id}/').status_code, 404)
+        self.other.profile.role = 'admin'
+        self.other.profile.save()
+        self.client.force_authenticate(User.objects.get(pk=self.other.pk))
+        self.assertEqual(self.client.get(f'/api/deletions/{job_id}/').status_code, 200)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(f'/api/deletions/{job_id}/').status_code, 401)
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Project, Issue, Comment
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class ExpandFieldsTests(QueryBudgetTestCase):
+    """?fields= and ?expand= on the project, issue and comment endpoints."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.reporter = User.objects.create_user(username='reporter', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        self.issue = Issue.objects.create(
+            title='Bug', project=self.project, reporter=self.reporter, assignee=self.owner,
+        )
+        root = Comment.objects.create(issue=self.issue, author=self.owner, content='root')
+        Comment.objects.create(issue=self.issue, author=self.reporter, content='reply', parent_comment=root)
+
+    def test_related_objects_default_to_ids(self):
+        resp = self.client.get(f'/api/issues/{self.issue.id}/')
+        self.assertEqual(resp.data['project'], self.project.id)
+        self.assertEqual(resp.data['reporter'], self.reporter.id)
+        self.assertEqual(resp.data['assignee'], self.owner.id)
+
+        resp = self.client.get(f'/api/projects/{self.project.id}/')
+        self.assertEqual(resp.data['owner'], self.owner.id)
+
+    def test_expand_nested_relations(self):
+        resp = self.client.get(f'/api/issues/{self.issue.id}/?expand=project.owner,reporter')
+        self.assertEqual(resp.data['project']['name'], 'P')
+        self.assertEqual(resp.data['project']['owner']['username'], 'owner')
+        self.assertEqual(resp.data['reporter']['username'], 'reporter')
+        self.assertEqual(resp.data['assignee'], self.owner.id)
+
+        resp = self.client.get(f'/api/issues/{self.issue.id}/?expand=project')
+        self.assertEqual(resp.data['project']['owner'], self.owner.id)
+
+    def test_fields_limits_output(self):
+        resp = self.client.get(f'/api/projects/{self.project.id}/issues/?fields=id,title')
+        self.assertEqual(resp.data['results'], [{'id': self.issue.id, 'title': 'Bug'}])
+
+    def test_compact_list_does_not_join(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/issues/')
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertNotIn('JOIN', ctx.captured_queries[-1]['sql'])
+        # Expanded relations are joined into the page query, not loaded per row
+        for i in range(5):
+            Issue.objects.create(title=f'More {i}', project=self.project, reporter=self.reporter)
+        self.assertQueryBudget('/api/issues/?expand=project.owner,reporter,assignee', 3)
+
+    def test_replies_inherit_fields_and_expand(self):
+        resp = self.client.get(f'/api/issues/{self.issue.id}/comments/?expand=author&fields=id,author,replies')
+        root = resp.data['results'][0]
+        self.assertEqual(set(root), {'id', 'author', 'replies'})
+        self.assertEqual(root['author']['username'], 'owner')
+        self.assertEqual(root['replies'][0]['author']['username'], 'reporter')
+        self.assertEqual(set(root['replies'][0]), {'id', 'author', 'replies'})
+
+        resp = self.client.get(f'/api/issues/{self.issue.id}/comments/')
+        self.assertEqual(resp.data['results'][0]['author'], self.owner.id)
@@ -0,0 +1,23 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import Project, Issue, Comment
+
+User = get_user_model()
+
+
+class IndexUsageTests(TestCase):
+    def test_list_querysets_use_their_indexes(self):
+        user = User.objects.create_user(username='planner', password='pass')
+        project = Project.objects.create(name='Plans', owner=user)
+        issue = Issue.objects.create(title='I', project=project, reporter=user)
+        root = Comment.objects.create(issue=issue, author=user, content='root')
+        Comment.objects.create(issue=issue, author=user, content='reply', parent_comment=root)
+
+        out = StringIO()
+        # Raises CommandError naming any query whose plan misses its index
+        call_command('explain_queries', stdout=out)
+        self.assertIn('All list queries use their indexes', out.getvalue())
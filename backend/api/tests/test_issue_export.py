@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api.models import Project, Issue
+
+User = get_user_model()
+
+
+class IssueExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reporter', password='pass')
+        self.dev = User.objects.create_user(username='dev', password='pass')
+        self.project = Project.objects.create(name='Export', owner=self.user)
+        self.other = Project.objects.create(name='Other', owner=self.user)
+        self.issues = [
+            Issue.objects.create(
+                title=f'Login bug {i}' if i % 2 else f'Layout glitch {i}', description='with, a "comma"',
+                status='open' if i % 3 else 'closed', priority='high' if i < 2 else 'medium',
+                project=self.project, reporter=self.user, assignee=self.dev if i == 1 else None,
+            )
+            for i in range(6)
+        ]
+        Issue.objects.create(title='Login elsewhere', project=self.other, reporter=self.user)
+        self.url = f'/api/projects/{self.project.id}/issues/export/'
+
+    def read(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        return resp, b''.join(resp.streaming_content).decode()
+
+    def test_csv_is_the_default(self):
+        resp, body = self.read(self.url)
+        self.assertEqual(resp['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn(f'project-{self.project.id}-issues.csv', resp['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        # Newest first, like the list endpoint
+        self.assertEqual([int(r['id']) for r in rows], [i.id for i in reversed(self.issues)])
+        first = rows[-1]
+        self.assertEqual(first['description'], 'with, a "comma"')
+        self.assertEqual(first['reporter'], 'reporter')
+        self.assertEqual(rows[-2]['assignee'], 'dev')
+        self.assertEqual(first['created_at'], self.issues[0].created_at.isoformat())
+
+    def test_ndjson_honours_list_filters(self):
+        resp, body = self.read(f'{self.url}?format=ndjson&search=login&status=open')
+        self.assertEqual(resp['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in body.splitlines()]
+        expected = [i.id for i in reversed(self.issues) if i.title.startswith('Login') and i.status == 'open']
+        self.assertEqual([r['id'] for r in rows], expected)
+        self.assertEqual(set(rows[0]), {
+            'id', 'title', 'description', 'status', 'priority', 'project_id',
+            'reporter', 'assignee', 'created_at', 'updated_at',
+        })
+
+    def test_ndjson_and_csv_keep_the_same_timestamps(self):
+        issue = Issue.objects.get(pk=self.issues[0].pk)
+        _, body = self.read(f'{self.url}?format=ndjson')
+        row = next(json.loads(line) for line in body.splitlines() if json.loads(line)['id'] == issue.id)
+        # Microseconds included, as in the CSV export and export_tracker
+        self.assertEqual(row['created_at'], issue.created_at.isoformat())
+        self.assertEqual(row['updated_at'], issue.updated_at.isoformat())
+
+    def test_rows_are_read_with_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(f'{self.url}?priority=medium')
+            b''.join(resp.streaming_content)
+        # project check + the export query, no per-row queries
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_unknown_project_or_format(self):
+        self.assertEqual(self.client.get('/api/projects/999999/issues/export/').status_code, 404)
+        self.assertEqual(self.client.get('/api/projects/abc/issues/export/').status_code, 404)
+        self.assertEqual(self.client.get(f'{self.url}?format=xml').status_code, 404)
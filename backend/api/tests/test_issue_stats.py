@@ -0,0 +1,105 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from api.deletion import schedule_issue_deletion, schedule_project_deletion, run_job
+from api.models import Project, Issue, IssueStatusTransition, DailyIssueStats
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class IssueStatsTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        self.other = Project.objects.create(name='Q', owner=self.owner)
+        self.issues = [
+            Issue.objects.create(title=f'Issue {i}', project=self.project, reporter=self.owner)
+            for i in range(5)
+        ]
+        self.client.force_authenticate(self.owner)
+
+    def stats(self, project, query=''):
+        return self.client.get(f'/api/projects/{project.id}/stats/{query}')
+
+    def rollups(self):
+        return sorted(DailyIssueStats.objects.values_list('project_id', 'date', 'status', 'entered', 'exited'))
+
+    def test_writes_roll_up_incrementally(self):
+        closed, moved, deleted, in_progress = self.issues[:4]
+        closed.status = 'closed'
+        closed.save()
+        in_progress.status = 'in_progress'
+        in_progress.save()
+        moved.project = self.other
+        moved.save()
+        schedule_issue_deletion(deleted)
+        self.client.patch(f'/api/projects/{self.project.id}/issues/bulk/',
+                          [{'id': in_progress.id, 'status': 'closed'}], format='json')
+
+        today = timezone.localdate()
+        # project + the days before the range + the days in it; no issue rows
+        resp = self.assertQueryBudget(f'/api/projects/{self.project.id}/stats/', 3)
+        self.assertEqual(resp.data['end'], today)
+        self.assertEqual(len(resp.data['days']), 30)
+        day = resp.data['days'][-1]
+        self.project.refresh_from_db()
+        self.assertEqual(day['counts'], {
+            'open': self.project.open_issues, 'in_progress': self.project.in_progress_issues,
+            'closed': self.project.closed_issues,
+        })
+        self.assertEqual(day['counts'], {'open': 1, 'in_progress': 0, 'closed': 2})
+        self.assertEqual(day['entered'], {'open': 5, 'in_progress': 1, 'closed': 2})
+        self.assertEqual(day['exited'], {'open': 4, 'in_progress': 1, 'closed': 0})
+        self.assertEqual(resp.data['days'][0]['counts'], {'open': 0, 'in_progress': 0, 'closed': 0})
+        self.assertEqual(self.stats(self.other).data['days'][-1]['counts']['open'], 1)
+
+        # Later ranges start from the running totals
+        tomorrow = (today + datetime.timedelta(days=1)).isoformat()
+        day = self.stats(self.project, f'?start={tomorrow}&end={tomorrow}').data['days'][0]
+        self.assertEqual((day['counts']['closed'], day['entered']['closed']), (2, 0))
+
+        # A rebuild from the transitions gives the same rollups
+        incremental = self.rollups()
+        DailyIssueStats.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_issue_stats', stdout=out)
+        self.assertIn('for 2 projects', out.getvalue())
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_backfill_for_issues_written_before_transitions(self):
+        long_ago = timezone.now() - datetime.timedelta(days=10)
+        Issue.objects.filter(pk__in=[issue.pk for issue in self.issues]).update(created_at=long_ago)
+        Issue.objects.filter(pk=self.issues[0].pk).update(status='closed', updated_at=long_ago + datetime.timedelta(days=2))
+        Project.objects.filter(pk=self.project.pk).update(open_issues=4, closed_issues=1)
+        IssueStatusTransition.objects.all().delete()
+        DailyIssueStats.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_issue_stats', '--backfill', '--project', str(self.project.id), stdout=out)
+        self.assertIn('Backfilled transitions for 5 issues', out.getvalue())
+        days = self.stats(self.project).data['days']
+        self.assertEqual(days[-1]['counts'], {'open': 4, 'in_progress': 0, 'closed': 1})
+        created = days[-11]
+        self.assertEqual((created['entered']['open'], created['counts']['open']), (5, 5))
+        self.assertEqual(days[-9]['entered']['closed'], 1)
+
+        # Issues that already have transitions are left alone
+        call_command('rebuild_issue_stats', '--backfill', stdout=out)
+        self.assertEqual(IssueStatusTransition.objects.count(), 6)
+
+    def test_invalid_ranges_and_deleted_projects(self):
+        self.assertEqual(self.stats(self.project, '?start=2026-02-30').status_code, 400)
+        self.assertEqual(self.stats(self.project, '?start=2026-03-02&end=2026-03-01').status_code, 400)
+        self.assertEqual(self.stats(self.project, '?start=2024-01-01&end=2026-01-01').status_code, 400)
+        self.assertEqual(self.stats(self.project, '?start=2026-01-01&end=2026-12-31').status_code, 200)
+
+        job = schedule_project_deletion(self.project)
+        self.assertEqual(self.stats(self.project).status_code, 404)
+        run_job(job)
+        self.assertFalse(IssueStatusTransition.objects.filter(project_id=self.project.id).exists())
+        self.assertFalse(DailyIssueStats.objects.filter(project_id=self.project.id).exists())
@@ -0,0 +1,102 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from api.cache import response_cache
+from api.deletion import schedule_issue_deletion, schedule_project_deletion
+from api.models import Project, Issue
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class MySummaryTests(QueryBudgetTestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.alice = User.objects.create_user(username='alice', password='pass')
+        self.bob = User.objects.create_user(username='bob', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.bob)
+        self.other = Project.objects.create(name='Q', owner=self.bob)
+        start = timezone.now() - datetime.timedelta(days=1)
+        self.issues = []
+        for i, (project, reporter, assignee, status, priority) in enumerate([
+            (self.project, self.alice, None, 'open', 'high'),
+            (self.project, self.bob, self.alice, 'open', 'high'),
+            (self.other, self.alice, self.alice, 'open', 'high'),
+            (self.project, self.bob, self.alice, 'closed', 'low'),
+            (self.project, self.bob, self.bob, 'open', 'high'),
+        ]):
+            issue = Issue.objects.create(title=f'Issue {i}', project=project, reporter=reporter,
+                                         assignee=assignee, status=status, priority=priority)
+            # Distinct, known creation order
+            Issue.objects.filter(pk=issue.pk).update(created_at=start + datetime.timedelta(minutes=i))
+            self.issues.append(issue)
+        self.client.force_authenticate(self.alice)
+
+    def tearDown(self):
+        response_cache.clear()
+
+    def summary(self, query=''):
+        return self.client.get(f'/api/me/summary/{query}')
+
+    def test_counts_and_newest_per_bucket(self):
+        # Cache version + counts + newest issues
+        resp = self.assertQueryBudget('/api/me/summary/?limit=2', 3)
+        data = resp.data
+        self.assertEqual((data['total'], data['assigned'], data['reported']), (4, 3, 2))
+        self.assertEqual(data['by_status'], {'open': 3, 'in_progress': 0, 'closed': 1})
+        self.assertEqual(data['by_priority'], {'low': 1, 'medium': 0, 'high': 3, 'critical': 0})
+
+        high, low = data['buckets']
+        self.assertEqual((high['status'], high['priority'], high['count'], high['assigned'], high['reported']),
+                         ('open', 'high', 3, 2, 2))
+        self.assertEqual([issue['id'] for issue in high['issues']], [self.issues[2].id, self.issues[1].id])
+        self.assertEqual(set(high['issues'][0]), {'id', 'title', 'status', 'priority', 'project',
+                                                  'created_at', 'updated_at'})
+        self.assertEqual((low['status'], low['count'], len(low['issues'])), ('closed', 1, 1))
+
+        self.assertEqual(self.summary('?limit=0').data['buckets'][0]['issues'], [])
+        self.assertEqual(self.summary('?limit=99').status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.summary().status_code, 401)
+
+    def test_cached_per_user_until_an_issue_touching_them_changes(self):
+        first = self.summary()
+        self.assertEqual(first['X-Cache'], 'MISS')
+        resp = self.assertQueryBudget('/api/me/summary/', 1)
+        self.assertEqual((resp['X-Cache'], resp.content), ('HIT', first.content))
+
+        # Someone else's cache entry, not alice's
+        self.client.force_authenticate(self.bob)
+        self.assertEqual(self.summary()['X-Cache'], 'MISS')
+        self.client.force_authenticate(self.alice)
+
+        # Not alice's issue: her summary stays cached
+        bobs = self.issues[4]
+        bobs.status = 'closed'
+        bobs.save()
+        self.assertEqual(self.summary()['X-Cache'], 'HIT')
+
+        # Assigned to her: counted at once
+        bobs.assignee = self.alice
+        bobs.save()
+        resp = self.summary()
+        self.assertEqual((resp['X-Cache'], resp.data['total']), ('MISS', 5))
+
+        # ... and unassigned by the project owner, through the bulk endpoint
+        self.client.force_authenticate(self.bob)
+        resp = self.client.patch(f'/api/projects/{self.project.id}/issues/bulk/',
+                                 [{'id': bobs.id, 'assignee_id': None}], format='json')
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.client.force_authenticate(self.alice)
+        resp = self.summary()
+        self.assertEqual((resp['X-Cache'], resp.json()['total']), ('MISS', 4))
+
+    def test_scheduled_deletions_leave_the_summary(self):
+        self.summary()
+        schedule_issue_deletion(self.issues[0])
+        self.assertEqual(self.summary().data['total'], 3)
+        schedule_project_deletion(self.project)
+        data = self.summary().data
+        self.assertEqual((data['total'], [b['issues'][0]['id'] for b in data['buckets']]), (1, [self.issues[2].id]))
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+
+from api.models import Project, Issue
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class PageEndpointTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        # More users than one /users/ page, so some reporters are not on it
+        self.others = [User.objects.create_user(username=f'user{i:02}', password='pass') for i in range(12)]
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        Project.objects.create(name='Q', owner=self.others[0])
+        for i, reporter in enumerate(self.others):
+            Issue.objects.create(
+                title=f'Issue {i}', project=self.project, reporter=reporter,
+                assignee=self.owner if i % 2 else None, status='closed' if i % 3 == 0 else 'open',
+            )
+
+    def login(self, user):
+        # As the cached authentication returns it: with the profile loaded
+        self.client.force_authenticate(User.objects.select_related('profile').get(pk=user.pk))
+
+    def test_dashboard_matches_the_separate_endpoints(self):
+        self.login(self.owner)
+        # The projects; the user comes from authentication
+        resp = self.assertQueryBudget('/api/pages/dashboard/', 1)
+        self.assertEqual(resp.data['user'], self.client.get('/api/auth/user/').data)
+        self.assertEqual(resp.data['projects'], self.client.get('/api/projects/').data)
+
+    def test_project_issues_page_matches_the_separate_endpoints(self):
+        self.login(self.owner)
+        url = f'/api/pages/projects/{self.project.id}/issues/?status=open'
+        # project + cursor + issue count + issue page + users page + the reporters not on it
+        resp = self.assertQueryBudget(url, 6)
+
+        self.assertEqual(resp.data['user'], self.client.get('/api/auth/user/').data)
+        self.assertEqual(resp.data['project'], self.client.get(f'/api/projects/{self.project.id}/?expand=owner').data)
+        self.assertEqual(resp.data['users'], self.client.get('/api/users/').data['results'])
+        self.assertEqual(resp.data['cursor'], self.client.get(f'/api/projects/{self.project.id}/changes/').data['cursor'])
+        issues = self.client.get(f'/api/projects/{self.project.id}/issues/?status=open&expand=reporter,assignee')
+        self.assertEqual(resp.data['issues']['count'], 8)
+        self.assertEqual(resp.data['issues']['results'], issues.data['results'])
+
+        resp = self.client.get(f'/api/pages/projects/{self.project.id}/issues/?pagination=cursor&status=closed')
+        self.assertNotIn('count', resp.data['issues'])
+        self.assertEqual([i['status'] for i in resp.data['issues']['results']], ['closed'] * 4)
+
+    def test_issue_links_page_through_the_issue_list(self):
+        self.login(self.owner)
+        issue_list = f'http://testserver/api/projects/{self.project.id}/issues/?'
+        for query in ('priority=medium', 'priority=medium&pagination=cursor'):
+            resp = self.client.get(f'/api/pages/projects/{self.project.id}/issues/?{query}')
+            link = resp.data['issues']['next']
+            self.assertTrue(link.startswith(issue_list), link)
+            self.assertIn('priority=medium', link)
+            # The rest of the list, in the page's shape and without its other blocks
+            following = self.client.get(link)
+            self.assertEqual(len(following.data['results']), 2)
+            self.assertIn('username', following.data['results'][0]['reporter'])
+            self.assertTrue(following.data['previous'].startswith(issue_list))
+
+    def test_missing_or_anonymous(self):
+        self.assertEqual(self.client.get('/api/pages/dashboard/').status_code, 401)
+        self.login(self.owner)
+        self.assertEqual(self.client.get('/api/pages/projects/999999/issues/').status_code, 404)
+        self.assertEqual(self.client.get('/api/pages/projects/abc/issues/').status_code, 404)
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from api.models import Project, Issue, Comment
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class CursorPaginationTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='pass')
+        self.project = Project.objects.create(name='Paging', owner=self.user)
+        for i in range(25):
+            Issue.objects.create(title=f'Issue {i}', project=self.project, reporter=self.user)
+        # Ties on created_at must be broken by id
+        Issue.objects.filter(id__in=list(Issue.objects.values_list('id', flat=True)[5:15])).update(
+            created_at=timezone.now()
+        )
+        self.expected = list(Issue.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def walk(self, url):
+        pages = []
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotIn('count', resp.data)
+            pages.append(resp.data)
+            url = resp.data['next']
+        return pages
+
+    def test_forward_walk_matches_ordering(self):
+        pages = self.walk(f'/api/projects/{self.project.id}/issues/?pagination=cursor')
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]['previous'])
+        ids = [row['id'] for page in pages for row in page['results']]
+        self.assertEqual(ids, self.expected)
+
+    def test_previous_link_returns_previous_page(self):
+        pages = self.walk('/api/issues/?pagination=cursor')
+        back = self.client.get(pages[2]['previous'])
+        self.assertEqual(back.data['results'], pages[1]['results'])
+        first = self.client.get(back.data['previous'])
+        self.assertEqual(first.data['results'], pages[0]['results'])
+        self.assertIsNone(first.data['previous'])
+
+    def test_cursor_page_runs_no_count_query(self):
+        first = self.client.get('/api/issues/?pagination=cursor')
+        # Cache version lookup + the page itself
+        self.assertQueryBudget(first.data['next'], 2)
+
+    def test_page_number_mode_unchanged(self):
+        resp = self.client.get('/api/issues/?page=2')
+        self.assertEqual(resp.data['count'], 25)
+        self.assertEqual([row['id'] for row in resp.data['results']], self.expected[10:20])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/issues/?cursor=not-a-cursor').status_code, 404)
+
+    def test_comment_threads_cursor_mode(self):
+        issue = Issue.objects.first()
+        roots = [Comment.objects.create(issue=issue, author=self.user, content=f'c{i}') for i in range(12)]
+        Comment.objects.create(issue=issue, author=self.user, content='reply', parent_comment=roots[0])
+        pages = self.walk(f'/api/issues/{issue.id}/comments/?pagination=cursor')
+        ids = [row['id'] for page in pages for row in page['results']]
+        self.assertEqual(ids, [c.id for c in roots])
+        self.assertEqual(pages[0]['results'][0]['reply_count'], 1)
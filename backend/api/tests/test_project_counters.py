@@ -0,0 +1,54 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from api.models import Project, Issue
+
+User = get_user_model()
+
+
+class ProjectIssueCounterTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.project = Project.objects.create(name='Counters', owner=self.owner)
+
+    def counters(self):
+        self.project.refresh_from_db()
+        p = self.project
+        return (p.issue_count, p.open_issues, p.in_progress_issues, p.closed_issues)
+
+    def test_counters_follow_create_status_change_and_delete(self):
+        a = Issue.objects.create(title='A', project=self.project, reporter=self.owner)
+        Issue.objects.create(title='B', project=self.project, reporter=self.owner, status='closed')
+        self.assertEqual(self.counters(), (2, 1, 0, 1))
+
+        a.status = 'in_progress'
+        a.save()
+        self.assertEqual(self.counters(), (2, 0, 1, 1))
+
+        a.delete()
+        self.assertEqual(self.counters(), (1, 0, 0, 1))
+
+    def test_status_change_through_api_updates_counters(self):
+        issue = Issue.objects.create(title='A', project=self.project, reporter=self.owner)
+        self.client.force_authenticate(self.owner)
+        resp = self.client.patch(f'/api/issues/{issue.id}/', {'status': 'closed'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.counters(), (1, 0, 0, 1))
+
+        resp = self.client.get(f'/api/projects/{self.project.id}/')
+        self.assertEqual(resp.data['closed_issues'], 1)
+
+    def test_recount_command_repairs_drift(self):
+        Issue.objects.create(title='A', project=self.project, reporter=self.owner)
+        Project.objects.filter(pk=self.project.pk).update(issue_count=7, open_issues=0)
+
+        out = StringIO()
+        call_command('recount_project_issues', '--dry-run', stdout=out)
+        self.assertIn('drifted', out.getvalue())
+        self.assertEqual(self.counters(), (7, 0, 0, 0))
+
+        call_command('recount_project_issues', stdout=StringIO())
+        self.assertEqual(self.counters(), (1, 1, 0, 0))
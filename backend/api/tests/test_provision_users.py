@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.models import UserProfile, CacheVersion
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ProvisionUsersTests(TestCase):
+    def provision(self, content, suffix, *args):
+        with tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8') as fh:
+            fh.write(content)
+        self.addCleanup(os.unlink, fh.name)
+        out, err = StringIO(), StringIO()
+        call_command('provision_users', fh.name, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_with_a_process_pool(self):
+        User.objects.create_user(username='taken', password='pass')
+        version = CacheVersion.current([CacheVersion.USERS])[CacheVersion.USERS]
+        content = (
+            'username,email,password,role\n'
+            'alice,alice@example.com,s3cret,project_manager\n'
+            'bob,,hunter2,\n'
+            'carol,carol@example.com,pw,tester\n'
+            'taken,,x,guest\n'
+            'alice,,again,guest\n'
+            'dave,,pw,wizard\n'
+        )
+        out, err = self.provision(content, '.csv', '--workers', '2', '--batch-size', '2')
+        self.assertIn('Created 3 users', out)
+        self.assertIn('Line 5: user "taken" already exists', err)
+        self.assertIn('Line 6: duplicate username "alice"', err)
+        self.assertIn('Line 7: unknown role "wizard"', err)
+
+        alice = User.objects.select_related('profile').get(username='alice')
+        self.assertTrue(alice.check_password('s3cret'))
+        self.assertEqual(alice.email, 'alice@example.com')
+        # The same flags update_role would set for the role
+        expected = UserProfile(user=alice)
+        expected.apply_role('project_manager')
+        for field in ('role', 'can_create_projects', 'can_delete_issues', 'can_assign_issues'):
+            self.assertEqual(getattr(alice.profile, field), getattr(expected, field), field)
+        self.assertEqual(User.objects.get(username='bob').profile.role, 'developer')
+        self.assertTrue(User.objects.get(username='carol').check_password('pw'))
+        self.assertEqual(UserProfile.objects.count(), User.objects.count())
+        self.assertGreater(CacheVersion.current([CacheVersion.USERS])[CacheVersion.USERS], version)
+
+    def test_ndjson_without_password(self):
+        lines = [{'username': 'erin', 'first_name': 'Erin', 'role': 'guest'}, {'username': 'frank'}]
+        content = '\n'.join(json.dumps(line) for line in lines) + '\n'
+        out, _ = self.provision(content, '.ndjson', '--workers', '1', '--default-role', 'tester')
+        self.assertIn('Created 2 users', out)
+        erin = User.objects.get(username='erin')
+        self.assertFalse(erin.has_usable_password())
+        self.assertEqual((erin.first_name, erin.profile.role, erin.profile.can_create_projects), ('Erin', 'guest', False))
+        self.assertEqual(User.objects.get(username='frank').profile.role, 'tester')
+
+    def test_ensure_user_profiles_bulk_creates_missing_profiles(self):
+        users = [User.objects.create_user(username=f'u{i}') for i in range(3)]
+        UserProfile.objects.filter(user__in=users[:2]).delete()
+        out = StringIO()
+        call_command('ensure_user_profiles', stdout=out)
+        self.assertIn('Successfully created 2 user profiles', out.getvalue())
+        profile = UserProfile.objects.get(user=users[0])
+        self.assertEqual((profile.role, profile.can_create_projects, profile.can_delete_issues),
+                         ('developer', True, False))
@@ -0,0 +1,163 @@
+from django.contrib.auth import get_user_model
+
+from api.models import Project, Issue, Comment
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class QueryBudgetTests(QueryBudgetTestCase):
+    """List endpoints must stay within a fixed query budget however many rows they return."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'user{i}', password='pass') for i in range(4)]
+        self.projects = []
+        for p in range(3):
+            project = Project.objects.create(name=f'P{p}', owner=self.users[p])
+            self.projects.append(project)
+            for i in range(4):
+                Issue.objects.create(
+                    title=f'Issue {p}-{i}', project=project,
+                    reporter=self.users[i], assignee=self.users[(i + 1) % 4],
+                )
+
+    def test_response_reports_query_headers(self):
+        resp = self.client.get('/api/projects/')
+        self.assertIn('X-DB-Queries', resp)
+        self.assertIn('X-DB-Time-ms', resp)
+
+    def test_project_list_budget(self):
+        # Cache version lookup + the projects
+        resp = self.assertQueryBudget('/api/projects/', 2)
+        self.assertEqual(len(resp.data), 3)
+        # Served from the response cache: only the version lookup
+        resp = self.assertQueryBudget('/api/projects/', 1)
+        self.assertEqual(resp['X-Cache'], 'HIT')
+
+    def test_issue_list_budget(self):
+        # Cache version lookup + COUNT(*) for pagination + one page query
+        resp = self.assertQueryBudget('/api/issues/', 3)
+        self.assertEqual(resp.data['count'], 12)
+        self.assertQueryBudget('/api/issues/', 1)
+
+    def test_project_issue_list_budget(self):
+        # ETag marker + cache versions + COUNT(*) + page
+        resp = self.assertQueryBudget(f'/api/projects/{self.projects[0].id}/issues/', 4)
+        self.assertEqual(resp.data['count'], 4)
+        self.assertQueryBudget(f'/api/projects/{self.projects[0].id}/issues/', 2)
+
+    def build_thread(self, issue, depth=4, fanout=2):
+        level = [None]
+        for d in range(depth):
+            next_level = []
+            for parent in level:
+                for i in range(fanout if parent else 3):
+                    next_level.append(Comment.objects.create(
+                        issue=issue, author=self.users[(d + i) % 4],
+                        content=f'depth {d} #{i}', parent_comment=parent,
+                    ))
+            level = next_level
+
+    def test_comment_thread_budget(self):
+        issue = Issue.objects.filter(project=self.projects[0]).first()
+        self.build_thread(issue)
+        # ETag marker + the whole thread, with authors and profiles, in one query
+        resp = self.assertQueryBudget(f'/api/issues/{issue.id}/comments/?expand=author', 2)
+        self.assertEqual(resp.data['count'], 3)
+
+        root = resp.data['results'][0]
+        self.assertEqual(root['reply_count'], 2)
+        self.assertEqual(root['author']['username'], 'user0')
+        leaf = root['replies'][0]['replies'][0]['replies'][0]
+        self.assertEqual(leaf['content'], 'depth 3 #0')
+        self.assertEqual(leaf['replies'], [])
+        self.assertEqual(leaf['reply_count'], 0)
+
+    def test_top_level_comment_list_budget(self):
+        for issue in Issue.objects.all()[:3]:
+            self.build_thread(issue, depth=3)
+        # COUNT(*) + page of roots + one query for all their replies
+        resp = self.assertQueryBudget('/api/comments/', 3)
+        self.assertEqual(len(resp.data['results']), 9)
+
+    def test_comment_subtree_and_depth_limit(self):
+        issue = Issue.objects.filter(project=self.projects[1]).first()
+        self.build_thread(issue)
+        root = Comment.objects.filter(issue=issue, depth=0).order_by('id').first()
+        child = Comment.objects.filter(parent_comment=root).order_by('id').first()
+        self.assertEqual(child.path, root.path + Comment.path_segment(child.id))
+        self.assertEqual(child.depth, 1)
+
+        # ETag marker + root lookup + one range scan on (issue, path)
+        resp = self.assertQueryBudget(f'/api/issues/{issue.id}/comments/?root={child.id}', 3)
+        self.assertEqual(resp.data['count'], 1)
+        subtree = resp.data['results'][0]
+        self.assertEqual(subtree['id'], child.id)
+        self.assertEqual(len(subtree['replies']), 2)
+        self.assertEqual(len(subtree['replies'][0]['replies']), 2)
+
+        # Depth-limited view: thread + reply counts for the cut-off level
+        resp = self.assertQueryBudget(f'/api/issues/{issue.id}/comments/?max_depth=1', 3)
+        first = resp.data['results'][0]
+        self.assertEqual(first['reply_count'], 2)
+        self.assertEqual(first['replies'][0]['replies'], [])
+        self.assertEqual(first['replies'][0]['reply_count'], 2)
+
+        resp = self.client.get(f'/api/comments/{child.id}/?max_depth=0')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['replies'], [])
+        self.assertEqual(resp.data['reply_count'], 2)
+
+
+class WritePathBudgetTests(QueryBudgetTestCase):
+    """
+    Permission checks read ids from the request's AuthContext instead of
+    loading users. Every write also bumps its cache versions in one UPDATE
+    and appends one ChangeLog row.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.reporter = User.objects.create_user(username='reporter', password='pass')
+        self.project = Project.objects.create(name='P', owner=self.owner)
+        self.issue = Issue.objects.create(title='Bug', project=self.project, reporter=self.reporter)
+
+    def login(self, user):
+        # A fresh instance, as the authentication backend would return it
+        self.client.force_authenticate(User.objects.get(pk=user.pk))
+
+    def test_reporter_edit_budget(self):
+        self.login(self.reporter)
+        # issue + savepoint + locked previous status + update + version bump
+        # + project modification marker + change feed + release
+        self.assertQueryBudget(f'/api/issues/{self.issue.id}/', 8, method='patch',
+                               data={'title': 'Renamed'})
+
+    def test_owner_status_change_budget(self):
+        self.login(self.owner)
+        # The project owner id comes with the issue row; the counter UPDATE
+        # also marks the project modified. A status change adds the transition
+        # INSERT and the daily rollup upsert
+        self.assertQueryBudget(f'/api/issues/{self.issue.id}/', 10, method='patch',
+                               data={'status': 'closed'})
+
+    def test_project_edit_budget(self):
+        self.login(self.owner)
+        self.assertQueryBudget(f'/api/projects/{self.project.id}/', 3, method='patch',
+                               data={'name': 'Renamed'})
+
+    def test_issue_delete_budget(self):
+        self.login(self.owner)
+        # issue + savepoint + mark deleted + counters + version bump + change feed
+        # + status transition + daily rollup + deletion job + release; comments and
+        # the row go later, in the worker
+        self.assertQueryBudget(f'/api/issues/{self.issue.id}/', 10, method='delete', expected_status=202)
+
+    def test_non_owner_is_still_rejected(self):
+        self.login(self.reporter)
+        resp = self.client.patch(f'/api/issues/{self.issue.id}/', {'status': 'closed'}, format='json')
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.delete(f'/api/issues/{self.issue.id}/')
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.patch(f'/api/projects/{self.project.id}/', {'name': 'X'}, format='json')
+        self.assertEqual(resp.status_code, 403)
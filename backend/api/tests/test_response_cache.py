@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+
+from api.cache import ResponseCache, response_cache
+from api.models import Project, Issue, Comment, CacheVersion, UserProfile
+from .utils import QueryBudgetTestCase
+
+User = get_user_model()
+
+
+class ResponseCacheTests(QueryBudgetTestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.project = Project.objects.create(name='A', owner=self.owner)
+        self.other = Project.objects.create(name='B', owner=self.owner)
+        self.issue = Issue.objects.create(title='Bug', project=self.project, reporter=self.owner)
+
+    def get(self, url):
+        return self.client.get(url)
+
+    def test_hit_after_miss(self):
+        first = self.get('/api/projects/')
+        second = self.get('/api/projects/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+        # Different query parameters are different entries
+        self.assertEqual(self.get('/api/projects/?expand=owner')['X-Cache'], 'MISS')
+
+    def test_issue_write_bumps_its_project_only(self):
+        url_a = f'/api/projects/{self.project.id}/issues/'
+        url_b = f'/api/projects/{self.other.id}/issues/'
+        self.get(url_a), self.get(url_b), self.get('/api/projects/')
+
+        # The shared scopes are bumped once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            another = Issue.objects.create(title='Another', project=self.project, reporter=self.owner)
+        resp = self.get(url_a)
+        self.assertEqual(resp['X-Cache'], 'MISS')
+        self.assertEqual(resp.data['count'], 2)
+        self.assertEqual(self.get(url_b)['X-Cache'], 'HIT')
+        # The project list shows counters, so it follows writes that change them
+        self.assertEqual(self.get('/api/projects/')['X-Cache'], 'MISS')
+
+        # ... and only those
+        with self.captureOnCommitCallbacks(execute=True):
+            another.title = 'Renamed'
+            another.save()
+        self.assertEqual(self.get(url_a)['X-Cache'], 'MISS')
+        self.assertEqual(self.get('/api/projects/')['X-Cache'], 'HIT')
+
+    def test_moving_an_issue_bumps_both_projects(self):
+        url_a = f'/api/projects/{self.project.id}/issues/'
+        url_b = f'/api/projects/{self.other.id}/issues/'
+        self.get(url_a), self.get(url_b)
+        self.issue.project = self.other
+        self.issue.save()
+        self.assertEqual(self.get(url_a).data['count'], 0)
+        self.assertEqual(self.get(url_b).data['count'], 1)
+
+    def test_comment_and_user_writes_bump_versions(self):
+        before = CacheVersion.current([CacheVersion.project_scope(self.project.id), CacheVersion.USERS])
+        shared = CacheVersion.current([CacheVersion.GLOBAL, CacheVersion.PROJECTS])
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(issue=self.issue, author=self.owner, content='hi')
+        UserProfile.objects.filter(user=self.owner).first().save()
+        after = CacheVersion.current([CacheVersion.project_scope(self.project.id), CacheVersion.USERS])
+        for scope in before:
+            self.assertGreater(after[scope], before[scope])
+        # No cross-project response renders comments
+        self.assertEqual(CacheVersion.current([CacheVersion.GLOBAL, CacheVersion.PROJECTS]), shared)
+
+    def test_expanded_user_changes_are_not_served_stale(self):
+        url = f'/api/issues/{self.issue.id}/?expand=reporter'
+        self.assertEqual(self.get(url).data['reporter']['username'], 'owner')
+        self.owner.username = 'renamed'
+        self.owner.save()
+        resp = self.get(url)
+        self.assertEqual(resp['X-Cache'], 'MISS')
+        self.assertEqual(resp.data['reporter']['username'], 'renamed')
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.get('/api/projects/')
+        self.get('/api/projects/')
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.get('/api/cache/stats/').status_code, 403)
+
+        UserProfile.objects.filter(user=self.owner).update(role='admin')
+        self.client.force_authenticate(User.objects.get(pk=self.owner.pk))
+        stats = self.client.get('/api/cache/stats/').data
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+
+class ResponseCacheLRUTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_entries=2, max_bytes=1000)
+        cache.set('a', b'1', 'application/json')
+        cache.set('b', b'2', 'application/json')
+        cache.get('a')
+        cache.set('c', b'3', 'application/json')
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_bounded_by_bytes(self):
+        cache = ResponseCache(max_entries=10, max_bytes=10)
+        cache.set('a', b'x' * 6, 'application/json')
+        cache.set('b', b'x' * 6, 'application/json')
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertEqual(cache.stats()['bytes'], 6)
+        cache.set('big', b'x' * 11, 'application/json')
+        self.assertIsNone(cache.get('big'))
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from api.models import Project, Issue
+
+User = get_user_model()
+
+
+class IssueSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='pass')
+        self.project = Project.objects.create(name='Search', owner=self.user)
+        self.other = Project.objects.create(name='Other', owner=self.user)
+
+    def make(self, title, description='', project=None, **kwargs):
+        return Issue.objects.create(
+            title=title, description=description, reporter=self.user,
+            project=project or self.project, **kwargs,
+        )
+
+    def search_ids(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return [row['id'] for row in resp.data['results']]
+
+    def test_ranked_by_relevance(self):
+        in_description = self.make('Slow page', 'the login form times out')
+        in_title = self.make('Login crashes', 'stack trace attached')
+        self.make('Unrelated', 'nothing to see')
+        self.assertEqual(self.search_ids('/api/issues/?search=login'), [in_title.id, in_description.id])
+
+    def test_prefix_and_all_words_match(self):
+        match = self.make('Database timeout on export')
+        self.make('Database migration')
+        self.assertEqual(self.search_ids('/api/issues/?search=datab timeout'), [match.id])
+
+    def test_filters_still_apply(self):
+        keep = self.make('Crash on save', status='closed', priority='high')
+        self.make('Crash on load', status='open', priority='high')
+        self.make('Crash on save', project=self.other, status='closed', priority='high')
+        ids = self.search_ids(f'/api/projects/{self.project.id}/issues/?search=crash&status=closed&priority=high')
+        self.assertEqual(ids, [keep.id])
+
+    def test_index_follows_writes(self):
+        issue = self.make('Old title')
+        with self.captureOnCommitCallbacks(execute=True):
+            issue.title = 'Renamed widget'
+            issue.save()
+        self.assertEqual(self.search_ids('/api/issues/?search=widget'), [issue.id])
+        self.assertEqual(self.search_ids('/api/issues/?search=old'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            issue.delete()
+        self.assertEqual(self.search_ids('/api/issues/?search=widget'), [])
+
+    def test_operator_characters_are_literal(self):
+        issue = self.make('Error: "NOT" AND OR near *')
+        self.assertEqual(self.search_ids('/api/issues/?search=NOT AND "OR*'), [issue.id])
+        self.assertEqual(self.search_ids('/api/issues/?search=*'), [issue.id])
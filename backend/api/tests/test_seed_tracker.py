@@ -0,0 +1,114 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Min, Q
+from django.test import TestCase
+
+from api.models import Project, Issue, Comment, IssueStatusTransition, DailyIssueStats, CacheVersion
+from api.search import search_issues
+from api.stats import rebuild_project_stats
+
+User = get_user_model()
+
+
+class SeedTrackerTests(TestCase):
+    def seed(self, *args):
+        out = StringIO()
+        call_command('seed_tracker', '--users', '12', '--projects', '3', '--issues', '60', '--comments', '200',
+                     '--max-depth', '4', '--end', '2026-03-31', '--batch-size', '25', *args, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self, prefix):
+        """The dataset seeded with `prefix`, with ids relative to its first rows."""
+        users = User.objects.filter(username__startswith=prefix)
+        issues = Issue.objects.filter(reporter__in=users)
+        comments = Comment.objects.filter(issue__in=issues)
+        user_id = users.aggregate(first=Min('id'))['first']
+        issue_id = issues.aggregate(first=Min('id'))['first']
+        comment_id = comments.aggregate(first=Min('id'))['first']
+        project_id = Project.objects.filter(owner__in=users).aggregate(first=Min('id'))['first']
+
+        def offset(value, first):
+            return None if value is None else value - first
+
+        return (
+            [(u.username[len(prefix):], u.first_name, u.profile.role) for u in users.order_by('id')],
+            [(i.id - issue_id, i.project_id - project_id, i.reporter_id - user_id, offset(i.assignee_id, user_id),
+              i.title, i.status, i.priority, i.created_at, i.updated_at) for i in issues.order_by('id')],
+            [(c.id - comment_id, c.issue_id - issue_id, offset(c.parent_comment_id, comment_id), c.depth,
+              c.author_id - user_id, c.created_at) for c in comments.order_by('id')],
+        )
+
+    def test_same_seed_same_dataset(self):
+        out = self.seed('--seed', '7', '--username-prefix', 'a')
+        self.assertIn('12 users, 12 user profiles, 3 projects, 60 issues, 200 comments', out)
+        self.seed('--seed', '7', '--username-prefix', 'b')
+        self.seed('--seed', '8', '--username-prefix', 'c')
+        first = self.snapshot('a')
+        self.assertEqual(self.snapshot('b'), first)
+        self.assertNotEqual(self.snapshot('c'), first)
+        # Spread over the year up to --end
+        created = [row[7].date() for row in first[1]]
+        self.assertEqual(created, sorted(created))
+        self.assertGreaterEqual(created[0], datetime.date(2025, 3, 31))
+        self.assertLessEqual(created[-1], datetime.date(2026, 3, 31))
+
+    def test_rows_are_consistent(self):
+        existing = Issue.objects.create(title='Existing', project=Project.objects.create(name='Old'),
+                             reporter=User.objects.create_user(username='old', password='pass'))
+        version = CacheVersion.current([CacheVersion.GLOBAL])[CacheVersion.GLOBAL]
+        self.seed()
+
+        user = User.objects.get(username='user1')
+        self.assertTrue(user.check_password('password'))
+        self.assertEqual(user.profile.role, 'admin')
+
+        # Counters as Issue.save would have kept them
+        for project in Project.objects.annotate(
+            n=Count('issues'), open=Count('issues', filter=Q(issues__status='open')),
+            closed=Count('issues', filter=Q(issues__status='closed')),
+        ):
+            self.assertEqual((project.issue_count, project.open_issues, project.closed_issues),
+                             (project.n, project.open, project.closed))
+
+        # Every comment path is its parent's plus its own id
+        comments = Comment.objects.select_related('parent_comment')
+        self.assertEqual(comments.count(), 200)
+        for comment in comments:
+            parent_path, parent_depth = '', -1
+            if comment.parent_comment:
+                parent_path, parent_depth = comment.parent_comment.path, comment.parent_comment.depth
+                self.assertEqual(comment.parent_comment.issue_id, comment.issue_id)
+            self.assertEqual(comment.path, parent_path + Comment.path_segment(comment.pk))
+            self.assertEqual(comment.depth, parent_depth + 1)
+        self.assertEqual(max(c.depth for c in comments), 4)
+
+        # Rollups match a rebuild from the transitions
+        created = IssueStatusTransition.objects.filter(to_status='open', from_status='').exclude(issue_id=existing.id)
+        self.assertEqual(created.count(), 60)
+        seeded = sorted(DailyIssueStats.objects.values_list('project_id', 'date', 'status', 'entered', 'exited'))
+        for project_id in Project.objects.values_list('id', flat=True):
+            rebuild_project_stats(project_id)
+        self.assertEqual(
+            sorted(DailyIssueStats.objects.values_list('project_id', 'date', 'status', 'entered', 'exited')), seeded
+        )
+
+        # Searchable, and issues written afterwards are indexed again
+        matches = Issue.objects.filter(title__icontains='pagination').count()
+        self.assertGreater(matches, 0)
+        self.assertEqual(search_issues(Issue.objects.all(), 'pagination').count(), matches)
+        later = Issue.objects.create(title='Zeppelin after seeding', project=Project.objects.first(), reporter=user)
+        self.assertEqual(list(search_issues(Issue.objects.all(), 'zeppelin')), [later])
+
+        self.assertGreater(CacheVersion.current([CacheVersion.GLOBAL])[CacheVersion.GLOBAL], version)
+
+    def test_invalid_options(self):
+        User.objects.create_user(username='user3', password='pass')
+        with self.assertRaisesMessage(CommandError, 'User "user3" already exists'):
+            self.seed()
+        with self.assertRaisesMessage(CommandError, '--max-depth must be between'):
+            self.seed('--username-prefix', 'x', '--max-depth', str(Comment.MAX_DEPTH + 1))
+        self.assertFalse(Issue.objects.exists())
@@ -0,0 +1,125 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from api.models import Project, Issue, Comment, UserProfile, DeletionJob
+from api.stats import rebuild_project_stats
+
+User = get_user_model()
+
+
+class TrackerExportImportTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='pass')
+        self.bob = User.objects.create_user(username='bob', password='pass')
+        UserProfile.objects.filter(user=self.bob).update(role='tester', can_create_projects=False)
+        self.project = Project.objects.create(name='Tracker', owner=self.alice)
+        self.issue = Issue.objects.create(
+            title='Crash', description='on start', project=self.project,
+            reporter=self.bob, assignee=self.alice, status='in_progress',
+        )
+        Issue.objects.create(title='Typo', project=self.project, reporter=self.alice, status='closed')
+        root = Comment.objects.create(issue=self.issue, author=self.bob, content='root')
+        reply = Comment.objects.create(issue=self.issue, author=self.alice, content='reply', parent_comment=root)
+        Comment.objects.create(issue=self.issue, author=self.bob, content='nested', parent_comment=reply)
+        handle, self.path = tempfile.mkstemp(suffix='.ndjson')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def export(self, *args):
+        call_command('export_tracker', self.path, *args, stderr=StringIO())
+
+    def import_(self):
+        out = StringIO()
+        call_command('import_tracker', self.path, '--batch-size', '2', stdout=out)
+        return out.getvalue()
+
+    def test_round_trip_into_empty_database(self):
+        self.export()
+        created_at = Issue.objects.get(title='Crash').created_at
+        Project.objects.all().delete()
+        User.objects.all().delete()
+
+        self.import_()
+        alice, bob = User.objects.get(username='alice'), User.objects.get(username='bob')
+        self.assertTrue(bob.check_password('pass'))
+        self.assertEqual(bob.profile.role, 'tester')
+        self.assertFalse(bob.profile.can_create_projects)
+
+        project = Project.objects.get(name='Tracker')
+        self.assertEqual(project.owner, alice)
+        self.assertEqual((project.issue_count, project.in_progress_issues, project.closed_issues), (2, 1, 1))
+
+        issue = Issue.objects.get(title='Crash')
+        self.assertEqual((issue.reporter, issue.assignee), (bob, alice))
+        self.assertEqual(issue.created_at, created_at)
+
+        nested = Comment.objects.get(content='nested')
+        reply = nested.parent_comment
+        self.assertEqual(reply.content, 'reply')
+        self.assertEqual(nested.depth, 2)
+        self.assertEqual(nested.path, reply.parent_comment.path + Comment.path_segment(reply.id)
+                         + Comment.path_segment(nested.id))
+        self.assertEqual(nested.issue, issue)
+
+    def test_import_alongside_existing_data_remaps_ids(self):
+        self.export()
+        self.import_()
+        # Users are matched by username; everything else is copied with new ids
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(Project.objects.filter(name='Tracker').count(), 2)
+        copy = Project.objects.exclude(pk=self.project.pk).get()
+        self.assertEqual(copy.issues.count(), 2)
+        self.assertEqual(Comment.objects.filter(issue__project=copy, depth=2).count(), 1)
+        copy_issue = copy.issues.get(title='Crash')
+        resp = self.client.get(f'/api/issues/{copy_issue.id}/comments/')
+        self.assertEqual(resp.data['results'][0]['replies'][0]['replies'][0]['content'], 'nested')
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'w') as f:
+            f.write('{"model": "api.project"}\n')
+        with self.assertRaises(CommandError):
+            self.import_()
+
+    def test_imported_projects_stay_hidden_until_the_import_completes(self):
+        self.export()
+        seen = []
+
+        def rebuild(project_id, batch_size):
+            seen.append(Project.objects.live().filter(name='Tracker').count())
+            return rebuild_project_stats(project_id, batch_size)
+
+        with mock.patch('api.management.commands.import_tracker.rebuild_project_stats', side_effect=rebuild):
+            self.import_()
+        # Every batch is already in, but the copy only shows up at the end
+        self.assertEqual(seen, [1])
+        copy = Project.objects.live().exclude(pk=self.project.pk).get()
+        self.assertEqual(copy.issue_count, 2)
+
+    def test_failed_import_leaves_its_projects_to_the_deletion_worker(self):
+        self.export()
+        err = StringIO()
+        with mock.patch('api.management.commands.import_tracker.rebuild_project_stats',
+                        side_effect=RuntimeError('disk full')):
+            with self.assertRaises(RuntimeError):
+                call_command('import_tracker', self.path, '--batch-size', '2', stdout=StringIO(), stderr=err)
+        self.assertIn('1 partly imported projects were scheduled for deletion', err.getvalue())
+        copy = Project.objects.exclude(pk=self.project.pk).get()
+        self.assertIsNotNone(copy.deleted_at)
+        self.assertTrue(DeletionJob.objects.filter(model=DeletionJob.PROJECT, object_id=copy.pk).exists())
+
+        call_command('process_deletions', '--once', stdout=StringIO())
+        self.assertEqual(list(Project.objects.values_list('pk', flat=True)), [self.project.pk])
+        self.assertEqual(Comment.objects.count(), 3)
+        # Users are kept; the next run matches them by username
+        self.import_()
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(Project.objects.live().filter(name='Tracker').count(), 2)
@@ -0,0 +1,31 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    APITestCase with helpers that fail a test when an endpoint runs more SQL
+    queries than its declared budget.
+    """
+
+    def assertMaxQueries(self, budget, func, *args, **kwargs):
+        """Call func and fail if it executes more than `budget` queries."""
+        with CaptureQueriesContext(connection) as ctx:
+            result = func(*args, **kwargs)
+        executed = len(ctx.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(
+                f"{i}. {q['sql']}" for i, q in enumerate(ctx.captured_queries, start=1)
+            )
+            self.fail(f'{executed} queries executed, budget is {budget}:\n{queries}')
+        return result
+
+    def assertQueryBudget(self, url, budget, method='get', expected_status=200, **kwargs):
+        """Request `url` and check both its status and its query budget."""
+        kwargs.setdefault('format', 'json')
+        response = self.assertMaxQueries(budget, getattr(self.client, method), url, **kwargs)
+        self.assertEqual(response.status_code, expected_status, getattr(response, 'data', None))
+        # The middleware header must agree with what the test captured
+        self.assertLessEqual(int(response['X-DB-Queries']), budget)
+        return response
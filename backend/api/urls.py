@@ -1,7 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested import routers
-from .views import ProjectViewSet, IssueViewSet, CommentViewSet, UserViewSet, health_check
+from .views import (
+    ProjectViewSet, IssueViewSet, CommentViewSet, UserViewSet, DeletionJobViewSet, ResponseCacheStatsView,
+    DashboardPageView, ProjectIssuesPageView, MySummaryView,
+)
+from .async_views import async_read, health_check, project_events
 
 # Top-level router for projects and issues
 router = DefaultRouter()
@@ -9,6 +13,7 @@ router.register(r'projects', ProjectViewSet, basename='project')
 router.register(r'issues', IssueViewSet, basename='issue')
 router.register(r'comments', CommentViewSet, basename='comment')
 router.register(r'users', UserViewSet, basename='user')
+router.register(r'deletions', DeletionJobViewSet, basename='deletion')
 
 # Nested router for project -> issues (as per requirements: POST /projects/<id>/issues/)
 project_router = routers.NestedDefaultRouter(router, r'projects', lookup='project')
@@ -18,8 +23,23 @@ project_router.register(r'issues', IssueViewSet, basename='project-issues')
 issue_router = routers.NestedDefaultRouter(router, r'issues', lookup='issue')
 issue_router.register(r'comments', CommentViewSet, basename='issue-comments')
 
+# The read-heavy lists go through async views first (see api/async_views.py);
+# these patterns shadow the router's list routes, other routes are unchanged
+async_list_routes = [
+    path('projects/', async_read(ProjectViewSet, {'get': 'list', 'post': 'create'})),
+    path('issues/', async_read(IssueViewSet, {'get': 'list', 'post': 'create'})),
+    path('projects/<project_pk>/issues/', async_read(IssueViewSet, {'get': 'list', 'post': 'create'})),
+]
+
 urlpatterns = [
     path('health/', health_check, name='health_check'),
+    path('cache/stats/', ResponseCacheStatsView.as_view(), name='cache_stats'),
+    path('projects/<pk>/events/', project_events, name='project_events'),
+    # One request per page instead of one per resource
+    path('pages/dashboard/', DashboardPageView.as_view(), name='dashboard_page'),
+    path('pages/projects/<pk>/issues/', ProjectIssuesPageView.as_view(), name='project_issues_page'),
+    path('me/summary/', MySummaryView.as_view(), name='my_summary'),
+    *async_list_routes,
     path('', include(router.urls)),
     path('', include(project_router.urls)),
     path('', include(issue_router.urls)),
@@ -1,20 +1,41 @@
 from rest_framework import viewsets, permissions, status
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
-from .models import Project, Issue, Comment, UserProfile
-from django.db.models import Count, Q
-from .serializers import ProjectSerializer, IssueSerializer, CommentSerializer, RegisterSerializer
+from .models import (
+    Project, Issue, Comment, UserProfile, CacheVersion, ChangeLog, DeletionJob, IssueStatusTransition,
+)
+from django.db.models import Count, F, Q, Subquery
+from .serializers import (
+    ProjectSerializer, IssueSerializer, CommentSerializer, DeletionJobSerializer, RegisterSerializer, parse_expand,
+)
+from .search import search_issues
+from .summary import issue_summary, DEFAULT_PER_BUCKET, MAX_PER_BUCKET
+from .stats import issue_flow, default_flow_range, MAX_FLOW_DAYS
+from .deletion import schedule_project_deletion, schedule_issue_deletion
+from .pagination import CursorOrPageNumberPagination
+from .auth import get_auth_context
+from .cache import response_cache
+from .renderers import CSVRenderer, ExportEncoder, NDJSONRenderer
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date
+import csv
+import hashlib
+import io
+import json
+from urllib.parse import urlsplit
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.models import User
 from rest_framework import serializers
-from django.db.models import Q
-
-@api_view(['GET'])
-def health_check(request):
-    """Simple health check endpoint"""
-    return Response({"status": "Backend is live", "message": "Bug Reporting System API is running!"})
 
 class UserSerializer(serializers.ModelSerializer):
     role = serializers.CharField(source='profile.role', read_only=True)
@@ -36,7 +57,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         # Write permissions only to the owner of the project
-        return obj.owner == request.user
+        return get_auth_context(request).owns_project(obj)
 
 class IssueCreateOrReadPermission(permissions.BasePermission):
     """
@@ -59,23 +80,23 @@ class IssueCreateOrReadPermission(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        user = request.user
-        if not user.is_authenticated:
+        auth = get_auth_context(request)
+        if not auth.is_authenticated:
             return False
         
         # DELETE - only project owner
         if request.method == 'DELETE':
-            return obj.project.owner == user
+            return auth.owns_issue_project(obj)
         
         # For PUT/PATCH - check what's being updated
         if request.method in ['PUT', 'PATCH']:
             # Check if trying to update status or assignee - only project owner can do this
             request_data = getattr(request, 'data', {})
             if 'status' in request_data or 'assignee' in request_data or 'assignee_id' in request_data:
-                return obj.project.owner == user
+                return auth.owns_issue_project(obj)
             
             # Otherwise, allow reporter to update their own issue details
-            return obj.reporter == user or obj.project.owner == user
+            return auth.reported(obj) or auth.owns_issue_project(obj)
         
         return False
 
@@ -91,10 +112,10 @@ class CanCreateProjects(permissions.BasePermission):
             return False
             
         if request.method == 'POST':
-            profile = getattr(request.user, 'profile', None)
-            if not profile:
+            auth = get_auth_context(request)
+            if not auth.has_profile:
                 return False
-            return profile.can_create_projects or profile.is_admin
+            return auth.can_create_projects or auth.is_admin
         
         return True
 
@@ -106,23 +127,20 @@ class CanDeleteIssues(permissions.BasePermission):
         if request.method != 'DELETE':
             return True
             
-        if not request.user.is_authenticated:
-            return False
-            
-        profile = getattr(request.user, 'profile', None)
-        if not profile:
+        auth = get_auth_context(request)
+        if not auth.is_authenticated or not auth.has_profile:
             return False
             
         # Admin can delete any issue
-        if profile.is_admin:
+        if auth.is_admin:
             return True
             
         # Project owner can delete issues in their projects
-        if obj.project.owner == request.user:
+        if auth.owns_issue_project(obj):
             return True
             
         # Users with delete permission can delete their own reported issues
-        if profile.can_delete_issues and obj.reporter == request.user:
+        if auth.can_delete_issues and auth.reported(obj):
             return True
         
         return False
@@ -137,44 +155,374 @@ class CanAssignIssues(permissions.BasePermission):
             
         # Check if trying to assign/reassign issue
         if 'assignee' in request.data or 'assignee_id' in request.data:
-            profile = getattr(request.user, 'profile', None)
-            if not profile:
+            auth = get_auth_context(request)
+            if not auth.has_profile:
                 return False
                 
             # Admin can assign any issue
-            return profile.is_admin or profile.can_assign_issues or profile.can_manage_all_projects
+            return auth.is_admin or auth.can_assign_issues or auth.can_manage_all_projects
         
         return True
 
-class ProjectViewSet(viewsets.ModelViewSet):
+def expanded_related(expand, expand_related):
+    """The select_related paths in `expand_related` whose ?expand= names are in `expand`."""
+    related = []
+    for name, path in expand_related.items():
+        node = expand
+        for part in name.split('.'):
+            node = node.get(part) if node is not None else None
+        if node is not None:
+            related.append(path)
+    return related
+
+
+class ExpandableFieldsViewMixin:
+    """
+    Passes ?fields= and ?expand= to the serializer (see ExpandableFieldsMixin)
+    and joins only the relations the response will render. `expand_related`
+    maps an ?expand= name to the select_related path it needs.
+    """
+    expand_related = {}
+
+    def get_expand(self):
+        request = getattr(self, 'request', None)
+        return parse_expand(request.query_params.get('expand', '') if request else '')
+
+    def get_select_related(self):
+        return expanded_related(self.get_expand(), self.expand_related)
+
+    def select_expanded(self, queryset):
+        related = self.get_select_related()
+        # select_related() with no arguments would follow every foreign key
+        return queryset.select_related(*related) if related else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        params = self.request.query_params
+        kwargs.setdefault('fields', params.get('fields'))
+        kwargs.setdefault('expand', self.get_expand())
+        return super().get_serializer(*args, **kwargs)
+
+
+def response_cache_key(request, versions):
+    """Response cache key: host, path, query string and the scope versions."""
+    return (
+        request.get_host(),
+        request.path,
+        tuple(sorted((name, tuple(values)) for name, values in request.GET.lists())),
+        tuple(versions),
+    )
+
+
+class CachedResponseMixin:
+    """
+    Serves list and retrieve from the in-process response cache.
+
+    Keys combine host, path, query string and the current versions of
+    `get_cache_scopes()` (one query); writes bump those versions, so an
+    entry is never served once the data behind it has changed. Reads are
+    public, so responses do not vary by user. Only JSON is cached. Every
+    response carries X-Cache: HIT or MISS.
+    """
+
+    def get_cache_scopes(self):
+        return [CacheVersion.GLOBAL, CacheVersion.USERS]
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not response_cache.enabled or request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        # Set by the async front (api/async_views.py) when it already missed
+        key = getattr(request, 'response_cache_key', None)
+        if key is None:
+            scopes = self.get_cache_scopes()
+            versions = CacheVersion.current(scopes)
+            key = response_cache_key(request, [versions[scope] for scope in scopes])
+            entry = response_cache.get(key)
+            if entry is not None:
+                content, content_type = entry
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+                return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response = self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            response_cache.set(key, response.content, response['Content-Type'])
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+def users_version():
+    """Subquery for the `users` cache version, to fold user changes into an ETag."""
+    return Subquery(CacheVersion.objects.filter(scope=CacheVersion.USERS).values('version')[:1])
+
+
+def conditional_validators(request, renderer_format, markers):
+    """
+    (etag, last_modified) for a response built from `markers`.
+
+    Last-Modified has whole-second precision, so it is left out (None) while
+    the marker's second is still running: a later write in that second would
+    keep the same value and If-Modified-Since would answer a stale 304. The
+    ETag hashes the full marker and covers those responses.
+    """
+    last_modified = int(markers[0].timestamp())
+    if last_modified >= int(timezone.now().timestamp()):
+        last_modified = None
+    query = sorted((name, tuple(values)) for name, values in request.GET.lists())
+    digest = hashlib.md5(repr((query, renderer_format, markers)).encode()).hexdigest()
+    return f'W/"{digest}"', last_modified
+
+
+def set_conditional_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Let clients store the body but always revalidate it
+    patch_cache_control(response, private=True, no_cache=True)
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified on list and retrieve.
+
+    `get_modification_markers_query()` returns a small indexed values_list
+    query whose first row is (last_modified, *extra), or None when the
+    endpoint has no marker; `clean_markers()` may post-process that row.
+    The ETag hashes the markers with the query string (fields/expand change
+    the body). A matching If-None-Match or If-Modified-Since is answered
+    with 304 before the main queryset runs or anything is serialized.
+    """
+
+    def get_modification_markers_query(self):
+        return None
+
+    def clean_markers(self, row):
+        return row
+
+    def get_modification_markers(self):
+        # Set by the async front (api/async_views.py), which already read them
+        if hasattr(self.request, 'modification_markers'):
+            return self.request.modification_markers
+        query = self.get_modification_markers_query()
+        return self.clean_markers(query.first()) if query is not None else None
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        markers = self.get_modification_markers()
+        if not markers:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = conditional_validators(request, request.accepted_renderer.format, markers)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            set_conditional_headers(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+
+def deletion_accepted(request, job):
+    """202 Accepted for a scheduled deletion, pointing at its progress."""
+    location = request.build_absolute_uri(reverse('deletion-detail', args=[job.pk]))
+    return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+
+class ProjectViewSet(ConditionalGetMixin, CachedResponseMixin, ExpandableFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     # Enable pagination for projects (uses default pagination)
     # To customize, import and set a pagination class here
     pagination_class = None  # Remove this line to use default pagination
+    expand_related = {'owner': 'owner__profile'}
 
     def get_queryset(self):
-        # Return ALL projects for everyone to see (public projects)
-        queryset = Project.objects.all().annotate(
-            issue_count=Count('issues'),
-            open_issues=Count('issues', filter=Q(issues__status='open')),
-            in_progress_issues=Count('issues', filter=Q(issues__status='in_progress')),
-            closed_issues=Count('issues', filter=Q(issues__status='closed')),
-        ).order_by('-created_at')
+        # Return ALL projects for everyone to see (public projects).
+        # Issue counts are denormalized columns on Project, no aggregation needed.
+        queryset = self.select_expanded(Project.objects.live().order_by('-created_at'))
         
         return queryset
 
+    def get_modification_markers_query(self):
+        pk = str(self.kwargs.get('pk', ''))
+        if self.action != 'retrieve' or not pk.isdigit():
+            return None
+        return Project.objects.live().filter(pk=pk).values_list('updated_at', users_version())
+
+    def get_cache_scopes(self):
+        # A single project changes with its own version; the list with any
+        # project or issue counter, not with every issue edit
+        if self.action == 'retrieve' and str(self.kwargs.get('pk', '')).isdigit():
+            return [CacheVersion.project_scope(self.kwargs['pk']), CacheVersion.USERS]
+        return [CacheVersion.PROJECTS, CacheVersion.USERS]
+
     def perform_create(self, serializer):
         # Automatically set the owner to the current user when creating
         serializer.save(owner=self.request.user)
 
-class IssueViewSet(viewsets.ModelViewSet):
+    def destroy(self, request, *args, **kwargs):
+        # Hidden at once; its issues and comments are deleted by the worker
+        job = schedule_project_deletion(self.get_object(), request.user)
+        return deletion_accepted(request, job)
+
+    CHANGES_PAGE_SIZE = 500
+    CHANGE_COMMENT_FIELDS = ['id', 'content', 'created_at', 'issue', 'author', 'parent_comment']
+
+    @action(detail=True, methods=['get'])
+    def changes(self, request, pk=None):
+        """
+        GET /projects/<id>/changes/?since=<cursor>
+
+        Issues and comments of the project written after `cursor`, as their
+        current state, plus the ids of those deleted since. Follow `cursor`
+        while `has_more` is true. Without ?since= only the current cursor is
+        returned: read it before loading a list, then poll from it. Comments
+        are flat (no replies); ?expand= and ?fields= work as on the lists.
+        Reads the (project_id, id) index of ChangeLog, so a poll costs what
+        changed rather than the size of the project.
+
+        Changes are kept for CHANGE_LOG_RETENTION_DAYS. An older cursor gets
+        `resync: true` and the current cursor: reload the lists, then poll
+        from that cursor.
+        """
+        if not str(pk).isdigit():
+            raise NotFound()
+        since = request.query_params.get('since')
+        if since is None:
+            return self.changes_response(ChangeLog.latest(pk, self.get_pruned_through(pk)))
+        if not since.isdigit():
+            raise serializers.ValidationError({'since': 'Must be a cursor returned by this endpoint.'})
+
+        changes = list(
+            ChangeLog.objects.filter(project_id=pk, id__gt=int(since))
+            .order_by('id')
+            .values_list('id', 'model', 'object_id', 'deleted')[:self.CHANGES_PAGE_SIZE + 1]
+        )
+        # Read after the changes: a prune committed in between shows up here
+        pruned_through = self.get_pruned_through(pk)
+        if int(since) < pruned_through:
+            return self.changes_response(ChangeLog.latest(pk, pruned_through), resync=True)
+        has_more = len(changes) > self.CHANGES_PAGE_SIZE
+        changes = changes[:self.CHANGES_PAGE_SIZE]
+
+        # The last change of each object wins
+        latest = {(model, object_id): deleted for _, model, object_id, deleted in changes}
+        upserted = {ChangeLog.ISSUE: [], ChangeLog.COMMENT: []}
+        deleted = {ChangeLog.ISSUE: [], ChangeLog.COMMENT: []}
+        for (model, object_id), is_deleted in latest.items():
+            (deleted if is_deleted else upserted)[model].append(object_id)
+
+        # Objects missing here were deleted or moved later; their tombstones follow
+        expand = self.get_expand()
+        fields = request.query_params.get('fields')
+        issues = comments = []
+        if upserted[ChangeLog.ISSUE]:
+            issues = Issue.objects.live().filter(project_id=pk, id__in=upserted[ChangeLog.ISSUE]).order_by('id')
+            related = expanded_related(expand, IssueViewSet.expand_related)
+            issues = issues.select_related(*related) if related else issues
+        if upserted[ChangeLog.COMMENT]:
+            comments = Comment.objects.live().filter(
+                issue__project_id=pk, id__in=upserted[ChangeLog.COMMENT]
+            ).order_by('id')
+            related = expanded_related(expand, CommentViewSet.expand_related)
+            comments = comments.select_related(*related) if related else comments
+
+        context = self.get_serializer_context()
+        comment_fields = self.CHANGE_COMMENT_FIELDS
+        if fields:
+            comment_fields = [name for name in fields.split(',') if name in comment_fields] or ['id']
+        return Response({
+            'cursor': changes[-1][0] if changes else int(since),
+            'has_more': has_more,
+            'resync': False,
+            'issues': IssueSerializer(issues, many=True, context=context, fields=fields, expand=expand).data,
+            'comments': CommentSerializer(
+                comments, many=True, context=context, fields=comment_fields, expand=expand
+            ).data,
+            'deleted': {
+                'issues': sorted(deleted[ChangeLog.ISSUE]),
+                'comments': sorted(deleted[ChangeLog.COMMENT]),
+            },
+        })
+
+    def get_pruned_through(self, pk):
+        """The project's changes_pruned_through; 404 unless the project is live."""
+        pruned_through = Project.objects.live().filter(pk=pk).values_list('changes_pruned_through', flat=True).first()
+        if pruned_through is None:
+            raise NotFound()
+        return pruned_through
+
+    def changes_response(self, cursor, resync=False):
+        """A /changes/ response with no changes in it."""
+        return Response({
+            'cursor': cursor, 'has_more': False, 'resync': resync,
+            'issues': [], 'comments': [], 'deleted': {'issues': [], 'comments': []},
+        })
+
+    def get_stats_date(self, name, default):
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return default
+        try:
+            date = parse_date(value)
+        except ValueError:
+            date = None
+        if date is None:
+            raise serializers.ValidationError({name: 'Must be a date (YYYY-MM-DD).'})
+        return date
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        GET /projects/<id>/stats/?start=YYYY-MM-DD&end=YYYY-MM-DD
+
+        Daily issue flow of the project (default: the last 30 days, at most
+        366): per day, the issues in each status at its end ('counts') and
+        those that entered and left each status. Served from the
+        DailyIssueStats rollups (see api/stats.py), never from issue rows.
+        """
+        if not str(pk).isdigit() or not Project.objects.live().filter(pk=pk).exists():
+            raise NotFound()
+        default_start, default_end = default_flow_range()
+        end = self.get_stats_date('end', default_end)
+        start = self.get_stats_date('start', end - (default_end - default_start))
+        if start > end:
+            raise serializers.ValidationError({'start': 'Must not be after end.'})
+        if (end - start).days >= MAX_FLOW_DAYS:
+            raise serializers.ValidationError({'start': f'The range is limited to {MAX_FLOW_DAYS} days.'})
+        return Response(issue_flow(int(pk), start, end))
+
+class IssueViewSet(ConditionalGetMixin, CachedResponseMixin, ExpandableFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = IssueSerializer
     permission_classes = [IssueCreateOrReadPermission]
+    # Page numbers by default, keyset pages with ?pagination=cursor
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ('-created_at', '-id')
+    expand_related = {
+        'project': 'project',
+        'project.owner': 'project__owner__profile',
+        'reporter': 'reporter__profile',
+        'assignee': 'assignee__profile',
+    }
 
     def get_queryset(self):
         # Return ALL issues for everyone to see (public dashboard)
-        queryset = Issue.objects.select_related('project','reporter','assignee').all().order_by('-created_at')
+        queryset = self.select_expanded(Issue.objects.live().order_by('-created_at', '-id'))
+        if self.request.method not in permissions.SAFE_METHODS:
+            # Ownership checks read the project owner from the same row
+            queryset = queryset.annotate(project_owner_id=F('project__owner_id'))
         
         project_id = self.kwargs.get('project_pk')
         
@@ -188,12 +536,10 @@ class IssueViewSet(viewsets.ModelViewSet):
 
             queryset = queryset.filter(project_id=project_id_int)
         
-        # Search functionality
+        # Full-text search, ranked by relevance (see api/search.py)
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            )
+            queryset = search_issues(queryset, search)
         
         # Filter by status and priority
         status_filter = self.request.query_params.get('status', None)
@@ -206,12 +552,42 @@ class IssueViewSet(viewsets.ModelViewSet):
         
         return queryset
 
+    def get_modification_markers_query(self):
+        project_id = str(self.kwargs.get('project_pk', ''))
+        if project_id and not project_id.isdigit():
+            return None
+        if self.action == 'list' and project_id:
+            # Every issue write in a project touches Project.updated_at
+            return Project.objects.live().filter(pk=project_id).values_list('updated_at', users_version())
+        pk = str(self.kwargs.get('pk', ''))
+        if self.action != 'retrieve' or not pk.isdigit():
+            return None
+        issues = Issue.objects.live().filter(pk=pk)
+        if project_id:
+            issues = issues.filter(project_id=project_id)
+        if 'project' in self.get_expand():
+            # The embedded project (and its counters) changes with the project
+            return issues.values_list('updated_at', 'project__updated_at', users_version())
+        return issues.values_list('updated_at', users_version())
+
+    def clean_markers(self, row):
+        if row and len(row) == 3:
+            # (issue, project, users): the newer of the two timestamps
+            return (max(row[0], row[1]), row[2])
+        return row
+
+    def get_cache_scopes(self):
+        # Issues of one project only change with that project's version
+        if self.action == 'list' and str(self.kwargs.get('project_pk', '')).isdigit():
+            return [CacheVersion.project_scope(self.kwargs['project_pk']), CacheVersion.USERS]
+        return super().get_cache_scopes()
+
     def perform_create(self, serializer):
         # Handle nested creation under projects (POST /projects/<id>/issues/)
         project_id = self.kwargs.get('project_pk')
         if project_id:
             # Just ensure the project exists (no ownership check for creation)
-            project = get_object_or_404(Project, pk=project_id)
+            project = get_object_or_404(Project.objects.live(), pk=project_id)
             serializer.save(project=project, reporter=self.request.user)
         else:
             # Handle top-level creation if project is provided in data
@@ -222,38 +598,470 @@ class IssueViewSet(viewsets.ModelViewSet):
         # Just save the update
         serializer.save()
 
+    def destroy(self, request, *args, **kwargs):
+        job = schedule_issue_deletion(self.get_object(), request.user)
+        if job is None:
+            # Scheduled by a concurrent request since get_object() read it
+            raise NotFound()
+        return deletion_accepted(request, job)
+
     def get_permissions(self):
         # Use our new permission class for all actions
         return [IssueCreateOrReadPermission()]
 
-class CommentViewSet(viewsets.ModelViewSet):
+    EXPORT_COLUMNS = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('status', 'status'),
+        ('priority', 'priority'),
+        ('project_id', 'project_id'),
+        ('reporter', 'reporter__username'),
+        ('assignee', 'assignee__username'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    )
+    EXPORT_CHUNK_SIZE = 2000
+
+    @action(detail=False, methods=['get'], url_path='export', renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, *args, **kwargs):
+        """
+        GET /projects/<id>/issues/export/?format=csv|ndjson
+
+        Every issue matching the list filters (search, status, priority),
+        newest first, streamed as it is read. Rows come from values_list()
+        through iterator(), a server-side cursor on PostgreSQL, so memory
+        stays flat and no serializer runs. The header (CSV) is sent before
+        the query starts.
+        """
+        project_id = self.kwargs.get('project_pk')
+        if project_id and not (str(project_id).isdigit() and Project.objects.live().filter(pk=project_id).exists()):
+            raise NotFound()
+        names = [name for name, _ in self.EXPORT_COLUMNS]
+        rows = (
+            self.get_queryset()
+            .order_by(*self.cursor_ordering)
+            .values_list(*(field for _, field in self.EXPORT_COLUMNS))
+            .iterator(chunk_size=self.EXPORT_CHUNK_SIZE)
+        )
+        renderer = request.accepted_renderer
+        content = self.stream_ndjson(names, rows) if renderer.format == 'ndjson' else self.stream_csv(names, rows)
+        response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+        filename = f'project-{project_id}-issues' if project_id else 'issues'
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{renderer.format}"'
+        return response
+
+    def stream_csv(self, names, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        # The header goes out before the query runs
+        yield self.drain(buffer)
+        for count, row in enumerate(rows, start=1):
+            writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
+            if count % self.EXPORT_CHUNK_SIZE == 0:
+                yield self.drain(buffer)
+        if buffer.tell():
+            yield self.drain(buffer)
+
+    @staticmethod
+    def drain(buffer):
+        content = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return content
+
+    def stream_ndjson(self, names, rows):
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(dict(zip(names, row)), cls=ExportEncoder) + '\n')
+            if len(lines) == self.EXPORT_CHUNK_SIZE:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+    MAX_BULK_ITEMS = 500
+    BULK_UPDATE_FIELDS = ('status', 'priority', 'assignee_id')
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """
+        POST   /projects/<id>/issues/bulk/  [{title, description, status, priority, assignee_id}, ...]
+        PATCH  /projects/<id>/issues/bulk/  [{id, status?, priority?, assignee_id?}, ...]
+               or {"ids": [...], "status": ..., ...} to apply one change to many issues
+
+        Items may also be wrapped as {"issues": [...]}. Permissions are checked
+        once for the project; every item that cannot be applied is reported
+        in `errors` with its index and the rest are applied. Responds 207
+        when only some items were applied and 400 when none were.
+        """
+        project_id = self.kwargs.get('project_pk')
+        if not project_id:
+            return Response(
+                {'detail': 'Bulk operations are only available under /projects/<id>/issues/bulk/.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        project = get_object_or_404(Project.objects.live().only('id', 'owner_id'), pk=project_id)
+
+        if request.method == 'POST':
+            items = self.get_bulk_items(request.data)
+            applied, errors = self.bulk_create_issues(project, items)
+            success_status = status.HTTP_201_CREATED
+        elif isinstance(request.data, dict) and 'ids' in request.data:
+            changes = {k: v for k, v in request.data.items() if k != 'ids'}
+            ids = request.data['ids']
+            if not isinstance(ids, list):
+                raise serializers.ValidationError({'ids': 'Expected a list of issue ids.'})
+            items = [{'id': pk, **changes} for pk in ids]
+            if len(items) > self.MAX_BULK_ITEMS:
+                raise serializers.ValidationError({'ids': f'At most {self.MAX_BULK_ITEMS} issues per request.'})
+            applied, errors = self.bulk_update_issues(project, items)
+            success_status = status.HTTP_200_OK
+        else:
+            items = self.get_bulk_items(request.data)
+            applied, errors = self.bulk_update_issues(project, items)
+            success_status = status.HTTP_200_OK
+
+        if errors and not applied:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = success_status
+        return Response({
+            'results': self.get_serializer(applied, many=True).data,
+            'errors': errors,
+        }, status=response_status)
+
+    def get_bulk_items(self, data):
+        items = data.get('issues') if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            raise serializers.ValidationError({'issues': 'Expected a non-empty list of issues.'})
+        if len(items) > self.MAX_BULK_ITEMS:
+            raise serializers.ValidationError({'issues': f'At most {self.MAX_BULK_ITEMS} issues per request.'})
+        return items
+
+    @staticmethod
+    def parse_assignee_id(value):
+        """
+        An assignee_id read the way IssueSerializer reads it: "2" and 2 are
+        both 2, and 0, "" or null clear the assignee (None).
+        """
+        if value in (0, '', None):
+            return None
+        return serializers.IntegerField().run_validation(value)
+
+    def existing_user_ids(self, ids):
+        ids = {user_id for user_id in ids if user_id}
+        return set(User.objects.filter(id__in=ids).values_list('id', flat=True)) if ids else set()
+
+    def bulk_create_issues(self, project, items):
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            serializer = IssueSerializer(data=item if isinstance(item, dict) else {})
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        # assignee_id is an IntegerField: "2" and 2 both validate to 2
+        user_ids = self.existing_user_ids(data.get('assignee_id') for _, data in valid)
+
+        issues = []
+        for index, data in valid:
+            assignee_id = data.pop('assignee_id', None) or None
+            if assignee_id is not None and assignee_id not in user_ids:
+                errors.append({'index': index, 'errors': {'assignee_id': ['User with this id does not exist.']}})
+                continue
+            issues.append(Issue(**data, assignee_id=assignee_id, project_id=project.id, reporter=self.request.user))
+        errors.sort(key=lambda error: error['index'])
+
+        if issues:
+            with transaction.atomic():
+                # bulk_create skips Issue.save(): maintain counters, cache versions and the change feed here,
+                # locking in its order (cache versions, then the project row)
+                Issue.objects.bulk_create(issues)
+                deltas = {}
+                for issue in issues:
+                    deltas[issue.status] = deltas.get(issue.status, 0) + 1
+                CacheVersion.bump_projects(project.id, user_ids={
+                    user_id for issue in issues for user_id in (issue.reporter_id, issue.assignee_id)
+                })
+                Project.adjust_issue_counters(project.id, deltas)
+                ChangeLog.record(project.id, ChangeLog.ISSUE, [issue.id for issue in issues])
+                IssueStatusTransition.record([(project.id, issue.id, None, issue.status) for issue in issues])
+        return issues, errors
+
+    def bulk_update_issues(self, project, items):
+        auth = get_auth_context(self.request)
+        is_owner = auth.owns_project(project)
+        requested = []
+        for item in items:
+            if isinstance(item, dict) and 'assignee_id' in item:
+                try:
+                    requested.append(self.parse_assignee_id(item['assignee_id']))
+                except serializers.ValidationError:
+                    pass  # Reported with the item below
+        user_ids = self.existing_user_ids(requested)
+        statuses = dict(Issue.STATUS_CHOICES)
+        priorities = dict(Issue.PRIORITY_CHOICES)
+
+        ids = [item.get('id') for item in items if isinstance(item, dict)]
+        with transaction.atomic():
+            issues = {
+                issue.id: issue
+                for issue in self.select_expanded(Issue.objects.filter(project_id=project.id, deleted_at__isnull=True, id__in=[
+                    pk for pk in ids if isinstance(pk, int) and not isinstance(pk, bool)
+                ])).select_for_update(of=('self',))
+            }
+
+            changed, errors, fields, deltas = {}, [], set(), {}
+            # Reporters and old and new assignees of the changed issues
+            touched_user_ids = set()
+            transitions = []
+            for index, item in enumerate(items):
+                item_errors = {}
+                if not isinstance(item, dict):
+                    errors.append({'index': index, 'errors': {'non_field_errors': ['Expected an object.']}})
+                    continue
+                issue = issues.get(item.get('id'))
+                if issue is None:
+                    errors.append({'index': index, 'errors': {'id': ['No such issue in this project.']}})
+                    continue
+                changes = {k: v for k, v in item.items() if k != 'id'}
+                unknown = set(changes) - set(self.BULK_UPDATE_FIELDS)
+                if unknown or not changes:
+                    item_errors['non_field_errors'] = [
+                        f'Only {", ".join(self.BULK_UPDATE_FIELDS)} can be changed in bulk.'
+                    ]
+                if 'status' in changes and changes['status'] not in statuses:
+                    item_errors['status'] = [f'"{changes["status"]}" is not a valid choice.']
+                if 'priority' in changes and changes['priority'] not in priorities:
+                    item_errors['priority'] = [f'"{changes["priority"]}" is not a valid choice.']
+                if 'assignee_id' in changes:
+                    try:
+                        changes['assignee_id'] = self.parse_assignee_id(changes['assignee_id'])
+                    except serializers.ValidationError as exc:
+                        item_errors['assignee_id'] = exc.detail
+                    else:
+                        if changes['assignee_id'] is not None and changes['assignee_id'] not in user_ids:
+                            item_errors['assignee_id'] = ['User with this id does not exist.']
+                # Same rules as IssueCreateOrReadPermission, evaluated once for the project
+                if not is_owner and ('status' in changes or 'assignee_id' in changes or not auth.reported(issue)):
+                    item_errors['detail'] = ['You do not have permission to perform this action.']
+                if item_errors:
+                    errors.append({'index': index, 'errors': item_errors})
+                    continue
+
+                if 'status' in changes and changes['status'] != issue.status:
+                    deltas[issue.status] = deltas.get(issue.status, 0) - 1
+                    deltas[changes['status']] = deltas.get(changes['status'], 0) + 1
+                    transitions.append((project.id, issue.id, issue.status, changes['status']))
+                touched_user_ids.update((issue.reporter_id, issue.assignee_id))
+                for field, value in changes.items():
+                    setattr(issue, field, value)
+                    fields.add(field)
+                touched_user_ids.add(issue.assignee_id)
+                changed[issue.id] = issue
+
+            if changed:
+                now = timezone.now()
+                for issue in changed.values():
+                    issue.updated_at = now
+                change_sets = {
+                    tuple((field, getattr(issue, field)) for field in sorted(fields))
+                    for issue in changed.values()
+                }
+                if len(change_sets) == 1:
+                    # The same change for every issue: a single UPDATE ... WHERE id IN (...)
+                    Issue.objects.filter(id__in=changed).update(updated_at=now, **dict(change_sets.pop()))
+                else:
+                    Issue.objects.bulk_update(changed.values(), [*fields, 'updated_at'])
+                # bulk writes skip Issue.save(): maintain counters, cache versions and the change feed here,
+                # locking in its order (cache versions, then the project row)
+                CacheVersion.bump_projects(project.id, user_ids=touched_user_ids)
+                Project.adjust_issue_counters(project.id, deltas)
+                ChangeLog.record(project.id, ChangeLog.ISSUE, list(changed))
+                IssueStatusTransition.record(transitions)
+        return list(changed.values()), errors
+
+def thread_filter(roots, max_depth=None, exact_depth=None):
+    """
+    Q matching the subtrees below `roots` (excluding the roots themselves).
+    Each root contributes one range on the indexed path column; depths are
+    relative to the root.
+    """
+    q = Q()
+    for root in roots:
+        term = Comment.subtree_filter(root.path) & Q(depth__gt=root.depth)
+        if max_depth is not None:
+            term &= Q(depth__lte=root.depth + max_depth)
+        if exact_depth is not None:
+            term &= Q(depth=root.depth + exact_depth)
+        q |= term
+    return q
+
+
+def attach_comment_threads(roots, comments=None, max_depth=None, reply_counts=None, select_related=()):
+    """
+    Assemble reply trees in memory for the given comments.
+
+    `comments` may already hold the whole thread (e.g. every comment of an
+    issue); otherwise the subtrees of all roots are loaded in a single query.
+    Every node gets a `thread_replies` list that CommentSerializer renders
+    without touching the database again. With `max_depth`, replies below the
+    limit are not loaded; nodes on the limit get their real reply count from
+    `reply_counts` (loaded with one grouped query when not given).
+    `select_related` applies to the subtree query.
+    """
+    if not roots:
+        return roots
+    if comments is None:
+        comments = Comment.objects.filter(thread_filter(roots, max_depth=max_depth)).order_by('path')
+        if select_related:
+            comments = comments.select_related(*select_related)
+    if max_depth is not None and reply_counts is None:
+        reply_counts = dict(
+            Comment.objects.filter(thread_filter(roots, exact_depth=max_depth + 1))
+            .values_list('parent_comment_id')
+            .annotate(n=Count('id'))
+            .order_by()
+        )
+
+    children = {}
+    for comment in comments:
+        if comment.parent_comment_id is not None:
+            children.setdefault(comment.parent_comment_id, []).append(comment)
+
+    stack = [(root, 0) for root in roots]
+    while stack:
+        node, level = stack.pop()
+        node.thread_replies = children.get(node.id, [])
+        if max_depth is not None and level == max_depth:
+            node.reply_total = reply_counts.get(node.id, 0)
+        stack.extend((reply, level + 1) for reply in node.thread_replies)
+    return roots
+
+
+class CommentViewSet(ConditionalGetMixin, ExpandableFieldsViewMixin, viewsets.ModelViewSet):
+    """
+    Comments are returned as threads. Optional query parameters:
+    - root: only return the subtree below this comment (nested issue route)
+    - max_depth: only include replies up to this many levels below each root
+    """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ('created_at', 'id')
+    expand_related = {'author': 'author__profile'}
 
     def get_queryset(self):
         # Return ALL comments for everyone to see (public dashboard)
-        queryset = Comment.objects.select_related('issue','author').prefetch_related('replies__author').all().order_by('created_at')
+        queryset = self.select_expanded(Comment.objects.live().order_by('created_at', 'id'))
         
         issue_id = self.kwargs.get('issue_pk')
         if issue_id:
             queryset = queryset.filter(issue_id=issue_id)
         
-        # Only return top-level comments (no parent) for the main list
-        # Replies are included via the serializer
+        # Any comment can be fetched with its subtree; everything else only
+        # works on top-level comments. Replies are included via the serializer.
+        if self.action == 'retrieve':
+            return queryset
         return queryset.filter(parent_comment__isnull=True)
 
+    def get_modification_markers_query(self):
+        issue_id = str(self.kwargs.get('issue_pk', ''))
+        if self.action != 'list' or not issue_id.isdigit():
+            return None
+        # Comment writes touch Issue.comments_updated_at
+        return Issue.objects.live().filter(pk=issue_id).values_list('comments_updated_at', users_version())
+
+    def get_max_depth(self):
+        max_depth = self.request.query_params.get('max_depth')
+        if max_depth in (None, ''):
+            return None
+        try:
+            max_depth = int(max_depth)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'max_depth': 'Must be an integer.'})
+        if max_depth < 0:
+            raise serializers.ValidationError({'max_depth': 'Must not be negative.'})
+        return max_depth
+
+    def get_thread_queryset(self, issue_id):
+        """Every comment of an issue; ordered by path this is the (issue, path) index order."""
+        return self.select_expanded(Comment.objects.live().filter(issue_id=issue_id))
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(self.list_threads, request, *args, **kwargs)
+
+    def list_threads(self, request, *args, **kwargs):
+        max_depth = self.get_max_depth()
+        issue_id = self.kwargs.get('issue_pk')
+        if issue_id:
+            # The whole (sub)thread comes from one range scan on (issue, path);
+            # roots are paginated in memory.
+            thread = self.get_thread_queryset(issue_id)
+            root_id = request.query_params.get('root')
+            if root_id:
+                if not root_id.isdigit():
+                    raise serializers.ValidationError({'root': 'Must be a comment id.'})
+                root = get_object_or_404(thread, pk=root_id)
+                comments = thread.filter(Comment.subtree_filter(root.path))
+                base_depth = root.depth
+            else:
+                comments = thread
+                base_depth = 0
+
+            reply_counts = None
+            if max_depth is not None:
+                comments = comments.filter(depth__lte=base_depth + max_depth)
+                beyond = thread.filter(depth=base_depth + max_depth + 1)
+                if root_id:
+                    beyond = beyond.filter(Comment.subtree_filter(root.path))
+                reply_counts = dict(
+                    beyond.values_list('parent_comment_id').annotate(n=Count('id')).order_by()
+                )
+
+            comments = list(comments.order_by('path'))
+            roots = [c for c in comments if c.depth == base_depth]
+        else:
+            comments = None
+            reply_counts = None
+            roots = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(roots)
+        if page is not None:
+            attach_comment_threads(page, comments, max_depth, reply_counts, self.get_select_related())
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        roots = attach_comment_threads(list(roots), comments, max_depth, reply_counts, self.get_select_related())
+        serializer = self.get_serializer(roots, many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        attach_comment_threads([instance], max_depth=self.get_max_depth(), select_related=self.get_select_related())
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         issue_id = self.kwargs.get('issue_pk')
         # Just ensure the issue exists (no ownership check)
-        issue = get_object_or_404(Issue, pk=issue_id)
+        issue = get_object_or_404(Issue.objects.live(), pk=issue_id)
         
         # Check if this is a reply to another comment
         parent_comment_id = self.request.data.get('parent_comment')
         parent_comment = None
         if parent_comment_id:
             parent_comment = get_object_or_404(Comment, pk=parent_comment_id, issue=issue)
+            if parent_comment.depth >= Comment.MAX_DEPTH:
+                raise serializers.ValidationError({'parent_comment': 'Replies cannot be nested any deeper.'})
         
-        serializer.save(issue=issue, author=self.request.user, parent_comment=parent_comment)
+        comment = serializer.save(issue=issue, author=self.request.user, parent_comment=parent_comment)
+        # A new comment has no replies yet
+        comment.thread_replies = []
 
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
@@ -265,9 +1073,8 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     def update_role(self, request, pk=None):
         """Update user role - admin only"""
         user = self.get_object()
-        profile = getattr(request.user, 'profile', None)
         
-        if not profile or not profile.is_admin:
+        if not get_auth_context(request).is_admin:
             return Response(
                 {'error': 'Only administrators can update user roles'}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -283,29 +1090,8 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         # Update role and permissions
         role = request.data.get('role')
         if role and role in dict(UserProfile.ROLE_CHOICES):
-            user_profile.role = role
-            
             # Auto-set permissions based on role
-            if role == 'admin':
-                user_profile.can_create_projects = True
-                user_profile.can_delete_issues = True
-                user_profile.can_assign_issues = True
-            elif role == 'project_manager':
-                user_profile.can_create_projects = True
-                user_profile.can_delete_issues = True
-                user_profile.can_assign_issues = True
-            elif role == 'developer':
-                user_profile.can_create_projects = True
-                user_profile.can_delete_issues = False
-                user_profile.can_assign_issues = False
-            elif role == 'tester':
-                user_profile.can_create_projects = False
-                user_profile.can_delete_issues = False
-                user_profile.can_assign_issues = False
-            elif role == 'guest':
-                user_profile.can_create_projects = False
-                user_profile.can_delete_issues = False
-                user_profile.can_assign_issues = False
+            user_profile.apply_role(role)
         
         # Allow manual permission overrides
         for field in ['can_create_projects', 'can_delete_issues', 'can_assign_issues']:
@@ -318,6 +1104,21 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
+class DeletionJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Progress of scheduled project and issue deletions (see api/deletion.py).
+    Users see the jobs they requested; admins see all of them.
+    """
+    serializer_class = DeletionJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = DeletionJob.objects.order_by('-id')
+        if get_auth_context(self.request).is_admin:
+            return queryset
+        return queryset.filter(requested_by=self.request.user)
+
+
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -333,9 +1134,183 @@ class RegisterView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
+class ResponseCacheStatsView(APIView):
+    """Response cache metrics for this process - admin only"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if not get_auth_context(request).is_admin:
+            return Response(
+                {'error': 'Only administrators can view cache statistics'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response(response_cache.stats())
+
+
 class CurrentUserView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
         serializer = UserSerializer(request.user)
         return Response(serializer.data)
+
+
+def attach_users(objects, field_names, users):
+    """
+    Point the user foreign keys `field_names` of `objects` at the already
+    loaded `users` ({id: user}), so serializing them runs no query.
+    """
+    if not objects:
+        return
+    for name in field_names:
+        field = objects[0]._meta.get_field(name)
+        for obj in objects:
+            user_id = getattr(obj, field.attname)
+            if user_id in users:
+                field.set_cached_value(obj, users[user_id])
+
+
+def load_users(users, user_ids):
+    """Add the users in `user_ids` missing from `users` ({id: user}), with profiles, in one query."""
+    missing = {user_id for user_id in user_ids if user_id is not None and user_id not in users}
+    if missing:
+        users.update((user.id, user) for user in User.objects.select_related('profile').filter(id__in=missing))
+    return users
+
+
+class DashboardPageView(APIView):
+    """
+    GET /api/pages/dashboard/ - everything dashboard.js renders, in one
+    request: {user, projects}. Same shapes as /auth/user/ and /projects/.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        projects = Project.objects.live().order_by('-created_at')
+        return Response({
+            'user': UserSerializer(request.user).data,
+            'projects': ProjectSerializer(projects, many=True, context={'request': request}).data,
+        })
+
+
+class ProjectIssuesPageView(APIView):
+    """
+    GET /api/pages/projects/<id>/issues/ - everything projects/[id]/issues.js
+    loads on open, in one request:
+
+    - user: the current user (as /auth/user/)
+    - project: the project with its counters and owner (as /projects/<id>/?expand=owner)
+    - users: the assignable users (the first page of /users/)
+    - cursor: the change-feed cursor, read before the issues
+    - issues: the first page of the issue list with reporter and assignee
+      expanded (as /projects/<id>/issues/?expand=reporter,assignee); the
+      list's search, status, priority and pagination parameters apply.
+      Its next/previous links point at that issue list, so paging does not
+      reload the other blocks
+
+    Users are planned once for the whole page: the users page, the current
+    user (from authentication) and then every owner, reporter and assignee
+    still missing, in a single query, instead of a profile join per list.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    ISSUE_EXPAND = 'reporter,assignee'
+
+    def get(self, request, pk):
+        if not str(pk).isdigit():
+            raise NotFound()
+        project = get_object_or_404(Project.objects.live(), pk=pk)
+        cursor = ChangeLog.latest(project.pk, project.changes_pruned_through)
+
+        # The issue list exactly as IssueViewSet builds it, minus the joins
+        issue_view = IssueViewSet(
+            request=request, args=(), kwargs={'project_pk': str(project.pk)}, format_kwarg=None, action='list'
+        )
+        queryset = issue_view.filter_queryset(issue_view.get_queryset()).select_related(None)
+        page = issue_view.paginate_queryset(queryset)
+        issues = list(page if page is not None else queryset)
+
+        page_size = api_settings.PAGE_SIZE
+        assignable = list(User.objects.select_related('profile').order_by('id')[:page_size])
+        users = {user.id: user for user in assignable}
+        users.setdefault(request.user.id, request.user)
+        load_users(users, [project.owner_id] + [
+            user_id for issue in issues for user_id in (issue.reporter_id, issue.assignee_id)
+        ])
+        attach_users([project], ['owner'], users)
+        attach_users(issues, ['reporter', 'assignee'], users)
+
+        context = {'request': request}
+        issue_data = IssueSerializer(issues, many=True, context=context, expand=self.ISSUE_EXPAND).data
+        if page is not None:
+            issue_data = issue_view.get_paginated_response(issue_data).data
+            for name in ('next', 'previous'):
+                issue_data[name] = self.issue_list_link(request, issue_data[name], project.pk)
+        return Response({
+            'user': UserSerializer(users[request.user.id]).data,
+            'project': ProjectSerializer(project, context=context, expand='owner').data,
+            'users': UserSerializer(assignable, many=True).data,
+            'cursor': cursor,
+            'issues': issue_data,
+        })
+
+    def issue_list_link(self, request, link, project_id):
+        """A pagination link of this page, moved to the project's issue list."""
+        if link is None:
+            return None
+        query = urlsplit(link).query
+        url = request.build_absolute_uri(reverse('project-issues-list', kwargs={'project_pk': project_id}))
+        return replace_query_param(f'{url}?{query}' if query else url, 'expand', self.ISSUE_EXPAND)
+
+
+class MySummaryView(APIView):
+    """
+    GET /api/me/summary/?limit=N - the issues the current user reported or
+    is assigned to, across all projects: counts by status and priority and
+    the newest N (default 5, at most 20) of every status/priority bucket
+    (see api/summary.py).
+
+    Cached per user in the response cache, keyed by the user's `user:<id>`
+    scope; issue writes that touch the user as reporter or assignee bump it.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    ISSUE_FIELDS = 'id,title,status,priority,project,created_at,updated_at'
+
+    def get_limit(self):
+        limit = self.request.query_params.get('limit')
+        if limit in (None, ''):
+            return DEFAULT_PER_BUCKET
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'limit': 'Must be an integer.'})
+        if not 0 <= limit <= MAX_PER_BUCKET:
+            raise serializers.ValidationError({'limit': f'Must be between 0 and {MAX_PER_BUCKET}.'})
+        return limit
+
+    def get(self, request):
+        limit = self.get_limit()
+        if not response_cache.enabled or request.accepted_renderer.format != 'json':
+            return self.summary_response(request, limit)
+
+        scope = CacheVersion.user_scope(request.user.pk)
+        version = CacheVersion.current([scope])[scope]
+        # The path is the same for everyone: the user id is part of the key
+        key = response_cache_key(request, [request.user.pk, version])
+        entry = response_cache.get(key)
+        if entry is not None:
+            content, content_type = entry
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = self.finalize_response(request, self.summary_response(request, limit))
+        response.render()
+        response_cache.set(key, response.content, response['Content-Type'])
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def summary_response(self, request, limit):
+        summary = issue_summary(request.user.pk, limit)
+        for bucket in summary['buckets']:
+            bucket['issues'] = IssueSerializer(bucket['issues'], many=True, fields=self.ISSUE_FIELDS).data
+        return Response(summary)
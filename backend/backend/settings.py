@@ -41,7 +41,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Static files in production
+    'api.middleware.QueryCountMiddleware',  # X-DB-Queries / X-DB-Time-ms headers
+    'api.middleware.AsyncWhiteNoiseMiddleware',  # Static files in production
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,6 +87,43 @@ else:
         }
     }
 
+# Cache configuration: per-process local memory unless REDIS_URL is set
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'bug-tracker',
+        }
+    }
+
+# Authenticated users (with their profile) are cached this many seconds; 0 disables
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', '60'))
+
+# In-process LRU of rendered project/issue list and detail responses; 0 disables
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1000'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Change-feed rows older than this are pruned by `manage.py process_deletions`;
+# /changes/ cursors from before then get a resync
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv('CHANGE_LOG_RETENTION_DAYS', '30'))
+
+# Change notifications for /api/projects/<id>/events/ (see api/events.py): in-process
+# unless REDIS_URL is set, so every ASGI worker sees every write
+if os.getenv('REDIS_URL'):
+    EVENTS_BACKEND = 'api.events.RedisBackend'
+    EVENTS_BACKEND_OPTIONS = {'url': os.getenv('REDIS_URL')}
+else:
+    EVENTS_BACKEND = 'api.events.LocalBackend'
+    EVENTS_BACKEND_OPTIONS = {}
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = 'en-us'
@@ -105,7 +143,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication with the user and profile cached, see api/cache.py
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -153,3 +192,8 @@ CORS_ALLOWED_HEADERS = [
     'x-csrftoken',
     'x-requested-with',
 ]
+CORS_EXPOSE_HEADERS = [
+    'x-db-queries',
+    'x-db-time-ms',
+    'x-cache',
+]
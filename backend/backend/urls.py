@@ -5,7 +5,7 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from api.views import RegisterView, CurrentUserView
 
-def health_check(request):
+async def health_check(request):
     """Simple health check endpoint"""
     return JsonResponse({'status': 'healthy', 'message': 'Bug Reporting System is running'})
 
@@ -42,8 +42,8 @@ describe('Dashboard Page', () => {
     ]
 
     mockedApi.get.mockImplementation((url) => {
-      if (url === '/projects/') {
-        return Promise.resolve({ data: mockProjects })
+      if (url === '/pages/dashboard/') {
+        return Promise.resolve({ data: { user: { username: 'tester' }, projects: mockProjects } })
       }
       return Promise.resolve({ data: {} })
     })
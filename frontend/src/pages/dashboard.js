@@ -26,17 +26,20 @@ export default function Dashboard(){
       return
     }
 
-    loadProjects()
-    loadUser()
+    loadPage()
   },[])
 
-  const loadUser = async () => {
+  // The user and projects in one round trip; later reloads use /projects/
+  const loadPage = async () => {
     try {
-      const res = await api.get('/auth/user/')
-      setUser(res.data)
+      const res = await api.get('/pages/dashboard/')
+      setUser(res.data.user || null)
+      const projectsData = res.data.projects
+      setProjects(Array.isArray(projectsData) ? projectsData : [])
     } catch (err) {
-      console.error('Failed to load user:', err)
-      // Don't set error state as this is not critical
+      setError(err.response?.data || err.message)
+    } finally {
+      setLoading(false)
     }
   }
 
@@ -38,11 +38,11 @@ export default function IssueDetail() {
       setLoading(true)
       
       // Load issue details
-      const issueRes = await api.get(`/issues/${id}/`)
+      const issueRes = await api.get(`/issues/${id}/?expand=project.owner,reporter,assignee`)
       setIssue(issueRes.data)
       
   // Load comments (normalize paginated or non-paginated responses)
-  const commentsRes = await api.get(`/issues/${id}/comments/`)
+  const commentsRes = await api.get(`/issues/${id}/comments/?expand=author`)
   const commentsPayload = commentsRes.data
   const commentsArray = Array.isArray(commentsPayload) ? commentsPayload : (commentsPayload?.results || [])
   setComments(Array.isArray(commentsArray) ? commentsArray : [])
@@ -36,6 +36,10 @@ export default function ProjectIssues() {
   const [loadingMore, setLoadingMore] = useState(false)
   const [infiniteScrollMode, setInfiniteScrollMode] = useState(false)
   const observerRef = useRef()
+  // Change feed cursor for the loaded issues (see syncChanges)
+  const changesCursorRef = useRef(null)
+  // The first list load comes with the project, users and cursor (see loadIssues)
+  const pageLoadedRef = useRef(false)
 
   // Debounce search input
   useEffect(() => {
@@ -53,9 +57,7 @@ export default function ProjectIssues() {
       router.push('/')
       return
     }
-    loadProjectData()
-    loadUsers()
-    loadCurrentUser()
+    pageLoadedRef.current = false
   }, [id])
 
   // Load issues when filters or search changes (but not page for infinite scroll)
@@ -98,45 +100,26 @@ export default function ProjectIssues() {
     }
   }, [infiniteScrollMode, hasNextPage, loadingMore])
 
-  const loadProjectData = async () => {
-    try {
-      const projectRes = await api.get(`/projects/${id}/`)
-      setProject(projectRes.data)
-    } catch (err) {
-      setError(err.response?.data?.detail || err.message)
-    }
-  }
-
-  const loadUsers = async () => {
-    try {
-      const usersRes = await api.get('/users/')
-      // API may return a paginated object { results: [...] } or a raw array
-      const payload = usersRes.data
-      const arr = Array.isArray(payload) ? payload : (payload?.results || [])
-      setUsers(Array.isArray(arr) ? arr : [])
-    } catch (err) {
-      // If users endpoint fails, we'll extract from issues later
-      console.warn('Failed to load users:', err)
-    }
-  }
-
-  const loadCurrentUser = async () => {
-    try {
-      const userRes = await api.get('/auth/user/')
-      setCurrentUser(userRes.data)
-    } catch (err) {
-      console.warn('Failed to load current user:', err)
-    }
-  }
-
   const loadIssues = async (append = false) => {
     try {
       if (!append) setLoading(true)
       else setLoadingMore(true)
+
+      const firstLoad = !append && !pageLoadedRef.current
+      if (!append && !firstLoad) {
+        // Read the cursor before the list so no later change is missed
+        try {
+          const changesRes = await api.get(`/projects/${id}/changes/`)
+          changesCursorRef.current = changesRes.data.cursor
+        } catch (err) {
+          changesCursorRef.current = null
+        }
+      }
       
       // Build query parameters
       const params = new URLSearchParams()
       params.append('page', append ? currentPage + 1 : currentPage)
+      params.append('expand', 'reporter,assignee')
       
       if (searchQuery) {
         params.append('search', searchQuery)
@@ -148,7 +131,19 @@ export default function ProjectIssues() {
         params.append('priority', priorityFilter)
       }
 
-      const issuesRes = await api.get(`/projects/${id}/issues/?${params.toString()}`)
+      let issuesRes
+      if (firstLoad) {
+        // One round trip for the user, project, users, cursor and first issues
+        const pageRes = await api.get(`/pages/projects/${id}/issues/?${params.toString()}`)
+        pageLoadedRef.current = true
+        setProject(pageRes.data.project)
+        setUsers(Array.isArray(pageRes.data.users) ? pageRes.data.users : [])
+        setCurrentUser(pageRes.data.user)
+        changesCursorRef.current = pageRes.data.cursor
+        issuesRes = { data: pageRes.data.issues }
+      } else {
+        issuesRes = await api.get(`/projects/${id}/issues/?${params.toString()}`)
+      }
       
       // Handle paginated response
       if (issuesRes.data.results) {
@@ -174,7 +169,7 @@ export default function ProjectIssues() {
       }
 
       // Extract users from issues if users weren't loaded separately
-      if (!Array.isArray(users) || users.length === 0) {
+      if (!firstLoad && (!Array.isArray(users) || users.length === 0)) {
         const uniqueUsers = []
         const userMap = new Map()
         const issueList = issuesRes.data.results || issuesRes.data
@@ -221,10 +216,43 @@ export default function ProjectIssues() {
     }, 200) // Match animation duration
   }
 
+  // Apply what changed since the list was loaded instead of refetching it
+  const syncChanges = async () => {
+    if (changesCursorRef.current === null) {
+      loadIssues()
+      return
+    }
+    const matches = issue => (!statusFilter || issue.status === statusFilter) &&
+      (!priorityFilter || issue.priority === priorityFilter)
+    try {
+      let data
+      let removed = false
+      do {
+        const params = new URLSearchParams({ since: changesCursorRef.current, expand: 'reporter,assignee' })
+        const changesRes = await api.get(`/projects/${id}/changes/?${params.toString()}`)
+        data = changesRes.data
+        changesCursorRef.current = data.cursor
+        // The cursor is older than the retained changes: reload the list
+        if (data.resync) {
+          loadIssues()
+          return
+        }
+
+        const updated = new Map(data.issues.map(issue => [issue.id, issue]))
+        setIssues(prev => prev.map(issue => updated.get(issue.id) || issue))
+        removed = removed || data.deleted.issues.length > 0 || data.issues.some(issue => !matches(issue))
+      } while (data.has_more)
+      // Issues leaving the current filter shift the pages: reload them
+      if (removed) loadIssues()
+    } catch (err) {
+      loadIssues()
+    }
+  }
+
   const updateIssueStatus = async (issueId, status) => {
     try {
       await api.patch(`/issues/${issueId}/`, { status })
-      loadIssues() // Reload current page
+      syncChanges()
     } catch (err) {
       alert('Failed to update status: ' + (err.response?.data?.detail || err.message))
     }
@@ -233,7 +261,7 @@ export default function ProjectIssues() {
   const updateIssueAssignee = async (issueId, assignee_id) => {
     try {
       await api.patch(`/issues/${issueId}/`, { assignee_id: assignee_id || null })
-      loadIssues() // Reload current page
+      syncChanges()
     } catch (err) {
       alert('Failed to update assignee: ' + (err.response?.data?.detail || err.message))
     }
@@ -0,0 +1,214 @@
+"""
+Compare how many concurrent connections the WSGI deployment (gunicorn sync
+workers, as in backend/gunicorn.service) and the ASGI deployment (uvicorn,
+backend/asgi.py) can hold while still answering requests.
+
+For each server it measures:
+- held: open --held connections that never finish their request (slow
+  clients, long polls), then time --probes health checks.
+- streams (ASGI only): the same with --held open /events/ streams; WSGI
+  cannot serve them (501).
+- throughput: GET --path from 1..N concurrent clients for --duration seconds.
+
+Uses only the standard library plus the servers from requirements.txt.
+Run from anywhere against a migrated database with a project in it:
+
+    python scripts/benchmark_asgi.py --held 300 --workers 3 --output asgi.json
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+
+def server_command(kind, port, workers):
+    if kind == 'wsgi':
+        return [sys.executable, '-m', 'gunicorn', 'backend.wsgi:application',
+                '--workers', str(workers), '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    return [sys.executable, '-m', 'uvicorn', 'backend.asgi:application',
+            '--workers', str(workers), '--host', '127.0.0.1', '--port', str(port),
+            '--log-level', 'warning', '--no-access-log']
+
+
+def start_server(kind, port, workers):
+    process = subprocess.Popen(server_command(kind, port, workers), cwd=BACKEND_DIR)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health/', timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{kind} server did not start on port {port}')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def timed_get(port, path, timeout):
+    """(seconds, status) for one GET on a new connection; status None on error or timeout."""
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        response.read()
+        return time.perf_counter() - start, response.status
+    except OSError:
+        return time.perf_counter() - start, None
+    finally:
+        connection.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def open_slow_clients(port, count):
+    """Connections that send a request line and then stall before the blank line."""
+    sockets = []
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b'GET /api/projects/ HTTP/1.1\r\nHost: 127.0.0.1\r\n')
+        sockets.append(sock)
+    return sockets
+
+
+def open_event_streams(port, project_id, count):
+    sockets = []
+    request = f'GET /api/projects/{project_id}/events/ HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'.encode()
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port), timeout=10)
+        sock.sendall(request)
+        head = sock.recv(4096)
+        if b' 200 ' not in head.split(b'\r\n', 1)[0]:
+            sock.close()
+            for other in sockets:
+                other.close()
+            return None
+        sockets.append(sock)
+    return sockets
+
+
+def probe(port, probes, timeout):
+    results = [timed_get(port, '/api/health/', timeout) for _ in range(probes)]
+    ok = [seconds for seconds, status in results if status == 200]
+    return {
+        'probes': probes,
+        'ok': len(ok),
+        'p50_ms': round(percentile(ok, 0.5) * 1000, 2) if ok else None,
+        'max_ms': round(max(ok) * 1000, 2) if ok else None,
+    }
+
+
+def held_connections(port, held, probes, timeout, opener):
+    sockets = opener()
+    if sockets is None:
+        return {'held': 0, 'supported': False}
+    try:
+        return {'held': len(sockets), **probe(port, probes, timeout)}
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+def throughput(port, path, concurrency, duration, timeout):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < stop_at:
+            seconds, status = timed_get(port, path, timeout)
+            with lock:
+                if status == 200:
+                    latencies.append(seconds)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def run(kind, port, options):
+    print(f'\n== {kind.upper()} ({options.workers} workers) ==')
+    process = start_server(kind, port, options.workers)
+    try:
+        result = {'server': kind, 'workers': options.workers}
+        result['idle'] = probe(port, options.probes, options.timeout)
+        result['held'] = held_connections(
+            port, options.held, options.probes, options.timeout,
+            lambda: open_slow_clients(port, options.held),
+        )
+        print(f"health with {options.held} stalled clients: {result['held']}")
+        result['streams'] = held_connections(
+            port, options.held, options.probes, options.timeout,
+            lambda: open_event_streams(port, options.project, options.held),
+        )
+        print(f"health with {options.held} event streams: {result['streams']}")
+        result['throughput'] = []
+        for concurrency in options.concurrency:
+            row = throughput(port, options.path, concurrency, options.duration, options.timeout)
+            result['throughput'].append(row)
+            print(f"GET {options.path} x{concurrency}: {row}")
+        return result
+    finally:
+        stop_server(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=3, help='Worker processes per server (default: 3)')
+    parser.add_argument('--held', type=int, default=200, help='Connections to hold open (default: 200)')
+    parser.add_argument('--probes', type=int, default=20, help='Health checks per measurement (default: 20)')
+    parser.add_argument('--timeout', type=float, default=2.0, help='Seconds before a request counts as failed')
+    parser.add_argument('--path', default='/api/projects/', help='Endpoint for the throughput runs')
+    parser.add_argument('--project', type=int, default=1, help='Project id for the /events/ streams')
+    parser.add_argument('--concurrency', type=lambda v: [int(x) for x in v.split(',')], default=[1, 16, 64])
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per throughput run')
+    parser.add_argument('--servers', default='wsgi,asgi', help='Comma-separated: wsgi, asgi')
+    parser.add_argument('--wsgi-port', type=int, default=8101)
+    parser.add_argument('--asgi-port', type=int, default=8102)
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    options = parser.parse_args()
+
+    ports = {'wsgi': options.wsgi_port, 'asgi': options.asgi_port}
+    results = [run(kind, ports[kind], options) for kind in options.servers.split(',')]
+    if options.output:
+        with open(options.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        print(f'\nWrote {options.output}')
+
+
+if __name__ == '__main__':
+    main()
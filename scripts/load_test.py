@@ -0,0 +1,369 @@
+"""
+Load test: seed a dataset, then drive concurrent authenticated traffic
+against a local server and report throughput, p50/p95/p99 latency and
+database queries (the X-DB-Queries / X-DB-Time-ms headers) per endpoint.
+
+The traffic mix (weights set with --mix):
+- dashboard: GET /api/pages/dashboard/
+- issues_page: GET /api/pages/projects/<id>/issues/
+- issue_list: GET /api/projects/<id>/issues/ filtered by status or priority
+- issue_search: GET /api/projects/<id>/issues/?search=<word>
+- issue_patch: PATCH /api/issues/<id>/ (priority or status)
+- comment_threads: GET /api/issues/<id>/comments/
+
+Every virtual client logs in as one of the seeded users that own projects
+and works on that user's projects. Results go to --output as JSON;
+--compare prints the change against an earlier result file.
+
+Standard library only, offline. SQLite (the default database, or any
+--database-url such as sqlite:////tmp/load.sqlite3) or a local PostgreSQL
+(--database-url postgres://...):
+
+    python scripts/load_test.py --database-url sqlite:////tmp/load.sqlite3 --migrate --seed \\
+        --concurrency 8 --duration 30 --output results/HEAD.json --compare results/main.json
+
+SQLite takes one writer at a time: with several workers some PATCHes may
+fail on the database lock; they are counted as errors, not latencies.
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+from benchmark_asgi import BACKEND_DIR, percentile, start_server, stop_server
+
+# Search terms: words of the issue titles seed_tracker writes, and a few it never does
+WORDS = (
+    'login search export pagination cache upload dashboard comments notifications permissions '
+    'import billing mobile timeout unicode safari guests offline refactor validate '
+    'webhook rollback'
+).split()
+STATUSES = ('open', 'in_progress', 'closed')
+PRIORITIES = ('low', 'medium', 'high', 'critical')
+ENDPOINTS = ('dashboard', 'issues_page', 'issue_list', 'issue_search', 'issue_patch', 'comment_threads')
+DEFAULT_MIX = 'dashboard=2,issues_page=2,issue_list=4,issue_search=2,issue_patch=1,comment_threads=3'
+
+
+def manage(*args):
+    subprocess.run([sys.executable, 'manage.py', *args], cwd=BACKEND_DIR, check=True)
+
+
+def seed(options):
+    """The deterministic seed_tracker dataset: bulk inserts, one shared password hash."""
+    issues = options.projects * options.issues
+    manage('seed_tracker', '--users', str(options.users), '--projects', str(options.projects),
+           '--issues', str(issues), '--comments', str(issues * options.comments),
+           '--seed', str(options.random_seed), '--username-prefix', options.user_prefix,
+           '--password', options.password)
+
+
+class Client:
+    """One virtual user on a keep-alive connection."""
+
+    def __init__(self, url, timeout):
+        parts = urllib.parse.urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.token = None
+        self.connection = None
+
+    def request(self, method, path, body=None):
+        """(seconds, status, response, payload); status None when the request failed."""
+        headers = {'Accept': 'application/json'}
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        start = time.perf_counter()
+        try:
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.connection.request(method, self.prefix + path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+            return time.perf_counter() - start, response.status, response, payload
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            return time.perf_counter() - start, None, None, b''
+
+    def get_json(self, path):
+        _, status, _, payload = self.request('GET', path)
+        if status != 200:
+            raise RuntimeError(f'GET {path} answered {status}')
+        return json.loads(payload)
+
+    def login(self, username, password):
+        _, status, _, payload = self.request('POST', '/auth/login/', {'username': username, 'password': password})
+        if status != 200:
+            raise RuntimeError(f'Login as {username} failed ({status})')
+        self.token = json.loads(payload)['access']
+
+
+class Workload:
+    """The traffic mix: picks the next request of a client from its user's projects and issues."""
+
+    def __init__(self, mix, rng, projects, issues):
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.rng = rng
+        self.projects = projects
+        self.issues = issues
+
+    def next(self):
+        rng = self.rng
+        name = rng.choices(self.names, weights=self.weights)[0]
+        project = rng.choice(self.projects)
+        issue = rng.choice(self.issues[project]) if self.issues[project] else None
+        if name == 'dashboard':
+            return name, 'GET', '/pages/dashboard/', None
+        if name == 'issues_page':
+            return name, 'GET', f'/pages/projects/{project}/issues/', None
+        if name == 'issue_list':
+            query = rng.choice([f'status={rng.choice(STATUSES)}', f'priority={rng.choice(PRIORITIES)}'])
+            return name, 'GET', f'/projects/{project}/issues/?{query}&expand=reporter,assignee', None
+        if name == 'issue_search':
+            return name, 'GET', f'/projects/{project}/issues/?search={rng.choice(WORDS)}', None
+        if issue is None:
+            return 'issue_list', 'GET', f'/projects/{project}/issues/', None
+        if name == 'issue_patch':
+            field = rng.choice(['priority', 'status'])
+            value = rng.choice(PRIORITIES if field == 'priority' else STATUSES)
+            return name, 'PATCH', f'/issues/{issue}/', {field: value}
+        return 'comment_threads', 'GET', f'/issues/{issue}/comments/', None
+
+
+def sample_issues(client, project, pages):
+    ids = []
+    for page in range(1, pages + 1):
+        data = client.get_json(f'/projects/{project}/issues/?fields=id&page={page}')
+        ids.extend(issue['id'] for issue in data['results'])
+        if not data.get('next'):
+            break
+    return ids
+
+
+def discover(options, url):
+    """{username: (token, [project ids], {project id: [issue ids]})} for the users that own projects."""
+    projects = None
+    users = {}
+    for index in range(1, options.users + 1):
+        username = f'{options.user_prefix}{index}'
+        client = Client(url, options.timeout)
+        client.login(username, options.password)
+        page = client.get_json('/pages/dashboard/')
+        if projects is None:
+            projects = page['projects']
+        owned = [project['id'] for project in projects if project['owner'] == page['user']['id']]
+        if not owned:
+            continue
+        issues = {project: sample_issues(client, project, options.sample_pages) for project in owned}
+        users[username] = (client.token, owned, issues)
+    if not users:
+        raise RuntimeError('None of the load-test users owns a project: seed with --seed first')
+    return users
+
+
+def drive(options, url, users, mix):
+    results = {name: {'latencies': [], 'errors': 0, 'statuses': {}, 'queries': [], 'db_ms': []} for name in mix}
+    lock = threading.Lock()
+    accounts = list(users.values())
+    warm_until = time.perf_counter() + options.warmup
+    stop_at = warm_until + options.duration
+
+    def run(index):
+        token, projects, issues = accounts[index % len(accounts)]
+        client = Client(url, options.timeout)
+        client.token = token
+        workload = Workload(mix, random.Random(options.random_seed * 1000 + index), projects, issues)
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                return
+            name, method, path, body = workload.next()
+            seconds, status, response, _ = client.request(method, path, body)
+            if now < warm_until:
+                continue
+            with lock:
+                row = results[name]
+                row['statuses'][str(status)] = row['statuses'].get(str(status), 0) + 1
+                if status is None or status >= 400:
+                    row['errors'] += 1
+                    continue
+                row['latencies'].append(seconds)
+                if response.getheader('X-DB-Queries') is not None:
+                    row['queries'].append(int(response.getheader('X-DB-Queries')))
+                    row['db_ms'].append(float(response.getheader('X-DB-Time-ms') or 0))
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(options.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summarize(latencies, duration):
+    ms = lambda value: round(value * 1000, 2) if value is not None else None
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': ms(percentile(latencies, 0.5)),
+        'p95_ms': ms(percentile(latencies, 0.95)),
+        'p99_ms': ms(percentile(latencies, 0.99)),
+        'mean_ms': ms(statistics.mean(latencies)) if latencies else None,
+        'max_ms': ms(max(latencies)) if latencies else None,
+    }
+
+
+def report(options, results):
+    endpoints = {}
+    for name, row in results.items():
+        endpoints[name] = {
+            **summarize(row['latencies'], options.duration),
+            'errors': row['errors'],
+            'statuses': row['statuses'],
+            'db_queries_mean': round(statistics.mean(row['queries']), 2) if row['queries'] else None,
+            'db_queries_max': max(row['queries']) if row['queries'] else None,
+            'db_ms_mean': round(statistics.mean(row['db_ms']), 2) if row['db_ms'] else None,
+        }
+    everything = [seconds for row in results.values() for seconds in row['latencies']]
+    return {
+        'overall': {**summarize(everything, options.duration),
+                    'errors': sum(row['errors'] for row in results.values())},
+        'endpoints': endpoints,
+    }
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=BACKEND_DIR).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True, cwd=BACKEND_DIR).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def print_table(result, previous=None):
+    columns = ('requests', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors', 'db_queries_mean')
+    print(f"\n{'endpoint':<16}" + ''.join(f'{column:>17}' for column in columns))
+    rows = [('overall', result['overall'])] + sorted(result['endpoints'].items())
+    for name, row in rows:
+        cells = []
+        for column in columns:
+            value = row.get(column)
+            before = None
+            if previous is not None:
+                before = (previous['overall'] if name == 'overall' else previous['endpoints'].get(name, {})).get(column)
+            if value is not None and before not in (None, 0) and isinstance(value, (int, float)):
+                cells.append(f'{value:>9} ({(value - before) / before:+.0%})')
+            else:
+                cells.append(str(value))
+        print(f'{name:<16}' + ''.join(f'{cell:>17}' for cell in cells))
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(ENDPOINTS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f'unknown endpoints: {", ".join(sorted(unknown))}')
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help='DATABASE_URL for the server and the seeding (default: the settings database)')
+    parser.add_argument('--migrate', action='store_true', help='Run migrate before seeding')
+    parser.add_argument('--seed', action='store_true', help='Seed the dataset first (manage.py seed_tracker)')
+    parser.add_argument('--users', type=int, default=10, help='Seeded users (default: 10)')
+    parser.add_argument('--projects', type=int, default=20, help='Seeded projects (default: 20)')
+    parser.add_argument('--issues', type=int, default=200, help='Seeded issues per project (default: 200)')
+    parser.add_argument('--comments', type=int, default=3, help='Average comments per issue (default: 3)')
+    parser.add_argument('--random-seed', type=int, default=1, help='Dataset and traffic seed')
+    parser.add_argument('--user-prefix', default='loadtest-', help='Seeded usernames: <prefix><n>')
+    parser.add_argument('--password', default='loadtest-password', help='Password of the seeded users')
+    parser.add_argument('--url', help='Test this running server (e.g. http://127.0.0.1:8000/api) '
+                                      'instead of starting one')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi',
+                        help='Server to start: gunicorn (wsgi) or uvicorn (asgi) (default: wsgi)')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes of the started server')
+    parser.add_argument('--port', type=int, default=8103, help='Port of the started server (default: 8103)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Virtual clients (default: 8)')
+    parser.add_argument('--duration', type=float, default=20.0, help='Measured seconds (default: 20)')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Unmeasured seconds first (default: 3)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds before a request fails')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'Endpoint weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--sample-pages', type=int, default=2,
+                        help='Issue list pages read per project to pick issues from (default: 2)')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='An earlier --output file to compare against')
+    options = parser.parse_args()
+
+    if options.database_url:
+        # Inherited by manage.py and the server
+        os.environ['DATABASE_URL'] = options.database_url
+    if options.migrate:
+        manage('migrate', '--noinput', '-v', '0')
+    if options.seed:
+        seed(options)
+
+    process = None
+    url = options.url
+    if url is None:
+        process = start_server(options.server, options.port, options.workers)
+        url = f'http://127.0.0.1:{options.port}/api'
+    try:
+        users = discover(options, url)
+        print(f'{len(users)} users, {sum(len(p) for _, p, _ in users.values())} projects; '
+              f'{options.concurrency} clients for {options.duration:g}s after {options.warmup:g}s warm-up')
+        results = report(options, drive(options, url, users, options.mix))
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    commit, dirty = git_commit()
+    database = urllib.parse.urlsplit(options.database_url).scheme if options.database_url else 'sqlite'
+    result = {
+        'meta': {
+            'commit': commit, 'dirty': dirty,
+            'started_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'database': database, 'server': 'external' if options.url else options.server,
+            'workers': None if options.url else options.workers,
+            'concurrency': options.concurrency, 'duration': options.duration, 'mix': options.mix,
+            'dataset': {'users': options.users, 'projects': options.projects,
+                        'issues_per_project': options.issues, 'comments_per_issue': options.comments,
+                        'seed': options.random_seed},
+        },
+        **results,
+    }
+    previous = None
+    if options.compare:
+        with open(options.compare) as fh:
+            previous = json.load(fh)
+    print_table(result, previous)
+    if options.output:
+        os.makedirs(os.path.dirname(os.path.abspath(options.output)), exist_ok=True)
+        with open(options.output, 'w') as fh:
+            json.dump(result, fh, indent=2)
+        print(f'\nWrote {options.output}')
+
+
+if __name__ == '__main__':
+    main()